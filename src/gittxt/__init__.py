@@ -1,42 +1,68 @@
 from pathlib import Path
 from gittxt.core.logger import Logger
-from gittxt.core.config import ConfigManager
-from gittxt.core.constants import TEXT_DIR, JSON_DIR, MD_DIR, ZIP_DIR, TEMP_DIR, REVERSE_DIR
+from gittxt.core.constants import (
+    TEXT_DIR,
+    JSON_DIR,
+    MD_DIR,
+    SQLITE_DIR,
+    ZIP_DIR,
+    TEMP_DIR,
+    REVERSE_DIR,
+)
 
 __version__ = " 1.7.7"
 __author__ = "Sandeep Paidipati"
 __description__ = "Gittxt: Get Text from Git — Optimized for AI."
 
 logger = Logger.get_logger(__name__)
-config = ConfigManager.load_config()
 
 BASE_DIR = Path(__file__).parent.resolve()
 LOG_DIR = Logger.LOG_FILE.parent.resolve()
-OUTPUT_DIR = Path(config.get("output_dir")).resolve()
-
-OUTPUT_TEXT_DIR = OUTPUT_DIR / TEXT_DIR
-OUTPUT_JSON_DIR = OUTPUT_DIR / JSON_DIR
-OUTPUT_MD_DIR = OUTPUT_DIR / MD_DIR
-OUTPUT_ZIP_DIR = OUTPUT_DIR / ZIP_DIR
-OUTPUT_TEMP_DIR = OUTPUT_DIR / TEMP_DIR
-OUTPUT_REVERSE_DIR = OUTPUT_DIR / REVERSE_DIR
-
-for directory in [
-    LOG_DIR,
-    OUTPUT_DIR,
-    OUTPUT_TEXT_DIR,
-    OUTPUT_JSON_DIR,
-    OUTPUT_MD_DIR,
-    OUTPUT_ZIP_DIR,
-    OUTPUT_TEMP_DIR,
-    OUTPUT_REVERSE_DIR,
-]:
-    try:
-        directory.mkdir(parents=True, exist_ok=True)
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to create directory {directory}: {e}")
-
-logger.info("✅ Gittxt initialized successfully.")
-logger.info(f"📂 Output Directory: {OUTPUT_DIR}")
-logger.info(f"📂 Log Directory: {LOG_DIR}")
-logger.info(f"🔹 Version: {__version__}")
+
+_OUTPUT_SUBDIRS = {
+    "OUTPUT_TEXT_DIR": TEXT_DIR,
+    "OUTPUT_JSON_DIR": JSON_DIR,
+    "OUTPUT_MD_DIR": MD_DIR,
+    "OUTPUT_SQLITE_DIR": SQLITE_DIR,
+    "OUTPUT_ZIP_DIR": ZIP_DIR,
+    "OUTPUT_TEMP_DIR": TEMP_DIR,
+    "OUTPUT_REVERSE_DIR": REVERSE_DIR,
+}
+_paths = None
+
+
+def init_directories() -> dict:
+    """
+    Resolve OUTPUT_DIR and its subdirectories from the config and create
+    them. Runs once, the first time one of those names is used, so a plain
+    `import gittxt` neither reads the config nor touches the disk.
+    """
+    global _paths
+    if _paths is not None:
+        return _paths
+
+    from gittxt.core.config import ConfigManager
+
+    config = ConfigManager.load_config()
+    output_dir = Path(config.get("output_dir")).resolve()
+    paths = {"OUTPUT_DIR": output_dir}
+    paths.update({name: output_dir / sub for name, sub in _OUTPUT_SUBDIRS.items()})
+
+    for directory in [LOG_DIR, *paths.values()]:
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to create directory {directory}: {e}")
+
+    logger.info("✅ Gittxt initialized successfully.")
+    logger.info(f"📂 Output Directory: {output_dir}")
+    logger.info(f"📂 Log Directory: {LOG_DIR}")
+    logger.info(f"🔹 Version: {__version__}")
+    _paths = {"config": config, **paths}
+    return _paths
+
+
+def __getattr__(name):
+    if name in ("config", "OUTPUT_DIR") or name in _OUTPUT_SUBDIRS:
+        return init_directories()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 import click
 from .cli_scan import scan
+from .cli_update import update
 from gittxt.cli.cli_config import config
 from gittxt.cli.cli_utils import clean
 from gittxt.cli.cli_reverse import reverse_command
@@ -17,7 +18,7 @@ class CustomGroup(click.Group):
 
     def list_commands(self, ctx):
         # Custom order instead of alphabetical
-        return ["scan", "config", "clean", "re", "plugin"] 
+        return ["scan", "update", "config", "clean", "re", "plugin"] 
 
 
 @click.group(cls=CustomGroup)
@@ -27,6 +28,7 @@ def cli():
 
 
 cli.add_command(scan)
+cli.add_command(update)
 cli.add_command(config)
 cli.add_command(clean)
 cli.add_command(reverse_command)
@@ -8,6 +8,9 @@ from gittxt.core.logger import Logger
 from gittxt.core.repository import RepositoryHandler
 from gittxt.core.scanner import Scanner
 from gittxt.core.output_builder import OutputBuilder
+from gittxt.core.incremental import stamp_reports
+from gittxt.core.history import HistoryScanner, resolve_revisions
+from gittxt.core.sources import GitObjectSource
 from gittxt.utils.cleanup_utils import cleanup_temp_folder
 from gittxt.utils.file_utils import load_gittxtignore
 from gittxt.utils.summary_utils import generate_summary
@@ -16,7 +19,7 @@ from gittxt.core.constants import EXCLUDED_DIRS_DEFAULT
 from .cli_utils import config
 from rich.table import Table
 from rich import box
-from rich.status import Status
+from rich.progress import Progress, SpinnerColumn, TextColumn
 from collections import defaultdict
 
 logger = Logger.get_logger(__name__)
@@ -36,7 +39,7 @@ console = Console()
     help="Custom output directory.",
 )
 @click.option(
-    "--output-format", "-f", default="txt", help="Comma-separated: txt, json, md."
+    "--output-format", "-f", default="txt", help="Comma-separated: txt, json, md, sqlite."
 )
 @click.option(
     "--include-patterns", "-i", multiple=True, help="Glob to include (only textual)."
@@ -60,6 +63,43 @@ console = Console()
 )
 @click.option("--docs", is_flag=True, help="Only scan for documentation files (*.md).")
 @click.option("--no-tree", is_flag=True, help="Exclude directory tree from output.")
+@click.option(
+    "--index",
+    "build_index",
+    is_flag=True,
+    help="Write a sidecar .idx file with per-file byte offsets for random access.",
+)
+@click.option(
+    "--no-checkout",
+    "from_objects",
+    is_flag=True,
+    help="Read files straight from git objects instead of a working tree.",
+)
+@click.option(
+    "--rev",
+    "revisions",
+    multiple=True,
+    help="Scan this tag, branch or commit (repeatable). Implies --no-checkout.",
+)
+@click.option(
+    "--last-tags",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Scan the N most recent tags. Implies --no-checkout.",
+)
+@click.option(
+    "--last-commits",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Scan the last N first-parent commits. Implies --no-checkout.",
+)
+@click.option(
+    "--parallel-repos",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Clone and scan up to N repositories concurrently.",
+)
 def scan(
     repos,
     sync,
@@ -76,6 +116,12 @@ def scan(
     lite,
     docs,
     no_tree,
+    build_index,
+    from_objects,
+    revisions,
+    last_tags,
+    last_commits,
+    parallel_repos,
 ):
     log_level = getattr(logging, log_level.upper(), logging.INFO)
     Logger.setup_logger(force_stdout=True)
@@ -86,8 +132,8 @@ def scan(
         console.print("[bold red]❌ No repositories specified.[/bold red]")
         sys.exit(1)
 
-    # Warn if --branch used with local path
-    if branch:
+    # Warn if --branch used with local path (--no-checkout reads any ref)
+    if branch and not from_objects:
         for r in repos:
             if Path(r).exists():
                 console.print(
@@ -95,7 +141,7 @@ def scan(
                 )
 
     # Validate output formats
-    VALID_OUTPUT_FORMATS = {"txt", "json", "md"}
+    VALID_OUTPUT_FORMATS = {"txt", "json", "md", "sqlite"}
     requested = {fmt.strip() for fmt in output_format.split(",")}
     if not requested.issubset(VALID_OUTPUT_FORMATS):
         console.print(f"[red]Invalid format. Allowed: {VALID_OUTPUT_FORMATS}[/red]")
@@ -106,6 +152,14 @@ def scan(
         include_patterns = ["**/*.md"]
         logger.debug("🔍 --docs flag active. Including only .md files.")
 
+    history = None
+    if revisions or last_tags or last_commits:
+        history = {
+            "revs": list(revisions),
+            "last_tags": last_tags,
+            "last_commits": last_commits,
+        }
+
     mode = "lite" if lite else "rich"
     final_output_dir = (
         Path(output_dir).resolve()
@@ -128,6 +182,10 @@ def scan(
             exclude_patterns,
             mode,
             no_tree,
+            build_index,
+            from_objects,
+            parallel_repos,
+            history,
         )
     )
 
@@ -146,6 +204,30 @@ def print_skipped_files(skipped_files):
         console.print(f"[yellow]- {reason}[/yellow]: {len(paths)} files")
 
 
+class RepoLine:
+    """
+    One repo's line in the shared progress display.
+    """
+
+    def __init__(self, progress: Progress, label: str):
+        self.progress = progress
+        self.label = label
+        self.task_id = progress.add_task(f"⏳ {label}: queued", total=None)
+
+    def update(self, text: str):
+        self.progress.update(
+            self.task_id, description=f"{text} [dim]{self.label}[/dim]"
+        )
+
+    def finish(self, text: str):
+        self.progress.update(
+            self.task_id,
+            description=f"{text} [dim]{self.label}[/dim]",
+            total=1,
+            completed=1,
+        )
+
+
 def render_summary_table(
     summary_data: dict, repo_name: str, branch: str = None, subdir: str = None
 ):
@@ -219,27 +301,51 @@ async def _handle_repos(
     exclude_patterns,
     mode,
     skip_tree,
+    build_index=False,
+    from_objects=False,
+    parallel_repos=1,
+    history=None,
 ):
-    for repo_source in repos:
-        try:
-            await _process_one_repo(
-                repo_source,
-                sync,
-                exclude_dirs,
-                size_limit,
-                branch,
-                final_output_dir,
-                output_formats,
-                tree_depth,
-                create_zip,
-                include_patterns,
-                exclude_patterns,
-                mode,
-                skip_tree,
-            )
-        except Exception as e:
-            logger.error(f"❌ Failed processing {repo_source}: {e}")
-            console.print(f"[red]❌ {repo_source} => {e}[/red]")
+    # Repos share this event loop, its default thread pool, the cached
+    # config and the tiktoken encoder; the semaphore bounds how many are
+    # cloning/scanning at once so clones overlap with other repos' scans.
+    semaphore = asyncio.Semaphore(parallel_repos)
+    progress = Progress(
+        SpinnerColumn(finished_text="•"),
+        TextColumn("{task.description}"),
+        console=console,
+    )
+
+    async def run(repo_source):
+        line = RepoLine(progress, repo_source)
+        async with semaphore:
+            try:
+                await _process_one_repo(
+                    repo_source,
+                    sync,
+                    exclude_dirs,
+                    size_limit,
+                    branch,
+                    final_output_dir,
+                    output_formats,
+                    tree_depth,
+                    create_zip,
+                    include_patterns,
+                    exclude_patterns,
+                    mode,
+                    skip_tree,
+                    build_index,
+                    from_objects,
+                    line,
+                    history,
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed processing {repo_source}: {e}")
+                console.print(f"[red]❌ {repo_source} => {e}[/red]")
+                line.finish("[red]❌ failed[/red]")
+
+    with progress:
+        await asyncio.gather(*(run(repo) for repo in repos))
 
 
 async def _process_one_repo(
@@ -256,13 +362,28 @@ async def _process_one_repo(
     exclude_patterns,
     mode,
     skip_tree,
+    build_index=False,
+    from_objects=False,
+    line: RepoLine = None,
+    history: dict = None,
 ):
+    def stage(text: str):
+        if line:
+            line.update(f"[bold cyan]{text}[/bold cyan]")
+
+    def show_progress(phase: str, percent: int):
+        stage(f"🔄 {phase}: {percent}%")
+
     # Decide local vs. remote
-    handler = RepositoryHandler(repo_source, branch=branch)
-    with Status(
-        "[bold cyan]🔄 Cloning / resolving repo...[/bold cyan]", console=console
-    ):
-        await handler.resolve()
+    handler = RepositoryHandler(
+        repo_source,
+        branch=branch,
+        from_objects=from_objects,
+        on_progress=show_progress,
+        full_history=history is not None,
+    )
+    stage("🔄 Cloning / resolving repo...")
+    await handler.resolve()
     repo_path, subdir, is_remote, repo_name, used_branch = handler.get_local_path()
     scan_root = Path(repo_path)
     if subdir:
@@ -282,6 +403,42 @@ async def _process_one_repo(
                     f"[yellow]⚠️ Warning: Include pattern '{pattern}' targets non-textual file types. These will be skipped.[/yellow]"
                 )
 
+        # Recorded in report indexes so `gittxt update` can replay the scan
+        scan_meta = {
+            "repo_path": None if is_remote else str(repo_path),
+            "repo_url": repo_source if is_remote else None,
+            "branch": used_branch,
+            "subdir": subdir,
+            "exclude_dirs": sorted(merged_exclude_dirs),
+            "size_limit": size_limit,
+            "include_patterns": list(include_patterns),
+            "exclude_patterns": list(exclude_patterns),
+            "use_ignore_file": sync,
+            "tree_depth": tree_depth,
+            "skip_tree": skip_tree,
+        }
+
+        if history is not None:
+            stage("🌲 Scanning revisions...")
+            await _scan_history(
+                handler,
+                history,
+                repo_path,
+                scan_root,
+                repo_name,
+                scan_meta,
+                output_dir=final_output_dir,
+                output_format=",".join(output_formats),
+                repo_url=repo_source if is_remote else None,
+                subdir=subdir,
+                mode=mode,
+                build_index=build_index,
+                create_zip=create_zip,
+            )
+            if line:
+                line.finish("[green]✅ revisions scanned[/green]")
+            return
+
         scanner = Scanner(
             root_path=scan_root,
             exclude_dirs=merged_exclude_dirs,
@@ -290,15 +447,16 @@ async def _process_one_repo(
             exclude_patterns=exclude_patterns,
             progress=True,
             use_ignore_file=sync,
+            source=handler.scan_source,
         )
-        with Status(
-            "[bold cyan]🔍 Scanning repository...[/bold cyan]", console=console
-        ):
-            textual_files, non_textual_files = await scanner.scan_directory()
+        stage("🔍 Scanning repository...")
+        textual_files, non_textual_files = await scanner.scan_directory()
         skipped_files = scanner.skipped_files
 
         if not textual_files:
             console.print("[yellow]⚠️ No valid textual files found.[/yellow]")
+            if line:
+                line.finish("[yellow]⚠️ no textual files[/yellow]")
             return
 
         builder = OutputBuilder(
@@ -309,20 +467,26 @@ async def _process_one_repo(
             branch=used_branch,
             subdir=subdir,
             mode=mode,
+            build_index=build_index,
         )
-        with Status("[bold cyan]🧩 Formatting output...[/bold cyan]", console=console):
-            await builder.generate_output(
-                textual_files,
-                non_textual_files,
-                repo_path,
-                create_zip=create_zip,
-                tree_depth=tree_depth,
-                skip_tree=skip_tree,
-            )
+        stage("🧩 Formatting output...")
+        outputs = await builder.generate_output(
+            textual_files,
+            non_textual_files,
+            repo_path,
+            create_zip=create_zip,
+            tree_depth=tree_depth,
+            skip_tree=skip_tree,
+        )
+        # A dirty or untracked work tree is not any commit: leave it unstamped
+        commit = await handler.source_commit() if build_index else None
+        if commit:
+            stamp_reports(outputs, commit, scan_meta)
 
         # Summary
-        with Status("[bold cyan]📊 Generating summary...[/bold cyan]", console=console):
-            summary_data = await generate_summary(textual_files + non_textual_files)
+        stage("📊 Generating summary...")
+        summary_data = await generate_summary(textual_files + non_textual_files)
+        # No awaits below, so a repo's report is never interleaved with another's
         render_summary_table(summary_data, repo_name, branch=used_branch, subdir=subdir)
         console.print()
         console.print(
@@ -338,11 +502,99 @@ async def _process_one_repo(
         console.print(f"[blue]📁 Output directory:[/blue] {final_output_dir.resolve()}")
 
         print_skipped_files(skipped_files)
+        if line:
+            line.finish(f"[green]✅ {len(textual_files)} files[/green]")
 
     finally:
+        handler.close()
         if is_remote:
             cleanup_temp_folder(Path(repo_path))
 
+
+async def _scan_history(
+    handler,
+    history: dict,
+    repo_path,
+    scan_root: Path,
+    repo_name: str,
+    scan_meta: dict,
+    create_zip: bool = False,
+    **builder_options,
+):
+    """
+    Scan several revisions through one shared blob store and write one set
+    of reports per revision, named `<repo>@<label>`.
+    """
+    source = handler.scan_source
+    if not isinstance(source, GitObjectSource):
+        raise ValueError("❌ --rev/--last-tags/--last-commits need a git repository")
+    revisions = await resolve_revisions(
+        source,
+        history.get("revs") or (),
+        last_tags=history.get("last_tags"),
+        last_commits=history.get("last_commits"),
+    )
+    if not revisions:
+        console.print(f"[yellow]⚠️ No matching revisions in {repo_name}.[/yellow]")
+        return
+
+    scanner_options = {
+        key: scan_meta[key]
+        for key in (
+            "exclude_dirs",
+            "size_limit",
+            "include_patterns",
+            "exclude_patterns",
+            "use_ignore_file",
+        )
+    }
+    scans = await HistoryScanner(source, scan_root, **scanner_options).scan(
+        revisions
+    )
+    rows = []
+    for scan in scans:
+        if not scan.textual_files:
+            console.print(f"[yellow]⚠️ {scan.label}: no textual files.[/yellow]")
+            continue
+        builder = OutputBuilder(
+            repo_name=f"{repo_name}@{scan.label}", branch=scan.label, **builder_options
+        )
+        outputs = await builder.generate_output(
+            scan.textual_files,
+            scan.non_textual_files,
+            repo_path,
+            create_zip=create_zip,
+            tree_depth=scan_meta["tree_depth"],
+            skip_tree=scan_meta["skip_tree"],
+        )
+        if builder_options.get("build_index"):
+            stamp_reports(outputs, scan.commit, {**scan_meta, "branch": scan.label})
+        summary = await generate_summary(scan.textual_files + scan.non_textual_files)
+        rows.append((scan, summary))
+
+    table = Table(
+        title=f"🌲 Gittxt History: {repo_name}", box=box.ROUNDED, border_style="cyan"
+    )
+    for column in ("Revision", "Commit", "Files", "Size", "Tokens"):
+        table.add_column(column, justify="left" if column == "Revision" else "right")
+    for scan, summary in rows:
+        formatted = summary.get("formatted", {})
+        table.add_row(
+            scan.label,
+            scan.commit[:12],
+            str(summary.get("total_files", 0)),
+            formatted.get("total_size", ""),
+            formatted.get("estimated_tokens", ""),
+        )
+    console.print(table)
+    console.print(
+        f"[green]✅ {len(rows)} revisions of {repo_name} scanned; "
+        f"{source.blob_reads} blobs read.[/green]"
+    )
+    output_dir = builder_options["output_dir"]
+    console.print(f"[blue]📁 Output directory:[/blue] {output_dir}")
+
+
 async def perform_scan_from_api(
     repos: list[str],
     exclude_dirs: list[str] = None,
@@ -0,0 +1,64 @@
+import sys
+import asyncio
+import logging
+import click
+from rich.console import Console
+from gittxt.core.logger import Logger
+from gittxt.core.incremental import IncrementalUpdater
+from .cli_scan import render_summary_table
+
+logger = Logger.get_logger(__name__)
+console = Console()
+
+
+@click.command("update", help="🔄 Update indexed reports to a newer commit.")
+@click.argument("reports", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "--repo",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help="Git repository the report was built from (defaults to the recorded path).",
+)
+@click.option(
+    "--since", default=None, help="Commit the report was built at (default: recorded)."
+)
+@click.option("--to", default="HEAD", show_default=True, help="Commit to update to.")
+@click.option(
+    "--log-level",
+    type=click.Choice(["debug", "info", "warning", "error"], case_sensitive=False),
+    default="warning",
+    help="Set log verbosity level.",
+)
+def update(reports, repo, since, to, log_level):
+    """
+    Re-read only the files that changed between two commits and splice every
+    other file's section from the existing report. Reports need a .idx
+    sidecar (`gittxt scan --index`).
+    """
+    Logger.setup_logger(force_stdout=True)
+    logging.getLogger().setLevel(getattr(logging, log_level.upper(), logging.INFO))
+
+    failed = False
+    for report in reports:
+        try:
+            outcome = asyncio.run(
+                IncrementalUpdater(report, repo, since=since, to=to).run()
+            )
+        except Exception as e:
+            logger.error(f"❌ Failed updating {report}: {e}")
+            console.print(f"[red]❌ {report} => {e}[/red]")
+            failed = True
+            continue
+
+        if outcome.get("summary"):
+            render_summary_table(outcome["summary"], outcome["report"].stem)
+        name, commit = outcome["report"].name, outcome["commit"][:12]
+        console.print(
+            f"[green]✅ {name} now at {commit}[/green]"
+            f" (+{outcome['added']} ~{outcome['modified']} -{outcome['deleted']}"
+            f" →{outcome['renamed']}; {outcome['reused']} reused,"
+            f" {outcome['rescanned']} rescanned)"
+        )
+
+    if failed:
+        sys.exit(1)
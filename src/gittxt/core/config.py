@@ -1,4 +1,5 @@
 from pathlib import Path
+import copy
 import json
 import platform
 import os
@@ -27,6 +28,21 @@ class ConfigManager:
     SRC_DIR = Path(__file__).resolve().parent
     CONFIG_FILE = SRC_DIR.parent / "gittxt-config.json"
 
+    # Environment variables load_config reads; part of the memo key
+    ENV_KEYS = (
+        "GITTXT_OUTPUT_DIR",
+        "GITTXT_OUTPUT_FORMAT",
+        "GITTXT_LOGGING_LEVEL",
+        "GITTXT_LOG_FORMAT",
+        "GITTXT_SIZE_LIMIT",
+        "GITTXT_AUTO_ZIP",
+        "GITTXT_MIRROR_CACHE",
+        "GITTXT_MIRROR_CACHE_DIR",
+        "GITTXT_API_WAIT",
+    )
+    _cache_key = None
+    _cached = None
+
     @staticmethod
     def _determine_default_output_dir():
         system_name = platform.system().lower()
@@ -65,11 +81,72 @@ class ConfigManager:
             ".vscode",
         ],
         "scan_concurrency": 200,
+        # Directory tree budget: per-directory fan-out, total lines, est. tokens
+        "tree_max_entries": 200,
+        "tree_max_lines": 2000,
+        "tree_max_tokens": 20000,
+        # Persistent bare mirrors of remote repos (LRU-evicted past max_bytes)
+        "mirror_cache_enabled": False,
+        "mirror_cache_dir": None,
+        "mirror_cache_max_bytes": 2 * 1024**3,
+        # Seconds before a clone/fetch is killed
+        "git_timeout": 600,
+        # Seconds a remote's default branch (from ls-remote) stays cached
+        "default_branch_ttl": 3600,
+        # API uploads: streamed request size, then archive listing limits
+        "upload_max_bytes": 512 * 1024**2,
+        "upload_max_uncompressed_bytes": 2 * 1024**3,
+        "upload_max_entries": 50000,
+        "upload_chunk_size": 1024**2,
+        # API scan jobs run by this many workers per server process
+        "api_scan_concurrency": 2,
+        # Reuse a finished API scan of the same commit and options
+        "api_result_cache": True,
+        # Always run API scan jobs within their request, as if ?wait=true
+        # (for hosts like Lambda that freeze the process between requests)
+        "api_always_wait": False,
+        # POST /v1/scan/batch: repos scanned at once per batch, repos per batch
+        "api_batch_concurrency": 4,
+        "api_batch_max_repos": 100,
+        # API admission: scans running at once (null: CPU count), bytes the
+        # formatting scans may reserve, waiting jobs before new ones get 429
+        "api_admission_cpu_slots": None,
+        "api_admission_memory_bytes": 2 * 1024**3,
+        "api_admission_max_queue": 64,
+        # API artifact collector: seconds since last access, total blob bytes
+        "artifact_max_age": 7 * 24 * 3600,
+        "artifact_max_bytes": 10 * 1024**3,
+        "artifact_gc_interval": 300,
+        # Load tiktoken and lazy imports when an API worker starts
+        "api_prewarm": True,
     }
 
     @classmethod
     def load_config(cls):
-        config = cls.DEFAULT_CONFIG.copy()
+        """
+        Return the merged config as a private copy. The merge is memoised
+        until the config file, a GITTXT_* variable or the cwd changes, so
+        per-file callers such as the classifier do not re-read the JSON.
+        """
+        try:
+            stat = cls.CONFIG_FILE.stat()
+            file_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_key = None
+        key = (
+            str(cls.CONFIG_FILE),
+            file_key,
+            os.getcwd(),
+            tuple(os.getenv(name) for name in cls.ENV_KEYS),
+        )
+        if key != cls._cache_key:
+            cls._cached = cls._read_config()
+            cls._cache_key = key
+        return copy.deepcopy(cls._cached)
+
+    @classmethod
+    def _read_config(cls):
+        config = copy.deepcopy(cls.DEFAULT_CONFIG)
 
         # Step 1: load from config file
         if cls.CONFIG_FILE.exists():
@@ -103,6 +180,17 @@ class ConfigManager:
         if auto_zip_val is not None:
             config["auto_zip"] = auto_zip_val.lower() == "true"
 
+        mirror_cache_val = os.getenv("GITTXT_MIRROR_CACHE")
+        if mirror_cache_val is not None:
+            config["mirror_cache_enabled"] = mirror_cache_val.lower() == "true"
+        config["mirror_cache_dir"] = os.getenv(
+            "GITTXT_MIRROR_CACHE_DIR", config.get("mirror_cache_dir")
+        )
+
+        always_wait_val = os.getenv("GITTXT_API_WAIT")
+        if always_wait_val is not None:
+            config["api_always_wait"] = always_wait_val.lower() == "true"
+
         # Path normalization
         config["output_dir"] = str(Path(config["output_dir"]).resolve())
 
@@ -118,6 +206,7 @@ class ConfigManager:
             cls.CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
             with cls.CONFIG_FILE.open("w", encoding="utf-8") as f:
                 json.dump(cls.DEFAULT_CONFIG, f, indent=4)
+            cls._cache_key = None
             logger.info(f"✅ Default configuration file created at {cls.CONFIG_FILE}")
 
     @classmethod
@@ -128,6 +217,7 @@ class ConfigManager:
         try:
             with cls.CONFIG_FILE.open("w", encoding="utf-8") as f:
                 json.dump(updated_config, f, indent=4)
+            cls._cache_key = None
             logger.info(f"✅ Configuration updated in {cls.CONFIG_FILE}")
         except Exception as e:
             logger.error(f"❌ Failed to update configuration file: {e}")
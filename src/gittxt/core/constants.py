@@ -2,6 +2,7 @@ TEXT_DIR = "txt"
 JSON_DIR = "json"
 MD_DIR = "md"
 ZIP_DIR = "zip"
+SQLITE_DIR = "sqlite"
 TEMP_DIR = "temp"
 REVERSE_DIR = "reverse"
 
@@ -19,7 +20,7 @@ EXCLUDED_DIRS_DEFAULT = [
 ]
 
 # If you want a quick reference to all subdirectories that might be cleaned:
-OUTPUT_SUBDIRS = [TEXT_DIR, JSON_DIR, MD_DIR, ZIP_DIR, TEMP_DIR]
+OUTPUT_SUBDIRS = [TEXT_DIR, JSON_DIR, MD_DIR, SQLITE_DIR, ZIP_DIR, TEMP_DIR]
 
 # Updated config keys to textual_exts / non_textual_exts
 DEFAULT_FILETYPE_CONFIG = {
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+STAGES = ("clone", "walk", "classify", "tokenize", "format", "zip")
+COUNTERS = ("files_seen", "files_accepted", "bytes_read", "tokens_counted")
+
+
+class ScanEvents:
+    """
+    Progress of one scan: the current stage plus running counters, fanned
+    out to any number of subscribers.
+
+    RepositoryHandler, Scanner, generate_summary and OutputBuilder take an
+    optional `events` and call `stage()` / `add()` at their boundaries.
+    Counting is a dict increment; snapshots are only built and queued while
+    someone is subscribed, and `progress` events are throttled to one per
+    `interval` seconds. Hooks must be called from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        on_stage: Optional[Callable[[str], None]] = None,
+        interval: float = 0.25,
+        max_pending: int = 100,
+    ):
+        self.on_stage = on_stage
+        self.interval = interval
+        self.max_pending = max_pending
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.stage_name: Optional[str] = None
+        self.started = time.monotonic()
+        self.stage_started = self.started
+        self.git = None
+        self.final: Optional[dict] = None
+        self._subscribers: List[asyncio.Queue] = []
+        self._last_progress = 0.0
+
+    def begin(self, on_stage: Optional[Callable[[str], None]] = None):
+        """
+        Restart the clock when the work actually starts, e.g. a queued job.
+        """
+        self.started = self.stage_started = time.monotonic()
+        if on_stage is not None:
+            self.on_stage = on_stage
+
+    def stage(self, name: str):
+        if name == self.stage_name:
+            return
+        self.stage_name = name
+        self.stage_started = time.monotonic()
+        if self.on_stage is not None:
+            self.on_stage(name)
+        if self._subscribers:
+            self._publish("stage", self.snapshot())
+
+    def add(self, counter: str, amount: int = 1):
+        self.counters[counter] += amount
+        if self._subscribers:
+            self._progress()
+
+    def git_progress(self, phase: str, percent: int):
+        """
+        `on_progress` callback for clones and fetches.
+        """
+        self.git = {"phase": phase, "percent": percent}
+        if self._subscribers:
+            self._progress()
+
+    def _progress(self):
+        now = time.monotonic()
+        if now - self._last_progress >= self.interval:
+            self._last_progress = now
+            self._publish("progress", self.snapshot())
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        elapsed = max(now - self.started, 1e-9)
+        data = {
+            "stage": self.stage_name,
+            "elapsed": round(elapsed, 3),
+            "stage_elapsed": round(now - self.stage_started, 3),
+            **self.counters,
+            "files_per_sec": round(self.counters["files_seen"] / elapsed, 1),
+            "bytes_per_sec": round(self.counters["bytes_read"] / elapsed),
+        }
+        if self.git is not None and self.stage_name == "clone":
+            data["git"] = self.git
+        return data
+
+    def close(self, state: str, error: str = None):
+        """
+        Publish the final `end` event; later subscribers get it straight away.
+        """
+        self.final = {**self.snapshot(), "state": state, "error": error}
+        self._publish("end", self.final)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        if self.final is not None:
+            queue.put_nowait(("end", self.final))
+        else:
+            queue.put_nowait(("stage", self.snapshot()))
+            self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def _publish(self, kind: str, data: dict):
+        for queue in self._subscribers:
+            # A slow reader loses old progress snapshots, never stages or end
+            if queue.qsize() >= self.max_pending:
+                pending = [item for item in _drain(queue) if item[0] != "progress"]
+                for item in pending:
+                    queue.put_nowait(item)
+            queue.put_nowait((kind, data))
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
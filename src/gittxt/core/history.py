@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from gittxt.core.logger import Logger
+from gittxt.core.scanner import Scanner
+from gittxt.core.sources import GitObjectSource
+from gittxt.utils.git_utils import run_git_async
+
+logger = Logger.get_logger(__name__)
+
+
+async def resolve_revisions(
+    source: GitObjectSource,
+    revs: Iterable[str] = (),
+    last_tags: Optional[int] = None,
+    last_commits: Optional[int] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Expand the requested revisions into (label, commit) pairs, newest first
+    for tags and commits, in the given order for explicit revs. Labels are
+    deduplicated; tags are labelled by name, commits by short hash.
+    """
+    git = ("--git-dir", str(source.git_dir))
+    wanted: List[str] = list(revs)
+    if last_tags:
+        result = await run_git_async(
+            *git,
+            "for-each-ref",
+            "--sort=-creatordate",
+            f"--count={last_tags}",
+            "--format=%(refname:short)",
+            "refs/tags",
+        )
+        wanted += result.stdout.split()
+    short = []
+    if last_commits:
+        result = await run_git_async(
+            *git,
+            "rev-list",
+            "--first-parent",
+            f"--max-count={last_commits}",
+            source.commit,
+        )
+        short = [commit[:12] for commit in result.stdout.split()]
+
+    revisions = {}
+    for label in wanted + short:
+        if label in revisions:
+            continue
+        result = await run_git_async(
+            *git, "rev-parse", "--verify", f"{label}^{{commit}}"
+        )
+        revisions[label] = result.stdout.strip()
+    return list(revisions.items())
+
+
+class RevisionScan:
+    """
+    The scanned file set of one revision.
+    """
+
+    def __init__(self, label: str, source: GitObjectSource, textual, non_textual):
+        self.label = label
+        self.source = source
+        self.commit = source.commit
+        self.textual_files = textual
+        self.non_textual_files = non_textual
+        self.skipped_files = []
+
+
+class HistoryScanner:
+    """
+    Scan many revisions of one repository for the price of their distinct blobs.
+
+    Every revision is opened with `source.at(commit)`, so all of them share
+    one `cat-file` process, one blob LRU and one per-blob memo: a file that
+    is identical across N revisions is read, classified and tokenized once,
+    and only its tree listing is repeated. Each revision still gets its own
+    complete file set, so per-revision reports are built as usual.
+    """
+
+    def __init__(self, source: GitObjectSource, scan_root: Path, **scanner_options):
+        self.source = source
+        self.scan_root = Path(scan_root)
+        self.scanner_options = scanner_options
+
+    async def scan(self, revisions: List[Tuple[str, str]]) -> List[RevisionScan]:
+        scans = []
+        for label, commit in revisions:
+            rev_source = self.source.at(label, commit=commit)
+            await rev_source.load()
+            scanner = Scanner(
+                root_path=self.scan_root, source=rev_source, **self.scanner_options
+            )
+            textual, non_textual = await scanner.scan_directory()
+            scan = RevisionScan(label, rev_source, textual, non_textual)
+            scan.skipped_files = scanner.skipped_files
+            scans.append(scan)
+
+        listed = sum(len(s.textual_files) + len(s.non_textual_files) for s in scans)
+        unique = len(
+            {f.oid for s in scans for f in s.textual_files + s.non_textual_files}
+        )
+        logger.info(
+            f"🌲 {len(scans)} revisions: {listed} files, {unique} distinct blobs"
+        )
+        return scans
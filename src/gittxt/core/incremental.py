@@ -0,0 +1,292 @@
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+import aiofiles
+from gittxt.core.logger import Logger
+from gittxt.core.config import ConfigManager
+from gittxt.core.scanner import Scanner
+from gittxt.core.sources import GitObjectSource
+from gittxt.core.output_builder import OutputBuilder
+from gittxt.utils.git_utils import run_git_async
+from gittxt.utils.summary_utils import generate_summary
+from gittxt.utils.tree_utils import generate_tree
+from gittxt.utils.index_utils import (
+    ReportIndex,
+    ReportIndexBuilder,
+    SectionReuse,
+    TrackedWriter,
+    index_path_for,
+    stamp_index,
+)
+
+logger = Logger.get_logger(__name__)
+
+# Formats whose per-file sections can be copied byte-for-byte
+SPLICE_FORMATS = {"txt", "md", "json"}
+IGNORE_FILE = ".gittxtignore"
+
+
+class ChangeSet:
+    """
+    Paths changed between two commits, parsed from `git diff --name-status -z`.
+    """
+
+    def __init__(self):
+        self.added: Set[str] = set()
+        self.modified: Set[str] = set()
+        self.deleted: Set[str] = set()
+        self.renamed: Dict[str, str] = {}  # old path -> new path
+
+    @classmethod
+    def parse(cls, output: str) -> "ChangeSet":
+        changes = cls()
+        fields = output.split("\0")
+        i = 0
+        while i < len(fields):
+            status = fields[i]
+            if not status:
+                i += 1
+                continue
+            kind = status[0]
+            if kind in "RC":
+                old, new = fields[i + 1], fields[i + 2]
+                i += 3
+                if kind == "R":
+                    changes.renamed[old] = new
+                else:
+                    changes.added.add(new)
+                continue
+            path = fields[i + 1]
+            i += 2
+            if kind == "A":
+                changes.added.add(path)
+            elif kind == "D":
+                changes.deleted.add(path)
+            else:  # M, T (type change) and anything unmerged
+                changes.modified.add(path)
+        return changes
+
+    @property
+    def touched(self) -> Set[str]:
+        """
+        Paths whose content at the new commit must be read.
+        """
+        return self.added | self.modified | set(self.renamed.values())
+
+    @property
+    def removed(self) -> Set[str]:
+        """
+        Paths that no longer exist at the new commit.
+        """
+        return self.deleted | set(self.renamed)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.deleted or self.renamed)
+
+
+def stamp_reports(outputs: Iterable[Path], commit: str, scan: dict) -> List[Path]:
+    """
+    Record the commit and scan options in every indexed report, so a later
+    `gittxt update` can diff from that commit with the same filters.
+    """
+    stamped = []
+    for output in outputs:
+        if index_path_for(output).exists():
+            stamped.append(stamp_index(output, commit=commit, scan=scan))
+    return stamped
+
+
+class IncrementalUpdater:
+    """
+    Bring an indexed report from the commit it was built at to a newer one.
+
+    Only the paths `git diff` reports are read, classified and tokenized;
+    every other file's section is copied from the old report through its
+    index, and the summary and tree are rebuilt from the index's per-file
+    stats plus the changed files. New content is read from git objects, so
+    the working tree is never consulted.
+    """
+
+    def __init__(
+        self,
+        report_path: Path,
+        repo_path: Optional[Path] = None,
+        since: Optional[str] = None,
+        to: str = "HEAD",
+    ):
+        self.report_path = Path(report_path).resolve()
+        self.repo_path = Path(repo_path).resolve() if repo_path else None
+        self.since = since
+        self.to = to
+
+    async def run(self) -> dict:
+        old = ReportIndex.load(self.report_path)
+        if old.format not in SPLICE_FORMATS:
+            raise ValueError(
+                f"❌ Incremental updates support {sorted(SPLICE_FORMATS)} reports, "
+                f"not '{old.format}'"
+            )
+        scan = old.data.get("scan") or {}
+        since = self.since or old.data.get("commit")
+        if not since:
+            raise ValueError(
+                f"❌ {self.report_path.name} has no recorded commit; pass --since"
+            )
+        repo_path = self.repo_path or (
+            Path(scan["repo_path"]) if scan.get("repo_path") else None
+        )
+        if repo_path is None:
+            raise ValueError("❌ No repository recorded for this report; pass --repo")
+
+        result = await run_git_async(
+            "-C", str(repo_path), "rev-parse", "--absolute-git-dir"
+        )
+        git_dir = Path(result.stdout.strip())
+        subdir = (scan.get("subdir") or "").strip("/")
+        source = await GitObjectSource.create(
+            git_dir, self.to, root=repo_path, subdir=subdir
+        )
+        try:
+            return await self._update(old, scan, since, repo_path, subdir, source)
+        finally:
+            source.close()
+
+    async def _diff(self, git_dir: Path, since: str, to: str, subdir: str):
+        args = ["--git-dir", str(git_dir), "diff", "--name-status", "-z", "-M"]
+        args += [since, to]
+        if subdir:
+            args += ["--", f"{subdir}/"]
+        result = await run_git_async(*args)
+        return ChangeSet.parse(result.stdout)
+
+    async def _update(self, old, scan, since, repo_path, subdir, source) -> dict:
+        changes = await self._diff(source.git_dir, since, source.commit, subdir)
+        outcome = {
+            "report": self.report_path,
+            "since": since,
+            "commit": source.commit,
+            "added": len(changes.added),
+            "modified": len(changes.modified),
+            "deleted": len(changes.deleted),
+            "renamed": len(changes.renamed),
+            "reused": 0,
+            "rescanned": 0,
+            "summary": None,
+        }
+        if not changes:
+            logger.info(f"✅ {self.report_path.name} already at {source.commit[:12]}")
+            if old.data.get("commit") != source.commit:
+                stamp_index(self.report_path, commit=source.commit)
+            return outcome
+
+        root = source.root
+        scan_root = repo_path / subdir if subdir else repo_path
+        listed = list(source.iter_files(under=scan_root))
+
+        def rel(file) -> str:
+            return file.relative_to(root).as_posix()
+
+        touched = changes.touched
+        unchanged = set(old.files) | set(old.assets)
+        unchanged -= touched | changes.removed
+
+        # A new ignore file can re-include or drop any path, so re-filter all
+        rescan_all = scan.get("use_ignore_file") and any(
+            Path(p).name == IGNORE_FILE for p in touched | changes.removed
+        )
+        fresh = [f for f in listed if rescan_all or rel(f) in touched]
+        scanner = Scanner(
+            root_path=Path(scan_root),
+            exclude_dirs=scan.get("exclude_dirs"),
+            size_limit=scan.get("size_limit"),
+            include_patterns=scan.get("include_patterns"),
+            exclude_patterns=scan.get("exclude_patterns"),
+            use_ignore_file=bool(scan.get("use_ignore_file")),
+            source=source,
+        )
+        new_text, new_assets = await scanner.scan_paths(fresh)
+        new_text, new_assets = set(new_text), set(new_assets)
+
+        textual, assets, known = [], [], {}
+        for file in listed:
+            path = rel(file)
+            if file in new_text:
+                textual.append(file)
+            elif file in new_assets:
+                assets.append(file)
+            elif rescan_all or path not in unchanged:
+                continue
+            elif path in old.files:
+                textual.append(file)
+                entry = old.files[path]
+                known[file] = (
+                    "TEXTUAL",
+                    entry.get("subcategory"),
+                    entry.get("size", file.size),
+                    entry.get("tokens", 0),
+                )
+            else:
+                assets.append(file)
+                entry = old.assets[path]
+                known[file] = (
+                    "NON-TEXTUAL",
+                    entry.get("subcategory"),
+                    entry.get("size") or file.size,
+                    0,
+                )
+        # Entries from older indexes may lack a subcategory; recompute those
+        known = {f: stats for f, stats in known.items() if stats[1] is not None}
+
+        file_stats = {}
+        summary = await generate_summary(
+            textual + assets, file_stats=file_stats, known=known
+        )
+        tree_summary = ""
+        if not scan.get("skip_tree"):
+            config = ConfigManager.load_config()
+            tree_summary = generate_tree(
+                textual + assets,
+                scan_root,
+                max_depth=scan.get("tree_depth"),
+                stats=file_stats,
+                max_entries=config.get("tree_max_entries"),
+                max_lines=config.get("tree_max_lines"),
+                max_tokens=config.get("tree_max_tokens"),
+            )
+
+        formatter = OutputBuilder.FORMATTERS[old.format](
+            repo_name=self.report_path.stem,
+            output_dir=self.report_path.parent,
+            repo_path=repo_path,
+            tree_summary=tree_summary,
+            repo_url=scan.get("repo_url") or "",
+            branch=scan.get("branch"),
+            subdir=scan.get("subdir"),
+            mode=old.mode,
+            build_index=True,
+            reproducible=bool(scan.get("reproducible")),
+        )
+        index = ReportIndexBuilder(old.format, old.mode, old.data.get("repo"))
+        index.meta = {"commit": source.commit, "scan": scan}
+        reuse = SectionReuse(old, unchanged)
+
+        tmp = self.report_path.with_name(f"{self.report_path.name}.tmp-{os.getpid()}")
+        try:
+            async with aiofiles.open(tmp, "wb") as fh:
+                await formatter.write_report(
+                    TrackedWriter(fh), textual, assets, summary, index, reuse=reuse
+                )
+            os.replace(tmp, self.report_path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        await index.save(self.report_path)
+
+        outcome["reused"] = reuse.spliced
+        outcome["rescanned"] = len(fresh)
+        outcome["summary"] = summary
+        logger.info(
+            f"🔄 Updated {self.report_path.name} {since[:12]}..{source.commit[:12]}: "
+            f"{reuse.spliced} sections reused, {len(fresh)} files rescanned"
+        )
+        return outcome
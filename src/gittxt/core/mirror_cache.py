@@ -0,0 +1,174 @@
+import os
+import time
+import shutil
+import asyncio
+import hashlib
+import weakref
+from pathlib import Path
+from typing import Optional
+from gittxt.core.logger import Logger
+from gittxt.core.config import ConfigManager
+from gittxt.utils.git_utils import ProgressCallback, run_git_async, sparse_checkout
+
+logger = Logger.get_logger(__name__)
+
+LAST_USED_MARKER = "gittxt-last-used"
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class MirrorCache:
+    """
+    Persistent cache of bare mirrors keyed by remote URL.
+
+    The first scan of a URL runs `git clone --mirror`; later scans only
+    `git fetch` what changed. Worktrees are materialised with
+    `git clone --shared`, which borrows the mirror's objects instead of
+    copying them. Mirrors are evicted least-recently-used first once the
+    cache exceeds `max_bytes`.
+    """
+
+    # asyncio locks belong to one event loop, so keep a table per loop
+    _locks: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.root = Path(root).expanduser().resolve()
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_config(cls) -> Optional["MirrorCache"]:
+        """
+        Build the cache from config, or return None when it is disabled.
+        """
+        config = ConfigManager.load_config()
+        if not config.get("mirror_cache_enabled"):
+            return None
+        root = config.get("mirror_cache_dir") or (
+            Path.home() / ".cache" / "gittxt" / "mirrors"
+        )
+        return cls(
+            Path(root),
+            config.get("mirror_cache_max_bytes"),
+            timeout=config.get("git_timeout"),
+        )
+
+    def _lock_for(self, url: str) -> asyncio.Lock:
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        return locks.setdefault(url, asyncio.Lock())
+
+    def mirror_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+        return self.root / f"{key}.git"
+
+    def _touch(self, mirror: Path):
+        (mirror / LAST_USED_MARKER).write_text(str(time.time()), encoding="utf-8")
+
+    def _last_used(self, mirror: Path) -> float:
+        marker = mirror / LAST_USED_MARKER
+        try:
+            return marker.stat().st_mtime
+        except OSError:
+            return mirror.stat().st_mtime
+
+    async def ensure(
+        self, url: str, on_progress: Optional[ProgressCallback] = None
+    ) -> Path:
+        """
+        Return an up-to-date bare mirror of `url`, cloning or fetching as needed.
+        """
+        mirror = self.mirror_path(url)
+        verbosity = "--progress" if on_progress else "--quiet"
+        async with self._lock_for(url):
+            if mirror.exists():
+                logger.info(f"🔄 Updating cached mirror for {url}")
+                await run_git_async(
+                    "--git-dir",
+                    str(mirror),
+                    "fetch",
+                    verbosity,
+                    "--prune",
+                    "origin",
+                    timeout=self.timeout,
+                    on_progress=on_progress,
+                )
+            else:
+                logger.info(f"🪞 Creating mirror for {url} => {mirror}")
+                tmp = mirror.with_name(f"{mirror.name}.tmp-{os.getpid()}")
+                shutil.rmtree(tmp, ignore_errors=True)
+                try:
+                    await run_git_async(
+                        "clone",
+                        "--mirror",
+                        verbosity,
+                        url,
+                        str(tmp),
+                        timeout=self.timeout,
+                        on_progress=on_progress,
+                    )
+                    os.replace(tmp, mirror)
+                except BaseException:
+                    shutil.rmtree(tmp, ignore_errors=True)
+                    raise
+            self._touch(mirror)
+
+        await asyncio.to_thread(self.evict, mirror)
+        return mirror
+
+    async def materialize(
+        self, mirror: Path, ref: str, dest: Path, sparse_paths: list = None
+    ) -> Path:
+        """
+        Check out `ref` (branch or tag) of a mirror into `dest` without copying
+        objects. With `sparse_paths`, only those directories are checked out.
+        """
+        if dest.exists():
+            shutil.rmtree(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        args = ["clone", "--shared", "--quiet", "--branch", ref]
+        if sparse_paths:
+            args.append("--no-checkout")
+        await run_git_async(*args, str(mirror), str(dest), timeout=self.timeout)
+        if sparse_paths:
+            await sparse_checkout(dest, sparse_paths, ref)
+        return dest
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Delete least-recently-used mirrors until the cache fits its quota.
+        Returns the number of bytes reclaimed.
+        """
+        if not self.max_bytes:
+            return 0
+
+        mirrors = [p for p in self.root.glob("*.git") if p.is_dir()]
+        sizes = {m: _dir_size(m) for m in mirrors}
+        total = sum(sizes.values())
+        reclaimed = 0
+
+        for mirror in sorted(mirrors, key=self._last_used):
+            if total <= self.max_bytes:
+                break
+            if keep and mirror == keep:
+                continue
+            shutil.rmtree(mirror, ignore_errors=True)
+            total -= sizes[mirror]
+            reclaimed += sizes[mirror]
+            logger.info(f"🗑️ Evicted mirror {mirror.name} ({sizes[mirror]} bytes)")
+
+        return reclaimed
@@ -3,26 +3,37 @@ import asyncio
 import re
 import hashlib
 from urllib.parse import urlparse
+import aiofiles
 from gittxt.core.logger import Logger
-from gittxt.core.constants import TEXT_DIR, JSON_DIR, MD_DIR, ZIP_DIR
+from gittxt.core.config import ConfigManager
+from gittxt.core.constants import TEXT_DIR, JSON_DIR, MD_DIR, SQLITE_DIR, ZIP_DIR
 from gittxt.utils.tree_utils import generate_tree
 from gittxt.utils.summary_utils import generate_summary
+from gittxt.utils.index_utils import TrackedWriter
 from gittxt.formatters.text_formatter import TextFormatter
 from gittxt.formatters.json_formatter import JSONFormatter
 from gittxt.formatters.markdown_formatter import MarkdownFormatter
+from gittxt.formatters.sqlite_formatter import SQLiteFormatter
 from gittxt.formatters.zip_formatter import ZipFormatter
 
 logger = Logger.get_logger(__name__)
 
+# Formats whose write_report only appends, so they can go to a stream
+STREAM_FORMATS = ("txt", "md", "json")
+
+# Content-free summary written next to the reports when summary_file is set
+SUMMARY_FILENAME = "summary.json"
+
 
 class OutputBuilder:
-    VALID_FORMATS = {"txt", "json", "md"}
+    VALID_FORMATS = {"txt", "json", "md", "sqlite"}
     VALID_MODES = {"rich", "lite"}
 
     FORMATTERS = {
         "txt": TextFormatter,
         "json": JSONFormatter,
         "md": MarkdownFormatter,
+        "sqlite": SQLiteFormatter,
     }
 
     def __init__(
@@ -34,13 +45,27 @@ class OutputBuilder:
         branch=None,
         subdir=None,
         mode="rich",
+        build_index=False,
+        reproducible=False,
+        events=None,
+        summary_file=False,
     ):
         self.repo_name = repo_name
+        self.events = events
+        self.summary_file = summary_file
         self.repo_url = repo_url or ""
         self.branch = branch
         self.subdir = subdir
         self.mode = mode.lower()
-        self.output_dir = Path(output_dir).resolve()
+        self.build_index = build_index
+        self.reproducible = reproducible
+        config = ConfigManager.load_config()
+        self.tree_limits = {
+            key: config.get(key)
+            for key in ("tree_max_entries", "tree_max_lines", "tree_max_tokens")
+        }
+        # None: nothing is written to disk, reports are only streamed
+        self.output_dir = Path(output_dir).resolve() if output_dir else None
         if isinstance(output_format, str):
             self.output_formats = [
                 fmt.strip().lower() for fmt in output_format.split(",")
@@ -50,6 +75,7 @@ class OutputBuilder:
         else:
             raise TypeError(f"Invalid output_format type: {type(output_format)}")
         self.repo_path = None
+        self.file_stats = {}
 
         # Validate mode and formats
         if self.mode not in self.VALID_MODES:
@@ -62,14 +88,17 @@ class OutputBuilder:
                     f"Unsupported output format: '{fmt}'. Allowed: {', '.join(self.VALID_FORMATS)}"
                 )
 
-        self.directories = {
-            "txt": self.output_dir / TEXT_DIR,
-            "json": self.output_dir / JSON_DIR,
-            "md": self.output_dir / MD_DIR,
-            "zip": self.output_dir / ZIP_DIR,
-        }
-        for folder in self.directories.values():
-            folder.mkdir(parents=True, exist_ok=True)
+        self.directories = {}
+        if self.output_dir is not None:
+            self.directories = {
+                "txt": self.output_dir / TEXT_DIR,
+                "json": self.output_dir / JSON_DIR,
+                "md": self.output_dir / MD_DIR,
+                "sqlite": self.output_dir / SQLITE_DIR,
+                "zip": self.output_dir / ZIP_DIR,
+            }
+            for folder in self.directories.values():
+                folder.mkdir(parents=True, exist_ok=True)
 
     def _get_dynamic_basename(self):
         def sanitize(name):
@@ -114,6 +143,97 @@ class OutputBuilder:
             "raw_url": f"{self.repo_url}/blob/{self.branch}/{github_path}",
         }
 
+    async def _prepare(
+        self, textual_files, non_textual_files, repo_path, tree_depth, skip_tree
+    ):
+        """
+        Summary and directory tree shared by every format of one report.
+        """
+        self.repo_path = Path(repo_path).resolve()
+        root_for_tree = self.repo_path
+        if self.subdir and (self.repo_path / self.subdir).is_dir():
+            root_for_tree = self.repo_path / self.subdir
+        file_stats = self.file_stats = {}
+        summary_data = await generate_summary(
+            textual_files + non_textual_files, file_stats=file_stats, events=self.events
+        )
+        # Render from the scanner's file set so the tree matches what was scanned
+        tree_summary = (
+            ""
+            if skip_tree
+            else generate_tree(
+                textual_files + non_textual_files,
+                root_for_tree,
+                max_depth=tree_depth,
+                stats=file_stats,
+                max_entries=self.tree_limits.get("tree_max_entries"),
+                max_lines=self.tree_limits.get("tree_max_lines"),
+                max_tokens=self.tree_limits.get("tree_max_tokens"),
+            )
+        )
+        return summary_data, tree_summary
+
+    def _formatter(self, fmt, tree_summary, build_index=None):
+        return self.FORMATTERS[fmt](
+            repo_name=self._get_dynamic_basename(),
+            output_dir=self.directories.get(fmt),
+            repo_path=self.repo_path,
+            tree_summary=tree_summary,
+            repo_url=self.repo_url,
+            branch=self.branch,
+            subdir=self.subdir,
+            mode=self.mode,
+            build_index=self.build_index if build_index is None else build_index,
+            reproducible=self.reproducible,
+        )
+
+    async def stream_report(
+        self,
+        fmt,
+        sink,
+        textual_files,
+        non_textual_files,
+        repo_path,
+        tree_depth=None,
+        skip_tree=False,
+    ):
+        """
+        Write one report straight into `sink` (anything with an async
+        `write(bytes)`), section by section, without touching the disk.
+        Only the streaming formats (txt, md, json) are supported.
+        """
+        if fmt not in STREAM_FORMATS:
+            allowed = ", ".join(STREAM_FORMATS)
+            raise ValueError(f"Format '{fmt}' cannot be streamed. Allowed: {allowed}")
+        summary_data, tree_summary = await self._prepare(
+            textual_files, non_textual_files, repo_path, tree_depth, skip_tree
+        )
+        if self.events is not None:
+            self.events.stage("format")
+        formatter = self._formatter(fmt, tree_summary, build_index=False)
+        await formatter.write_report(
+            TrackedWriter(sink), textual_files, non_textual_files, summary_data
+        )
+
+    async def _write_summary(
+        self, textual_files, non_textual_files, summary_data, tree_summary
+    ):
+        """
+        Write SUMMARY_FILENAME: stats, breakdowns and per-file metadata
+        (no content), small enough to serve without reading the reports.
+        """
+        formatter = self._formatter("json", tree_summary, build_index=False)
+        summary_path = self.output_dir / SUMMARY_FILENAME
+        async with aiofiles.open(summary_path, "wb") as fh:
+            await formatter.write_summary(
+                TrackedWriter(fh),
+                textual_files,
+                non_textual_files,
+                summary_data,
+                file_stats=self.file_stats,
+            )
+        return summary_path
+
     async def generate_output(
         self,
         textual_files,
@@ -123,11 +243,14 @@ class OutputBuilder:
         tree_depth=None,
         skip_tree=False,
     ):
-        self.repo_path = Path(repo_path).resolve()
-        root_for_tree = self.repo_path / self.subdir if self.subdir else self.repo_path
-        tree_summary = "" if skip_tree else generate_tree(root_for_tree, max_depth=tree_depth)
-        summary_data = await generate_summary(textual_files + non_textual_files)
+        if self.output_dir is None:
+            raise ValueError("generate_output needs an output_dir")
+        summary_data, tree_summary = await self._prepare(
+            textual_files, non_textual_files, repo_path, tree_depth, skip_tree
+        )
 
+        if self.events is not None:
+            self.events.stage("format")
         output_files = []
         tasks = []
 
@@ -137,17 +260,7 @@ class OutputBuilder:
                 logger.warning(f"\u26a0\ufe0f Unsupported formatter: {fmt}")
                 continue
 
-            formatter = FormatterClass(
-                repo_name=self._get_dynamic_basename(),
-                output_dir=self.directories[fmt],
-                repo_path=self.repo_path,
-                tree_summary=tree_summary,
-                repo_url=self.repo_url,
-                branch=self.branch,
-                subdir=self.subdir,
-                mode=self.mode,
-            )
-
+            formatter = self._formatter(fmt, tree_summary)
             tasks.append(
                 formatter.generate(
                     text_files=textual_files,
@@ -165,20 +278,19 @@ class OutputBuilder:
                 output_files.append(result)
                 logger.info(f"\ud83d\udcc4 Output generated: {result}")
 
+        if self.summary_file:
+            output_files.append(
+                await self._write_summary(
+                    textual_files, non_textual_files, summary_data, tree_summary
+                )
+            )
+
         if create_zip:
+            if self.events is not None:
+                self.events.stage("zip")
             full_output_files = []
             for fmt in self.output_formats:
-                FormatterClass = self.FORMATTERS[fmt]
-                formatter = FormatterClass(
-                    repo_name=self._get_dynamic_basename(),
-                    output_dir=self.directories[fmt],
-                    repo_path=self.repo_path,
-                    tree_summary=tree_summary,
-                    repo_url=self.repo_url,
-                    branch=self.branch,
-                    subdir=self.subdir,
-                    mode=self.mode,
-                )
+                formatter = self._formatter(fmt, tree_summary)
                 try:
                     result = await formatter.generate(
                         text_files=textual_files,
@@ -197,6 +309,7 @@ class OutputBuilder:
                 non_textual_files=non_textual_files,
                 repo_path=self.repo_path,
                 repo_url=self.repo_url,
+                reproducible=self.reproducible,
             )
             zip_path = await zip_formatter.generate()
             if zip_path:
@@ -1,12 +1,21 @@
-import git
 import tempfile
 from pathlib import Path
+from urllib.parse import urlparse
 from gittxt.core.logger import Logger
+from gittxt.core.config import ConfigManager
+from gittxt.core.mirror_cache import MirrorCache
+from gittxt.core.sources import ArchiveSource, GitObjectSource, is_archive
 from gittxt.utils.repo_url_parser import parse_github_url
 from gittxt.utils.cleanup_utils import delete_directory
-
-import subprocess
-import re
+from gittxt.utils.git_utils import (
+    ProgressCallback,
+    run_git_async,
+    ref_exists,
+    remote_commit,
+    remote_default_branch,
+    symbolic_head,
+    sparse_checkout,
+)
 
 logger = Logger.get_logger(__name__)
 
@@ -15,6 +24,19 @@ class RepositoryHandler:
     """
     Handles local path usage or remote GitHub cloning for scanning.
     Extracts subdir and branch if specified in the URL or in the constructor.
+
+    With `from_objects=True` nothing is checked out: `scan_source` serves the
+    commit's files straight from the object database and `repo_path` is only
+    the root their paths hang off. `full_history=True` keeps every commit and
+    tag of a remote (no `--depth 1`) so several revisions can be scanned.
+    A local .zip or tar archive is served the same way by an ArchiveSource,
+    without being extracted.
+
+    All git work runs as asyncio subprocesses, so resolving one repo never
+    blocks the event loop; `on_progress(phase, percent)` receives clone and
+    fetch progress, and each network command is bounded by `timeout`.
+    With `events` (a ScanEvents), resolving is reported as the clone stage
+    and git progress goes to it unless `on_progress` is given.
     """
 
     def __init__(
@@ -23,31 +45,130 @@ class RepositoryHandler:
         branch: str = None,
         subdir: str = "",
         cache_dir: Path = None,
+        mirror_cache: MirrorCache = None,
+        from_objects: bool = False,
+        on_progress: ProgressCallback = None,
+        timeout: float = None,
+        full_history: bool = False,
+        events=None,
     ):
         self.source = str(source)
         self.subdir = subdir
-        self.branch = branch or "main"
+        self.requested_branch = branch
+        self.branch = branch
         self.cache_dir = cache_dir or Path(tempfile.mkdtemp(prefix="gittxt_"))
+        self.mirror_cache = mirror_cache
+        self.from_objects = from_objects or full_history
+        self.full_history = full_history
+        self.scan_source: GitObjectSource | ArchiveSource = None
+        self.events = events
+        self.on_progress = on_progress
+        if on_progress is None and events is not None:
+            self.on_progress = events.git_progress
+        config = ConfigManager.load_config()
+        self.timeout = timeout or config.get("git_timeout")
+        self.default_branch_ttl = config.get("default_branch_ttl", 3600)
 
         if isinstance(source, Path) or (
             isinstance(source, str) and Path(source).exists()
         ):
             self.repo_path = Path(source).resolve()
             self.is_remote = False
+            self.is_archive = is_archive(self.repo_path)
         elif isinstance(source, str) and (
-            "github.com" in source or source.startswith("git@")
+            "github.com" in source
+            or source.startswith("git@")
+            or source.startswith("file://")
         ):
             self.repo_url = source
             self.is_remote = True
+            self.is_archive = False
         else:
             raise ValueError(f"Unsupported repository source: {source}")
 
     async def resolve(self) -> Path:
+        if self.events is not None:
+            self.events.stage("clone")
         if self.is_remote:
             return await self._clone_and_resolve()
+        if self.is_archive:
+            self.scan_source = ArchiveSource(self.repo_path, strip_root=True)
+            logger.info(f"📦 Reading {self.repo_path.name} without extracting")
+            return Path(self.scan_source.root)
+        if self.from_objects:
+            await self._open_local_objects()
         return self.repo_path
 
-    async def _clone_and_resolve(self) -> Path:
+    def close(self):
+        """
+        Stop the object source's git process, if one was started.
+        """
+        if self.scan_source is not None:
+            self.scan_source.close()
+            self.scan_source = None
+
+    async def head_commit(self) -> str | None:
+        """
+        Return the commit the scanned files come from, or None when the
+        scanned path is not the top of a git work tree.
+        """
+        if self.is_archive:
+            return None
+        if self.scan_source is not None:
+            return self.scan_source.commit
+        result = await run_git_async(
+            "-C", str(self.repo_path), "rev-parse", "--show-prefix", "HEAD", check=False
+        )
+        prefix, _, commit = result.stdout.partition("\n")
+        if result.returncode != 0 or prefix:
+            return None
+        return commit.strip() or None
+
+    async def source_commit(self) -> str | None:
+        """
+        The commit a scan of this source would read, found without cloning:
+        `ls-remote` for remotes, HEAD for a local work tree with no
+        uncommitted changes. None when there is no such commit (archives,
+        plain directories, dirty trees, unknown refs). Once resolved, object
+        scans and fresh clones answer with the commit they actually read.
+        """
+        if self.is_archive:
+            return None
+        if self.scan_source is not None:
+            return self.scan_source.commit
+        if self.is_remote and getattr(self, "repo_path", None) is not None:
+            return await self.head_commit()
+        if self.is_remote:
+            git_url, _, branch, _ = self._parse_remote()
+            return await remote_commit(git_url, branch, timeout=self.timeout)
+        status = await run_git_async(
+            "-C", str(self.repo_path), "status", "--porcelain", check=False
+        )
+        if status.returncode != 0 or status.stdout.strip():
+            return None
+        return await self.head_commit()
+
+    async def _open_local_objects(self):
+        result = await run_git_async(
+            "-C", str(self.repo_path), "rev-parse", "--absolute-git-dir"
+        )
+        git_dir = Path(result.stdout.strip())
+        ref = self.requested_branch or "HEAD"
+        self.scan_source = await GitObjectSource.create(
+            git_dir, ref, root=self.repo_path, subdir=self.subdir
+        )
+        self.branch = self.requested_branch or await symbolic_head(git_dir)
+        logger.info(f"🌲 Reading {self.repo_path} at {self.scan_source.commit[:12]}")
+
+    def _parse_remote(self) -> tuple[str, str, str, str]:
+        """
+        Return (git_url, repo_name, branch, subdir) for the remote source.
+        """
+        if self.repo_url.startswith("file://"):
+            repo_name = Path(urlparse(self.repo_url).path).name
+            repo_name = repo_name[:-4] if repo_name.endswith(".git") else repo_name
+            return self.repo_url, repo_name, self.branch, self.subdir
+
         parsed = parse_github_url(self.repo_url)
         host = parsed.get("host")
         owner = parsed.get("owner")
@@ -61,9 +182,81 @@ class RepositoryHandler:
             git_url = f"https://{host}/{owner}/{repo_name}.git"
         if not git_url.endswith(".git"):
             git_url += ".git"
+        return git_url, repo_name, branch, subdir
+
+    async def _fetch(self, *args: str):
+        """
+        Run a network git command (clone/fetch) with progress and timeout.
+        """
+        verbosity = "--progress" if self.on_progress else "--quiet"
+        return await run_git_async(
+            args[0],
+            verbosity,
+            *args[1:],
+            timeout=self.timeout,
+            on_progress=self.on_progress,
+        )
 
-        temp_dir = self._prepare_temp_dir(repo_name)
-        self._clone_remote_repo(git_url, branch, temp_dir)
+    async def _default_branch(self, git_url: str) -> str:
+        """
+        Resolve the remote's default branch without cloning (cached per URL).
+        """
+        branch = await remote_default_branch(
+            git_url, ttl=self.default_branch_ttl, timeout=self.timeout
+        )
+        if not branch:
+            raise RuntimeError(f"❌ Could not determine default branch of {git_url}")
+        logger.info(f"🧭 Default branch of {git_url}: {branch}")
+        return branch
+
+    async def _fallback_branch(self, git_url: str, branch: str, error) -> str:
+        """
+        The requested branch could not be cloned; switch to the default one.
+        """
+        logger.warning(f"⚠️ Could not clone branch '{branch}': {error}")
+        default = await self._default_branch(git_url)
+        if default == branch:
+            raise RuntimeError(
+                f"❌ Clone attempts failed.\nGit URL: {git_url}\nError: {error}"
+            ) from error
+        return default
+
+    async def _clone_and_resolve(self) -> Path:
+        git_url, repo_name, branch, subdir = self._parse_remote()
+
+        # None means "use config"; pass False to always clone fresh
+        if self.mirror_cache is None:
+            self.mirror_cache = MirrorCache.from_config()
+
+        # Mirrors know their HEAD already; otherwise ask the remote once
+        if not branch and not self.mirror_cache:
+            try:
+                branch = await self._default_branch(git_url)
+            except RuntimeError as e:
+                raise RuntimeError(
+                    f"❌ Clone attempts failed.\nGit URL: {git_url}\nError: {e}"
+                ) from e
+
+        if self.from_objects:
+            temp_dir = await self._open_remote_objects(
+                git_url, branch, repo_name, subdir
+            )
+        elif self.mirror_cache:
+            temp_dir = await self._checkout_from_mirror(
+                git_url, branch, repo_name, subdir
+            )
+        else:
+            temp_dir = self._prepare_temp_dir(repo_name)
+            try:
+                if not (
+                    subdir
+                    and await self._sparse_clone(git_url, branch, subdir, temp_dir)
+                ):
+                    await self._clone_remote_repo(git_url, branch, temp_dir)
+            except BaseException:
+                # Includes cancellation: never leave a half-written clone behind
+                delete_directory(temp_dir)
+                raise
 
         self.repo_path = temp_dir
         self.subdir = subdir
@@ -73,6 +266,107 @@ class RepositoryHandler:
         )
         return temp_dir
 
+    async def _ensure_mirror(self, git_url: str, branch: str) -> tuple[Path, str]:
+        """
+        Fetch into the persistent mirror; return it with the branch to use.
+        """
+        try:
+            mirror = await self.mirror_cache.ensure(git_url, self.on_progress)
+        except RuntimeError as e:
+            raise RuntimeError(
+                f"❌ Clone attempts failed.\nGit URL: {git_url}\nError: {e}"
+            ) from e
+
+        if branch and await ref_exists(mirror, branch):
+            return mirror, branch
+
+        # A mirror's HEAD tracks the remote's default branch
+        detected_branch = await symbolic_head(mirror)
+        if not detected_branch:
+            raise RuntimeError(f"❌ Branch '{branch}' not found in {git_url}")
+        if branch:
+            logger.info(
+                f"🧭 Branch '{branch}' not found, using default: {detected_branch}"
+            )
+        return mirror, detected_branch
+
+    async def _open_remote_objects(
+        self, git_url: str, branch: str, repo_name: str, subdir: str = None
+    ) -> Path:
+        """
+        Point scan_source at the remote's objects without a working tree:
+        the cached mirror when enabled, else a bare clone that is shallow
+        unless full_history is set.
+        """
+        root = self.cache_dir / repo_name
+        if self.mirror_cache:
+            git_dir, branch = await self._ensure_mirror(git_url, branch)
+        else:
+            git_dir = root
+            if git_dir.exists():
+                delete_directory(git_dir)
+            depth = [] if self.full_history else ["--depth", "1"]
+            args = ["clone", "--bare", *depth, "--branch"]
+            try:
+                await self._fetch(*args, branch, git_url, str(git_dir))
+            except RuntimeError as e:
+                delete_directory(git_dir)
+                branch = await self._fallback_branch(git_url, branch, e)
+                await self._fetch(*args, branch, git_url, str(git_dir))
+
+        self.branch = branch
+        self.scan_source = await GitObjectSource.create(
+            git_dir, branch, root=root, subdir=subdir
+        )
+        return root
+
+    async def _checkout_from_mirror(
+        self, git_url: str, branch: str, repo_name: str, subdir: str = None
+    ) -> Path:
+        """
+        Fetch into the persistent mirror and materialise a shared worktree.
+        """
+        mirror, branch = await self._ensure_mirror(git_url, branch)
+        self.branch = branch
+        return await self.mirror_cache.materialize(
+            mirror,
+            branch,
+            self.cache_dir / repo_name,
+            sparse_paths=[subdir] if subdir else None,
+        )
+
+    async def _sparse_clone(
+        self, git_url: str, branch: str, subdir: str, temp_dir: Path
+    ):
+        """
+        Blobless, shallow clone with a cone-mode sparse checkout of `subdir`.
+        Servers without filter support just send full blobs; any other failure
+        returns False so the caller can fall back to a regular clone.
+        """
+        try:
+            logger.info(
+                f"🚀 Sparse cloning {git_url} (branch={branch}, subdir={subdir})"
+            )
+            await self._fetch(
+                "clone",
+                "--filter=blob:none",
+                "--no-checkout",
+                "--depth",
+                "1",
+                "--branch",
+                branch,
+                git_url,
+                str(temp_dir),
+            )
+            await sparse_checkout(temp_dir, [subdir], branch)
+            self.branch = branch
+            return True
+        except RuntimeError as e:
+            logger.warning(f"⚠️ Sparse clone failed, falling back to full clone: {e}")
+            delete_directory(temp_dir)
+            temp_dir.mkdir(parents=True, exist_ok=True)
+            return False
+
     def _prepare_temp_dir(self, repo_name: str) -> Path:
         temp_dir = self.cache_dir / repo_name
         if temp_dir.exists():
@@ -80,40 +374,19 @@ class RepositoryHandler:
         temp_dir.mkdir(parents=True, exist_ok=True)
         return temp_dir
 
-    def _clone_remote_repo(self, git_url: str, branch: str, temp_dir: Path):
+    async def _clone_remote_repo(self, git_url: str, branch: str, temp_dir: Path):
+        logger.info(
+            f"🚀 Cloning repository: {git_url} (branch={branch}) => {temp_dir}"
+        )
+        args = ["clone", "--depth", "1", "--branch"]
         try:
-            logger.info(
-                f"🚀 Cloning repository: {git_url} (branch={branch}) => {temp_dir}"
-            )
-            git.Repo.clone_from(git_url, str(temp_dir), depth=1, branch=branch)
-            self.branch = branch
-        except git.GitCommandError as e:
-            logger.warning(f"⚠️ Initial clone failed: {e}")
-            logger.info("🔁 Retrying without branch specification...")
-            try:
-                git.Repo.clone_from(git_url, str(temp_dir), depth=1)
-                # Detect default branch
-                result = subprocess.run(
-                    ["git", "remote", "show", "origin"],
-                    cwd=temp_dir,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-                match = re.search(r"HEAD branch:\s+(\S+)", result.stdout)
-                detected_branch = match.group(1) if match else "main"
-                logger.info(f"🧭 Default branch detected: {detected_branch}")
-                self.branch = detected_branch
-
-                # Checkout correct branch
-                repo = git.Repo(temp_dir)
-                repo.git.checkout(self.branch)
-            except Exception as fallback_error:
-                delete_directory(temp_dir)
-                raise RuntimeError(
-                    f"❌ Clone attempts failed.\nGit URL: {git_url}\n"
-                    f"Original error: {e}\nFallback error: {fallback_error}"
-                ) from fallback_error
+            await self._fetch(*args, branch, git_url, str(temp_dir))
+        except RuntimeError as e:
+            delete_directory(temp_dir)
+            branch = await self._fallback_branch(git_url, branch, e)
+            logger.info(f"🔁 Cloning default branch '{branch}' instead")
+            await self._fetch(*args, branch, git_url, str(temp_dir))
+        self.branch = branch
 
     def get_local_path(self) -> tuple[str, str, bool, str, str]:
         """
@@ -127,6 +400,10 @@ class RepositoryHandler:
                 self.repo_path.name,
                 self.branch,
             )
+        elif self.is_archive:
+            # Files hang off a virtual root named after the archive
+            root = Path(self.scan_source.root)
+            return (str(root), self.subdir, False, root.name, self.branch)
         else:
             path = Path(self.source).resolve()
             if not path.exists() or not path.is_dir():
@@ -2,6 +2,8 @@ import asyncio
 from pathlib import Path
 from typing import List, Optional
 from gittxt.utils import pattern_utils
+from gittxt.core.sources import FileSource
+from gittxt.core.events import ScanEvents
 from gittxt.core.logger import Logger
 from gittxt.core.config import ConfigManager
 from gittxt.utils import filetype_utils
@@ -13,6 +15,9 @@ class Scanner:
     """
     Scans directories for textual files, ignoring non-textual ones.
     Applies folder and size excludes. Optionally merges .gitignore.
+    With a `source`, files are listed from it (e.g. a git tree) instead of
+    walking root_path on disk. `events` receives the walk/classify stages
+    and seen/accepted counts.
     """
 
     def __init__(
@@ -26,8 +31,12 @@ class Scanner:
         batch_size: int = 50,
         verbose: bool = False,
         use_ignore_file: bool = False,
+        source: Optional[FileSource] = None,
+        events: Optional[ScanEvents] = None,
     ):
         self.root_path = root_path.resolve()
+        self.source = source
+        self.events = events
         self.exclude_dirs = list(exclude_dirs or [])
         self.size_limit = size_limit
         self.include_patterns = list(include_patterns) if include_patterns else []
@@ -41,7 +50,9 @@ class Scanner:
 
         if use_ignore_file:
             ignore_file = self.root_path / ".gittxtignore"
-            if ignore_file.exists():
+            if source is not None:
+                ignore_file = source.find(ignore_file)
+            if ignore_file and ignore_file.exists():
                 from gittxt.utils.ignore_utils import parse_ignore_file
 
                 patterns = parse_ignore_file(ignore_file)
@@ -55,12 +66,28 @@ class Scanner:
         Returns:
         Tuple[List[Path], List[Path]]: Accepted textual files and non-textual files
         """
+        if self.events is not None:
+            self.events.stage("walk")
+        if self.source is not None:
+            await self.source.load()
+            candidates = self.source.iter_files(under=self.root_path)
+        else:
+            candidates = self.root_path.rglob("*")
+        return await self.scan_paths(candidates)
+
+    async def scan_paths(self, candidates) -> List[Path]:
+        """
+        Apply the same filters as scan_directory to an explicit set of paths,
+        e.g. only the files a commit touched.
+        """
         all_items = [
             p
-            for p in self.root_path.rglob("*")
+            for p in candidates
             if not pattern_utils.match_exclude_dir(p, self.exclude_dirs)
         ]
         logger.debug(f"📂 Found {len(all_items)} items after exclude_dir filtering.")
+        if self.events is not None:
+            self.events.stage("classify")
         config = ConfigManager.load_config()
         concurrency = config.get("scan_concurrency", 200)
         semaphore = asyncio.Semaphore(concurrency)
@@ -102,6 +129,8 @@ class Scanner:
 
         if not path.is_file():
             return
+        if self.events is not None:
+            self.events.add("files_seen")
 
         label = filetype_utils.classify_file(path)
 
@@ -139,3 +168,5 @@ class Scanner:
             return
 
         self.accepted_files.append(path)
+        if self.events is not None:
+            self.events.add("files_accepted")
@@ -0,0 +1,569 @@
+import io
+import os
+import stat
+import tarfile
+import zipfile
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+from gittxt.core.logger import Logger
+from gittxt.utils.git_utils import GIT_ENV, run_git, run_git_async
+
+logger = Logger.get_logger(__name__)
+
+# Tree entry modes that are neither regular files nor executables
+SYMLINK_MODE = "120000"
+GITLINK_MODE = "160000"
+
+ARCHIVE_SUFFIXES = (
+    ".zip",
+    ".tar",
+    ".tar.gz",
+    ".tgz",
+    ".tar.bz2",
+    ".tbz2",
+    ".tar.xz",
+    ".txz",
+)
+
+
+class ArchiveLimitError(ValueError):
+    """
+    Raised when an archive lists more members or uncompressed bytes than allowed.
+    """
+
+
+class VirtualFile:
+    """
+    A file that lives in a FileSource rather than on disk.
+
+    Implements the slice of the pathlib.Path API the scanner, formatters and
+    summary helpers rely on (name/suffix/parts, relative_to, match, stat,
+    open/read_bytes), so files from a git tree flow through the same code as
+    files from a checkout. Size comes from the source listing, not from stat.
+    """
+
+    __slots__ = ("source", "path", "size", "oid")
+
+    def __init__(
+        self, source: "FileSource", path: PurePosixPath, size: int, oid: str = None
+    ):
+        self.source = source
+        self.path = path
+        self.size = size
+        self.oid = oid
+
+    # --- Path-like attributes -------------------------------------------------
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    @property
+    def stem(self) -> str:
+        return self.path.stem
+
+    @property
+    def parts(self) -> tuple:
+        return self.path.parts
+
+    @property
+    def parent(self) -> PurePosixPath:
+        return self.path.parent
+
+    def as_posix(self) -> str:
+        return self.path.as_posix()
+
+    def resolve(self) -> "VirtualFile":
+        return self
+
+    def relative_to(self, other) -> PurePosixPath:
+        return self.path.relative_to(PurePosixPath(Path(other).as_posix()))
+
+    def match(self, pattern: str) -> bool:
+        return self.path.match(pattern)
+
+    def is_file(self) -> bool:
+        return True
+
+    def is_dir(self) -> bool:
+        return False
+
+    def exists(self) -> bool:
+        return True
+
+    def stat(self) -> SimpleNamespace:
+        return SimpleNamespace(st_size=self.size, st_mtime=0)
+
+    # --- Content ------------------------------------------------------------
+    def read_bytes(self) -> bytes:
+        return self.source.read_bytes(self)
+
+    def read_text(self, encoding: str = "utf-8", errors: str = "ignore") -> str:
+        return self.read_bytes().decode(encoding, errors=errors)
+
+    def open(self, mode: str = "rb") -> io.BufferedIOBase:
+        if mode != "rb":
+            raise ValueError(f"❌ Virtual files are read-only (mode={mode!r})")
+        return self.source.open(self)
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    def __repr__(self) -> str:
+        return f"VirtualFile({str(self.path)!r}, size={self.size})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, VirtualFile):
+            return self.source is other.source and self.path == other.path
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self.source), self.path))
+
+    def __lt__(self, other) -> bool:
+        return str(self) < str(other)
+
+
+def memo_key(file, kind: str, *extra) -> Optional[tuple]:
+    """
+    Key for caching a content-derived result of `file` in its source's memo,
+    or None for plain paths on disk. Files without a blob id are keyed by
+    path, which is unique within their (unshared) source.
+    """
+    if isinstance(file, VirtualFile):
+        return (kind, file.oid or file.path, *extra)
+    return None
+
+
+def is_archive(path: Path) -> bool:
+    """
+    True for a local .zip or tar archive that ArchiveSource can serve.
+    """
+    path = Path(path)
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES) and path.is_file()
+
+
+def archive_stem(path: Path) -> str:
+    """
+    Archive file name without its (possibly double) archive suffix.
+    """
+    name = Path(path).name
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if name.lower().endswith(suffix):
+            return name[: -len(suffix)]
+    return Path(path).stem
+
+
+class _ByteCache:
+    """
+    LRU of file contents bounded by total bytes.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[object, bytes]" = OrderedDict()
+        self.size = 0
+
+    def get(self, key) -> Optional[bytes]:
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+        return data
+
+    def put(self, key, data: bytes):
+        if len(data) > self.max_bytes or key in self.entries:
+            return
+        self.entries[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+class FileSource:
+    """
+    Base class for scan sources that are not a plain directory on disk.
+    Subclasses list files under `root` and serve their bytes on demand.
+
+    `memo` caches per-content results (classification, subcategory, token
+    counts) keyed by blob id, so a blob is analysed once however many times
+    it is listed.
+    """
+
+    def __init__(self, root: Path):
+        self.root = PurePosixPath(Path(root).as_posix())
+        self.memo: dict = {}
+
+    async def load(self):
+        """
+        Do any slow listing work up front, off the event loop; iter_files
+        after this does not block.
+        """
+
+    def iter_files(self, under: Path = None) -> Iterator[VirtualFile]:
+        raise NotImplementedError
+
+    def read_bytes(self, file: VirtualFile) -> bytes:
+        raise NotImplementedError
+
+    def open(self, file: VirtualFile) -> io.BufferedIOBase:
+        return io.BytesIO(self.read_bytes(file))
+
+    def find(self, path: Path) -> Optional[VirtualFile]:
+        target = PurePosixPath(Path(path).as_posix())
+        return next((f for f in self.iter_files() if f.path == target), None)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _BlobStore:
+    """
+    One `git cat-file --batch` process plus an LRU of blob contents and the
+    per-blob memo, shared by every GitObjectSource opened on the same repo
+    through `GitObjectSource.at`.
+    """
+
+    def __init__(self, git_dir: Path, cache_bytes: int):
+        self.git_dir = git_dir
+        self.cache = _ByteCache(cache_bytes)
+        self.memo: dict = {}
+        self.proc: Optional[subprocess.Popen] = None
+        self.lock = threading.Lock()
+        self.reads = 0  # blobs fetched from git, i.e. LRU misses
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self.proc is None or self.proc.poll() is not None:
+            self.proc = subprocess.Popen(
+                ["git", "--git-dir", str(self.git_dir), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env={**os.environ, **GIT_ENV},
+            )
+        return self.proc
+
+    def _cat_blob(self, oid: str) -> bytes:
+        proc = self._ensure_process()
+        proc.stdin.write(f"{oid}\n".encode())
+        proc.stdin.flush()
+        header = proc.stdout.readline().decode().split()
+        if len(header) != 3:
+            raise FileNotFoundError(f"❌ Object {oid} missing from {self.git_dir}")
+        data = proc.stdout.read(int(header[2]))
+        proc.stdout.read(1)  # trailing newline
+        self.reads += 1
+        return data
+
+    def read(self, oid: str) -> bytes:
+        with self.lock:
+            data = self.cache.get(oid)
+            if data is None:
+                data = self._cat_blob(oid)
+                self.cache.put(oid, data)
+            return data
+
+    def close(self):
+        with self.lock:
+            if self.proc is not None:
+                try:
+                    self.proc.stdin.close()
+                    self.proc.wait(timeout=5)
+                except Exception:
+                    self.proc.kill()
+                self.proc = None
+            self.cache.clear()
+            self.memo.clear()
+
+
+class GitObjectSource(FileSource):
+    """
+    Serve the files of one commit straight from a git object database.
+
+    The tree is listed once with `git ls-tree -r -l`, which already carries
+    every blob's size, and contents stream through a single long-lived
+    `git cat-file --batch` process, so nothing is checked out and no file
+    is stat'ed. Recently read blobs stay in a small LRU because formatters
+    read each text file more than once.
+
+    `at(ref)` opens another commit of the same repo on the same process, LRU
+    and memo, so a blob shared by many commits is read and analysed once.
+
+    The constructor runs git synchronously; async callers use `create()` and
+    `load()`, which resolve the commit and list the tree without blocking
+    the event loop.
+    """
+
+    def __init__(
+        self,
+        git_dir: Path,
+        ref: str = "HEAD",
+        root: Path = None,
+        subdir: str = "",
+        cache_bytes: int = 32 * 1024 * 1024,
+        commit: Optional[str] = None,
+        _store: Optional[_BlobStore] = None,
+    ):
+        self.git_dir = Path(git_dir)
+        super().__init__(root or self.git_dir)
+        self.ref = ref
+        self.subdir = (subdir or "").strip("/")
+        self.commit = commit or (
+            run_git(*self._rev_parse_args(self.git_dir, ref)).stdout.strip()
+        )
+        self._owns_store = _store is None
+        self._store = _store or _BlobStore(self.git_dir, cache_bytes)
+        self.memo = self._store.memo
+        self._files: Optional[List[VirtualFile]] = None
+
+    @classmethod
+    async def create(
+        cls, git_dir: Path, ref: str = "HEAD", **kwargs
+    ) -> "GitObjectSource":
+        """
+        Async constructor: resolve `ref` and list its tree with non-blocking
+        git calls.
+        """
+        args = cls._rev_parse_args(Path(git_dir), ref)
+        result = await run_git_async(*args)
+        source = cls(git_dir, ref, commit=result.stdout.strip(), **kwargs)
+        await source.load()
+        return source
+
+    def at(self, ref: str, commit: Optional[str] = None) -> "GitObjectSource":
+        """
+        Open `ref` of the same repository, sharing this source's blob store.
+        Pass the already resolved `commit` to skip the blocking rev-parse.
+        Closing the returned source leaves the shared store running.
+        """
+        return GitObjectSource(
+            self.git_dir,
+            ref,
+            root=self.root,
+            subdir=self.subdir,
+            commit=commit,
+            _store=self._store,
+        )
+
+    @property
+    def blob_reads(self) -> int:
+        """
+        Blobs fetched from git so far by every source sharing this store.
+        """
+        return self._store.reads
+
+    @staticmethod
+    def _rev_parse_args(git_dir: Path, ref: str) -> List[str]:
+        return ["--git-dir", str(git_dir), "rev-parse", "--verify", f"{ref}^{{commit}}"]
+
+    def _ls_tree_args(self) -> List[str]:
+        args = ["--git-dir", str(self.git_dir), "ls-tree", "-r", "-l", "-z"]
+        args.append(self.commit)
+        if self.subdir:
+            args += ["--", f"{self.subdir}/"]
+        return args
+
+    async def load(self):
+        if self._files is None:
+            result = await run_git_async(*self._ls_tree_args())
+            self._files = self._parse_tree(result.stdout)
+
+    def _list_tree(self) -> List[VirtualFile]:
+        return self._parse_tree(run_git(*self._ls_tree_args()).stdout)
+
+    def _parse_tree(self, output: str) -> List[VirtualFile]:
+        files = []
+        for entry in output.split("\0"):
+            if not entry:
+                continue
+            meta, _, rel_path = entry.partition("\t")
+            mode, obj_type, oid, size = meta.split()
+            # Symlinks and submodules have no file content of their own
+            if obj_type != "blob" or mode in (SYMLINK_MODE, GITLINK_MODE):
+                continue
+            files.append(VirtualFile(self, self.root / rel_path, int(size), oid))
+        logger.debug(f"🌲 {len(files)} blobs listed at {self.commit[:12]}")
+        return files
+
+    def iter_files(self, under: Path = None) -> Iterator[VirtualFile]:
+        if self._files is None:
+            self._files = self._list_tree()
+        if under is None:
+            yield from self._files
+            return
+        base = PurePosixPath(Path(under).as_posix())
+        for file in self._files:
+            if base in file.path.parents:
+                yield file
+
+    def read_bytes(self, file: VirtualFile) -> bytes:
+        return self._store.read(file.oid)
+
+    def close(self):
+        if self._owns_store:
+            self._store.close()
+
+
+class ArchiveSource(FileSource):
+    """
+    Serve the members of a .zip or tar archive (optionally gzip/bz2/xz
+    compressed) without extracting them.
+
+    Members are listed from the zip central directory or the tar headers,
+    so sizes come from the archive and nothing touches the disk. Contents
+    are decompressed on demand into a small LRU; zip members can also be
+    opened as streams, so sniffing a binary only inflates its first block.
+    Directories, links and members whose names would escape the root
+    (absolute paths, `..`) are skipped. With `strip_root`, a single
+    top-level folder shared by every member (as in GitHub archives) is
+    dropped from the paths. `max_entries` / `max_total_bytes` bound the
+    listing: zip totals come straight from the central directory, tar
+    headers are counted as they stream in, and ArchiveLimitError is raised
+    as soon as either is exceeded, before any member is decompressed.
+    """
+
+    def __init__(
+        self,
+        archive_path: Path,
+        root: Path = None,
+        strip_root: bool = False,
+        cache_bytes: int = 32 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+    ):
+        self.archive_path = Path(archive_path)
+        default_root = self.archive_path.parent / archive_stem(self.archive_path)
+        super().__init__(root or default_root)
+        self._lock = threading.Lock()
+        self._cache = _ByteCache(cache_bytes)
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        if zipfile.is_zipfile(self.archive_path):
+            self._zip = zipfile.ZipFile(self.archive_path)
+        else:
+            self._tar = tarfile.open(self.archive_path, "r:*")
+        self.max_entries = max_entries
+        self.max_total_bytes = max_total_bytes
+        self.top_level: Optional[str] = None
+        self._members: Dict[PurePosixPath, object] = {}
+        try:
+            self._files = self._list_members(strip_root)
+        except Exception:
+            self.close()
+            raise
+
+    def _check_limits(self, entries: int, total_bytes: int):
+        if self.max_entries is not None and entries > self.max_entries:
+            raise ArchiveLimitError(
+                f"{self.archive_path.name} has more than {self.max_entries} entries"
+            )
+        if self.max_total_bytes is not None and total_bytes > self.max_total_bytes:
+            raise ArchiveLimitError(
+                f"{self.archive_path.name} expands to more than "
+                f"{self.max_total_bytes} bytes"
+            )
+
+    def _entries(self):
+        """
+        Yield (name, size, member) for every regular file in the archive.
+        """
+        if self._zip is not None:
+            infos = self._zip.infolist()
+            self._check_limits(len(infos), sum(info.file_size for info in infos))
+            for info in infos:
+                mode = info.external_attr >> 16
+                if info.is_dir() or stat.S_ISLNK(mode):
+                    continue
+                yield info.filename, info.file_size, info
+        else:
+            # Iterating reads one header at a time, so an oversized tar is
+            # rejected without walking the rest of the stream
+            entries = total_bytes = 0
+            for member in self._tar:
+                entries += 1
+                total_bytes += member.size
+                self._check_limits(entries, total_bytes)
+                if member.isfile():
+                    yield member.name, member.size, member
+
+    def _list_members(self, strip_root: bool) -> List[VirtualFile]:
+        entries = []
+        for name, size, member in self._entries():
+            parts = PurePosixPath(name.replace("\\", "/")).parts
+            if not parts or parts[0] == "/" or ".." in parts:
+                logger.warning(f"⚠️ Skipping unsafe archive member: {name}")
+                continue
+            parts = tuple(p for p in parts if p != ".")
+            if parts:
+                entries.append((parts, size, member))
+
+        tops = {parts[0] for parts, _, _ in entries}
+        if strip_root and len(tops) == 1 and all(len(p) > 1 for p, _, _ in entries):
+            self.top_level = tops.pop()
+            entries = [(parts[1:], size, member) for parts, size, member in entries]
+
+        files = []
+        for parts, size, member in entries:
+            path = self.root.joinpath(*parts)
+            self._members[path] = member
+            files.append(VirtualFile(self, path, size))
+        logger.debug(f"📦 {len(files)} members listed in {self.archive_path.name}")
+        return files
+
+    def iter_files(self, under: Path = None) -> Iterator[VirtualFile]:
+        if under is None:
+            yield from self._files
+            return
+        base = PurePosixPath(Path(under).as_posix())
+        for file in self._files:
+            if base in file.path.parents:
+                yield file
+
+    def read_bytes(self, file: VirtualFile) -> bytes:
+        with self._lock:
+            data = self._cache.get(file.path)
+            if data is None:
+                member = self._members[file.path]
+                if self._zip is not None:
+                    data = self._zip.read(member)
+                else:
+                    data = self._tar.extractfile(member).read()
+                self._cache.put(file.path, data)
+            return data
+
+    def open(self, file: VirtualFile) -> io.BufferedIOBase:
+        # zipfile synchronises concurrent member streams itself; tar members
+        # share one sequential stream, so those are read whole under the lock
+        if self._zip is not None:
+            with self._lock:
+                cached = self._cache.get(file.path)
+            if cached is None:
+                return self._zip.open(self._members[file.path])
+        return io.BytesIO(self.read_bytes(file))
+
+    def close(self):
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+            if self._tar is not None:
+                self._tar.close()
+            self._cache.clear()
+            self.memo.clear()
+
@@ -12,6 +12,15 @@ from gittxt.utils.summary_utils import (
     format_size_short,
 )
 from gittxt.utils.repo_url_parser import parse_github_url
+from gittxt.utils.index_utils import TrackedWriter, ReportIndexBuilder
+
+
+def _dump(value, level: int) -> str:
+    """
+    json.dumps(value, indent=2) re-indented to sit `level` levels deep.
+    JSON strings never contain raw newlines, so this is a plain prefix.
+    """
+    return json.dumps(value, indent=2).replace("\n", "\n" + "  " * level)
 
 
 class JSONFormatter:
@@ -25,6 +34,8 @@ class JSONFormatter:
         branch: str = None,
         subdir: str = None,
         mode: str = "rich",
+        build_index: bool = False,
+        reproducible: bool = False,
     ):
         self.repo_name = repo_name
         self.output_dir = output_dir
@@ -35,19 +46,65 @@ class JSONFormatter:
         self.branch = branch
         self.subdir = subdir
         self.mode = mode
+        self.build_index = build_index
+        self.reproducible = reproducible
 
     async def generate(self, text_files, non_textual_files, summary_data: dict):
-        mode = self.mode
         output_file = self.output_dir / f"{self.repo_name}.json"
+        index = (
+            ReportIndexBuilder("json", self.mode, self.repo_name)
+            if self.build_index
+            else None
+        )
+
+        async with aiofiles.open(output_file, "wb") as fh:
+            await self.write_report(
+                TrackedWriter(fh), text_files, non_textual_files, summary_data, index
+            )
+
+        if index:
+            await index.save(output_file)
+        return output_file
+
+    async def write_report(
+        self,
+        jf,
+        text_files,
+        non_textual_files,
+        summary_data: dict,
+        index=None,
+        reuse=None,
+    ):
+        """
+        Stream the report to `jf`, a TrackedWriter over any binary sink.
+        Output is identical to json.dumps(report, indent=2), but entries are
+        written one at a time so the whole report is never held in memory.
+        With `reuse` (a SectionReuse), unchanged file entries are copied from
+        the previous report.
+        """
         ordered_files = sort_textual_files(text_files, base_path=self.repo_root)
+        header = self._header(summary_data, lite=self.mode == "lite")
 
-        if mode == "lite":
-            files = []
-            for text_file in ordered_files:
-                rel_path = text_file.resolve().relative_to(self.repo_root)
-                raw_text = await async_read_text(text_file) or "[no content]"
-                files.append({"path": str(rel_path), "content": raw_text.strip()})
+        await jf.write("{")
+        for key, value in header.items():
+            await jf.write(f"\n  {json.dumps(key)}: {_dump(value, 1)},")
 
+        await jf.write('\n  "files": ')
+        await self._write_entries(
+            jf, ordered_files, self._file_entry, index, reuse
+        )
+
+        if self.mode != "lite":
+            await jf.write(',\n  "assets": ')
+            await self._write_entries(
+                jf, non_textual_files, self._asset_entry, index
+            )
+        elif index:
+            await index.add_assets(non_textual_files, self.repo_root)
+        await jf.write("\n}")
+
+    def _header(self, summary_data: dict, lite: bool) -> dict:
+        if lite:
             # Use parse_github_url to extract the owner
             owner = ""
             if self.repo_url:
@@ -57,7 +114,7 @@ class JSONFormatter:
                 except ValueError:
                     owner = ""
 
-            output = {
+            header = {
                 "repository": {
                     "name": self.repo_name,
                     "owner": owner,
@@ -65,68 +122,23 @@ class JSONFormatter:
                     "subdir": self.subdir,
                 },
                 **({"tree_summary": self.tree_summary} if self.tree_summary else {}),
-                "files": files,
             }
-
         else:
-            files_section = []
-            for text_file in ordered_files:
-                rel_path = text_file.resolve().relative_to(self.repo_root)
-                subcat = await detect_subcategory(text_file, "TEXTUAL")
-                file_url = (
-                    build_github_url(self.repo_url, rel_path, self.branch, self.subdir)
-                    if self.repo_url
-                    else ""
-                )
-                raw_text = await async_read_text(text_file) or "[no content]"
-
-                size_bytes = text_file.stat().st_size
-                token_count = await estimate_tokens_from_file(text_file)
-                size_fmt = format_size_short(size_bytes)
-                token_fmt = format_number_short(token_count)
-
-                files_section.append(
-                    {
-                        "path": str(rel_path),
-                        "subcategory": subcat,
-                        "size_bytes": size_bytes,
-                        "size_human": size_fmt,
-                        "tokens_estimate": token_count,
-                        "tokens_human": token_fmt,
-                        "content": raw_text.strip(),
-                        "url": file_url,
-                    }
-                )
-
-            assets_section = []
-            for asset in non_textual_files:
-                rel_path = asset.resolve().relative_to(self.repo_root)
-                subcat = await detect_subcategory(asset, "NON-TEXTUAL")
-                asset_url = (
-                    build_github_url(self.repo_url, rel_path, self.branch, self.subdir)
-                    if self.repo_url
-                    else ""
-                )
-                size_fmt = format_size_short(asset.stat().st_size)
-
-                assets_section.append(
-                    {
-                        "path": str(rel_path),
-                        "subcategory": subcat,
-                        "size_bytes": asset.stat().st_size,
-                        "size_human": size_fmt,
-                        "url": asset_url,
-                    }
-                )
-
-            output = {
+            header = {
                 "repository": {
                     "name": self.repo_name,
                     "url": self.repo_url,
                     "branch": self.branch,
                     "subdir": self.subdir,
                     **({"tree_summary": self.tree_summary} if self.tree_summary else {}),
-                    "generated_at": datetime.now(timezone.utc).isoformat() + " UTC",
+                    **(
+                        {}
+                        if self.reproducible
+                        else {
+                            "generated_at": datetime.now(timezone.utc).isoformat()
+                            + " UTC"
+                        }
+                    ),
                 },
                 "summary": {
                     "total_files": summary_data.get("total_files"),
@@ -136,11 +148,140 @@ class JSONFormatter:
                     "file_type_breakdown": summary_data.get("file_type_breakdown"),
                     "tokens_by_type": summary_data.get("tokens_by_type"),
                 },
-                "files": files_section,
-                "assets": assets_section,
             }
+        return header
 
-        async with aiofiles.open(output_file, "w", encoding="utf-8") as jf:
-            await jf.write(json.dumps(output, indent=2))
+    async def write_summary(
+        self, jf, text_files, non_textual_files, summary_data: dict, file_stats=None
+    ):
+        """
+        Stream the compact summary to `jf`: the rich report's header and
+        per-file metadata, without any file content. Sizes and tokens come
+        from `file_stats` ({path: (size, tokens)}) when given.
+        """
+        stats = file_stats or {}
+        ordered_files = sort_textual_files(text_files, base_path=self.repo_root)
+        header = self._header(summary_data, lite=False)
 
-        return output_file
+        await jf.write("{")
+        for key, value in header.items():
+            await jf.write(f"\n  {json.dumps(key)}: {_dump(value, 1)},")
+        await jf.write('\n  "files": ')
+        await self._write_entries(
+            jf, ordered_files, lambda f: self._file_metadata(f, stats.get(f))
+        )
+        await jf.write(',\n  "assets": ')
+        await self._write_entries(jf, non_textual_files, self._asset_entry)
+        await jf.write("\n}")
+
+    async def _write_entries(self, jf, items, make_entry, index=None, reuse=None):
+        if not items:
+            await jf.write("[]")
+            return
+        await jf.write("[")
+        for i, item in enumerate(items):
+            separator = ("\n" if i == 0 else ",\n") + "    "
+            if reuse:
+                rel_path = item.resolve().relative_to(self.repo_root)
+                # Old sections start with their own separator; swap it for ours
+                if await reuse.splice(
+                    jf, rel_path, index, separator=separator, strip=b",\n "
+                ):
+                    continue
+            entry, record = await make_entry(item)
+            section_start = jf.offset
+            await jf.write(separator)
+            text = _dump(entry, 2)
+            if index and record.get("kind") == "file":
+                # Locate the content literal; any quote inside a JSON string
+                # value is escaped, so the key marker only matches the real key.
+                marker = '"content": '
+                literal_start = jf.offset + text.index(marker) + len(marker)
+                literal_len = len(json.dumps(entry["content"]))
+                await jf.write(text)
+                index.add_file(
+                    entry["path"],
+                    literal_start,
+                    literal_len,
+                    entry["content"],
+                    tokens=record["tokens"],
+                    section=[section_start, jf.offset],
+                    subcategory=entry.get("subcategory", record.get("subcategory")),
+                    size=record["size"],
+                )
+            else:
+                await jf.write(text)
+                if index and record.get("kind") == "asset":
+                    index.add_asset(
+                        entry["path"],
+                        size=entry.get("size_bytes"),
+                        subcategory=entry.get("subcategory"),
+                    )
+        await jf.write("\n  ]")
+
+    async def _file_entry(self, text_file):
+        rel_path = text_file.resolve().relative_to(self.repo_root)
+        raw_text = await async_read_text(text_file) or "[no content]"
+
+        if self.mode == "lite":
+            record = {"kind": "file", "size": text_file.stat().st_size, "tokens": 0}
+            if self.build_index:
+                record["tokens"] = await estimate_tokens_from_file(text_file)
+                record["subcategory"] = await detect_subcategory(text_file, "TEXTUAL")
+            return {"path": str(rel_path), "content": raw_text.strip()}, record
+
+        entry, record = await self._file_metadata(text_file)
+        url = entry.pop("url")
+        entry.update(content=raw_text.strip(), url=url)
+        return entry, record
+
+    async def _file_metadata(self, text_file, stats=None):
+        """
+        A rich file entry without its content; `stats` is a known
+        (size, tokens) pair that saves reading the file again.
+        """
+        rel_path = text_file.resolve().relative_to(self.repo_root)
+        subcat = await detect_subcategory(text_file, "TEXTUAL")
+        file_url = (
+            build_github_url(self.repo_url, rel_path, self.branch, self.subdir)
+            if self.repo_url
+            else ""
+        )
+
+        if stats is not None:
+            size_bytes, token_count = stats
+        else:
+            size_bytes = text_file.stat().st_size
+            token_count = await estimate_tokens_from_file(text_file)
+        size_fmt = format_size_short(size_bytes)
+        token_fmt = format_number_short(token_count)
+
+        entry = {
+            "path": str(rel_path),
+            "subcategory": subcat,
+            "size_bytes": size_bytes,
+            "size_human": size_fmt,
+            "tokens_estimate": token_count,
+            "tokens_human": token_fmt,
+            "url": file_url,
+        }
+        return entry, {"kind": "file", "size": size_bytes, "tokens": token_count}
+
+    async def _asset_entry(self, asset):
+        rel_path = asset.resolve().relative_to(self.repo_root)
+        subcat = await detect_subcategory(asset, "NON-TEXTUAL")
+        asset_url = (
+            build_github_url(self.repo_url, rel_path, self.branch, self.subdir)
+            if self.repo_url
+            else ""
+        )
+        size_fmt = format_size_short(asset.stat().st_size)
+
+        entry = {
+            "path": str(rel_path),
+            "subcategory": subcat,
+            "size_bytes": asset.stat().st_size,
+            "size_human": size_fmt,
+            "url": asset_url,
+        }
+        return entry, {"kind": "asset"}
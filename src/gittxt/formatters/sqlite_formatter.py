@@ -0,0 +1,192 @@
+import asyncio
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timezone
+from gittxt.utils.file_utils import async_read_bytes
+from gittxt.utils.formatter_utils import sort_textual_files
+from gittxt.utils.subcat_utils import detect_subcategory
+from gittxt.utils.github_url_utils import build_github_url
+from gittxt.utils.hash_utils import git_blob_hash, get_git_blob_hash
+from gittxt.utils.summary_utils import estimate_tokens_from_file
+from gittxt.core.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE repository (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    subcategory TEXT,
+    size_bytes INTEGER,
+    tokens INTEGER,
+    blob_hash TEXT,
+    url TEXT,
+    content TEXT
+);
+CREATE TABLE assets (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    subcategory TEXT,
+    size_bytes INTEGER,
+    blob_hash TEXT,
+    url TEXT
+);
+CREATE INDEX idx_files_subcategory ON files(subcategory);
+CREATE INDEX idx_files_blob_hash ON files(blob_hash);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE files_fts USING fts5(
+    path, content, content='files', content_rowid='id'
+);
+"""
+
+INSERT_FILE = (
+    "INSERT INTO files (path, subcategory, size_bytes, tokens, blob_hash, url, content)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_ASSET = (
+    "INSERT INTO assets (path, subcategory, size_bytes, blob_hash, url)"
+    " VALUES (?, ?, ?, ?, ?)"
+)
+
+
+class SQLiteFormatter:
+    """
+    Writes one row per textual file and per asset into a single SQLite database,
+    with an FTS5 index over file content when the sqlite build supports it.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        repo_name,
+        output_dir: Path,
+        repo_path: Path,
+        tree_summary: str,
+        repo_url: str = None,
+        branch: str = None,
+        subdir: str = None,
+        mode: str = "rich",
+        build_index: bool = False,
+        reproducible: bool = False,
+    ):
+        self.repo_name = repo_name
+        self.output_dir = output_dir
+        self.repo_path = Path(repo_path).resolve()
+        self.repo_root = self.repo_path
+        self.tree_summary = tree_summary
+        self.repo_url = repo_url
+        self.branch = branch
+        self.subdir = subdir
+        self.mode = mode
+        # The database is already randomly addressable; no sidecar index needed.
+        self.build_index = build_index
+        self.reproducible = reproducible
+
+    async def generate(self, text_files, non_textual_files, summary_data: dict):
+        output_file = self.output_dir / f"{self.repo_name}.sqlite"
+        if output_file.exists():
+            output_file.unlink()
+
+        conn = sqlite3.connect(str(output_file), check_same_thread=False)
+        try:
+            has_fts = await asyncio.to_thread(self._create_schema, conn)
+            await asyncio.to_thread(
+                conn.executemany,
+                "INSERT INTO repository (key, value) VALUES (?, ?)",
+                list(self._repository_rows(summary_data).items()),
+            )
+
+            batch = []
+            for text_file in sort_textual_files(text_files, base_path=self.repo_root):
+                batch.append(await self._file_row(text_file))
+                if len(batch) >= self.BATCH_SIZE:
+                    await asyncio.to_thread(conn.executemany, INSERT_FILE, batch)
+                    batch = []
+            if batch:
+                await asyncio.to_thread(conn.executemany, INSERT_FILE, batch)
+
+            if self.mode != "lite":
+                asset_rows = [await self._asset_row(a) for a in non_textual_files]
+                await asyncio.to_thread(conn.executemany, INSERT_ASSET, asset_rows)
+
+            if has_fts:
+                await asyncio.to_thread(
+                    conn.execute, "INSERT INTO files_fts(files_fts) VALUES ('rebuild')"
+                )
+            await asyncio.to_thread(conn.commit)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return output_file
+
+    def _create_schema(self, conn: sqlite3.Connection) -> bool:
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"⚠️ FTS5 unavailable, skipping full-text index: {e}")
+            return False
+
+    def _repository_rows(self, summary_data: dict) -> dict:
+        rows = {
+            "name": self.repo_name,
+            "url": self.repo_url or "",
+            "branch": self.branch or "",
+            "subdir": self.subdir or "",
+            "mode": self.mode,
+            "tree_summary": self.tree_summary or "",
+        }
+        if self.mode != "lite":
+            if not self.reproducible:
+                rows["generated_at"] = datetime.now(timezone.utc).isoformat() + " UTC"
+            rows.update(
+                {
+                    "total_files": str(summary_data.get("total_files", 0)),
+                    "total_size_bytes": str(summary_data.get("total_size", 0)),
+                    "estimated_tokens": str(summary_data.get("estimated_tokens", 0)),
+                }
+            )
+        return rows
+
+    async def _file_row(self, text_file) -> tuple:
+        rel_path = text_file.resolve().relative_to(self.repo_root)
+        data = await async_read_bytes(text_file) or b""
+        content = data.decode("utf-8", errors="ignore")
+        blob_hash = git_blob_hash(data)
+
+        if self.mode == "lite":
+            return (rel_path.as_posix(), None, len(data), None, blob_hash, None, content)
+
+        subcat = await detect_subcategory(text_file, "TEXTUAL")
+        tokens = await estimate_tokens_from_file(text_file)
+        url = (
+            build_github_url(self.repo_url, rel_path, self.branch, self.subdir)
+            if self.repo_url
+            else ""
+        )
+        return (rel_path.as_posix(), subcat, len(data), tokens, blob_hash, url, content)
+
+    async def _asset_row(self, asset) -> tuple:
+        rel_path = asset.resolve().relative_to(self.repo_root)
+        subcat = await detect_subcategory(asset, "NON-TEXTUAL")
+        url = (
+            build_github_url(self.repo_url, rel_path, self.branch, self.subdir)
+            if self.repo_url
+            else ""
+        )
+        # Files read from git objects already know their blob id
+        blob_hash = getattr(asset, "oid", None) or await asyncio.to_thread(
+            get_git_blob_hash, asset
+        )
+        return (rel_path.as_posix(), subcat, asset.stat().st_size, blob_hash, url)
@@ -11,6 +11,7 @@ from gittxt.utils.summary_utils import (
     format_size_short,
 )
 from gittxt.utils.repo_url_parser import parse_github_url
+from gittxt.utils.index_utils import TrackedWriter, ReportIndexBuilder
 
 
 class TextFormatter:
@@ -24,6 +25,8 @@ class TextFormatter:
         branch: str = None,
         subdir: str = None,
         mode: str = "rich",
+        build_index: bool = False,
+        reproducible: bool = False,
     ):
         self.repo_name = repo_name
         self.output_dir = output_dir
@@ -34,97 +37,163 @@ class TextFormatter:
         self.branch = branch
         self.subdir = subdir
         self.mode = mode
+        self.build_index = build_index
+        # Omit generation timestamps so identical inputs give identical bytes
+        self.reproducible = reproducible
 
     async def generate(self, text_files, non_textual_files, summary_data: dict):
-        mode = self.mode
         output_file = self.output_dir / f"{self.repo_name}.txt"
+        index = (
+            ReportIndexBuilder("txt", self.mode, self.repo_name)
+            if self.build_index
+            else None
+        )
+
+        async with aiofiles.open(output_file, "wb") as fh:
+            await self.write_report(
+                TrackedWriter(fh), text_files, non_textual_files, summary_data, index
+            )
+
+        if index:
+            await index.save(output_file)
+        return output_file
+
+    async def write_report(
+        self,
+        txt_file,
+        text_files,
+        non_textual_files,
+        summary_data: dict,
+        index=None,
+        reuse=None,
+    ):
+        """
+        Write the report to `txt_file`, a TrackedWriter over any binary sink.
+        With `reuse` (a SectionReuse), unchanged files are copied verbatim
+        from the previous report instead of being read again.
+        """
+        mode = self.mode
         ordered_files = sort_textual_files(text_files, base_path=self.repo_root)
 
-        async with aiofiles.open(output_file, "w", encoding="utf-8") as txt_file:
-            if mode == "lite":
-                await txt_file.write(f"Repo: {self.repo_name}\n")
-                if self.repo_url:
-                    try:
-                        parsed_data = parse_github_url(self.repo_url)
-                        owner = parsed_data.get("owner", "")
-                    except ValueError:
-                        owner = ""  # Default to empty if parsing fails
-                    await txt_file.write(f"Owner: {owner}\n")
-                if self.branch:
-                    await txt_file.write(f"Branch: {self.branch}\n")
-                if self.subdir:
-                    await txt_file.write(f"Subdir: {self.subdir.strip('/')}\n")
-                if self.tree_summary:
-                    await txt_file.write("=== Directory Tree ===\n")
-                    await txt_file.write(f"{self.tree_summary}\n\n")
-                await txt_file.write("=== Textual Files ===\n")
+        if mode == "lite":
+            await txt_file.write(f"Repo: {self.repo_name}\n")
+            if self.repo_url:
+                try:
+                    parsed_data = parse_github_url(self.repo_url)
+                    owner = parsed_data.get("owner", "")
+                except ValueError:
+                    owner = ""  # Default to empty if parsing fails
+                await txt_file.write(f"Owner: {owner}\n")
+            if self.branch:
+                await txt_file.write(f"Branch: {self.branch}\n")
+            if self.subdir:
+                await txt_file.write(f"Subdir: {self.subdir.strip('/')}\n")
+            if self.tree_summary:
+                await txt_file.write("=== Directory Tree ===\n")
+                await txt_file.write(f"{self.tree_summary}\n\n")
+            await txt_file.write("=== Textual Files ===\n")
 
-                for text_file in ordered_files:
-                    rel_path = text_file.resolve().relative_to(self.repo_root)
-                    raw = await async_read_text(text_file) or "[no content]"
-                    raw = raw.strip()
-                    await txt_file.write(f"---> File: {rel_path} <---\n")
-                    await txt_file.write(f"{raw}\n\n")
-                return output_file
+            for text_file in ordered_files:
+                rel_path = text_file.resolve().relative_to(self.repo_root)
+                if reuse and await reuse.splice(txt_file, rel_path, index):
+                    continue
+                raw = await async_read_text(text_file) or "[no content]"
+                raw = raw.strip()
+                section_start = txt_file.offset
+                await txt_file.write(f"---> File: {rel_path} <---\n")
+                content_start = txt_file.offset
+                await txt_file.write(raw)
+                content_end = txt_file.offset
+                await txt_file.write("\n\n")
+                if index:
+                    index.add_file(
+                        rel_path,
+                        content_start,
+                        content_end - content_start,
+                        raw,
+                        tokens=await estimate_tokens_from_file(text_file),
+                        section=[section_start, txt_file.offset],
+                        subcategory=await detect_subcategory(text_file, "TEXTUAL"),
+                        size=text_file.stat().st_size,
+                    )
+            if index:
+                await index.add_assets(non_textual_files, self.repo_root)
 
-            else:
-                # === Rich Mode ===
-                await txt_file.write("=== Gittxt Report ===\n")
-                await txt_file.write(f"Repo: {self.repo_name}\n")
+        else:
+            # === Rich Mode ===
+            await txt_file.write("=== Gittxt Report ===\n")
+            await txt_file.write(f"Repo: {self.repo_name}\n")
+            if not self.reproducible:
                 await txt_file.write(
                     f"Generated: {datetime.now(timezone.utc).isoformat()} UTC\n"
                 )
-                if self.branch:
-                    await txt_file.write(f"Branch: {self.branch}\n")
-                if self.subdir:
-                    await txt_file.write(f"Subdir: {self.subdir.strip('/')}\n")
-                if self.tree_summary:
-                    await txt_file.write("=== Directory Tree ===\n")
-                    await txt_file.write(f"{self.tree_summary}\n\n")
+            if self.branch:
+                await txt_file.write(f"Branch: {self.branch}\n")
+            if self.subdir:
+                await txt_file.write(f"Subdir: {self.subdir.strip('/')}\n")
+            if self.tree_summary:
+                await txt_file.write("=== Directory Tree ===\n")
+                await txt_file.write(f"{self.tree_summary}\n\n")
 
-                formatted = summary_data.get("formatted", {})
-                await txt_file.write("=== 📊 Summary Report ===\n")
-                await txt_file.write(
-                    f"Total Files: {summary_data.get('total_files')}\n"
+            formatted = summary_data.get("formatted", {})
+            await txt_file.write("=== 📊 Summary Report ===\n")
+            await txt_file.write(f"Total Files: {summary_data.get('total_files')}\n")
+            await txt_file.write(f"Total Size: {formatted.get('total_size')}\n")
+            await txt_file.write(
+                f"Estimated Tokens: {formatted.get('estimated_tokens')}\n\n"
+            )
+
+            await txt_file.write("=== 📝 Extracted Textual Files ===\n")
+            for text_file in ordered_files:
+                rel_path = text_file.resolve().relative_to(self.repo_root)
+                if reuse and await reuse.splice(txt_file, rel_path, index):
+                    continue
+                subcat = await detect_subcategory(text_file, "TEXTUAL")
+                asset_url = build_github_url(
+                    self.repo_url, rel_path, self.branch, self.subdir
                 )
-                await txt_file.write(f"Total Size: {formatted.get('total_size')}\n")
+                raw = await async_read_text(text_file) or "[no content]"
+                raw = raw.strip()
+                size_bytes = text_file.stat().st_size
+                size_fmt = format_size_short(size_bytes)
+                token_count = await estimate_tokens_from_file(text_file)
+                tokens_fmt = format_number_short(token_count)
+
+                section_start = txt_file.offset
                 await txt_file.write(
-                    f"Estimated Tokens: {formatted.get('estimated_tokens')}\n\n"
+                    f"\n\n---> FILE: {rel_path} | TYPE: {subcat} | SIZE: {size_fmt} | TOKENS: {tokens_fmt} <---\n"
                 )
+                content_start = txt_file.offset
+                await txt_file.write(raw)
+                content_end = txt_file.offset
+                await txt_file.write("\n")
+                if index:
+                    index.add_file(
+                        rel_path,
+                        content_start,
+                        content_end - content_start,
+                        raw,
+                        tokens=token_count,
+                        section=[section_start, txt_file.offset],
+                        subcategory=subcat,
+                        size=size_bytes,
+                    )
 
-                await txt_file.write("=== 📝 Extracted Textual Files ===\n")
-                for text_file in ordered_files:
-                    rel_path = text_file.resolve().relative_to(self.repo_root)
-                    subcat = await detect_subcategory(text_file, "TEXTUAL")
+            if non_textual_files:
+                await txt_file.write("\n=== 🎨 Non-Textual Assets ===\n")
+                for asset in non_textual_files:
+                    rel_path = asset.resolve().relative_to(self.repo_root)
+                    subcat = await detect_subcategory(asset, "NON-TEXTUAL")
                     asset_url = build_github_url(
                         self.repo_url, rel_path, self.branch, self.subdir
                     )
-                    raw = await async_read_text(text_file) or "[no content]"
-                    raw = raw.strip()
-                    size_fmt = format_size_short(text_file.stat().st_size)
-                    tokens_fmt = format_number_short(
-                        await estimate_tokens_from_file(text_file)
-                    )
-
+                    size_bytes = asset.stat().st_size
+                    size_fmt = format_size_short(size_bytes)
                     await txt_file.write(
-                        f"\n\n---> FILE: {rel_path} | TYPE: {subcat} | SIZE: {size_fmt} | TOKENS: {tokens_fmt} <---\n"
+                        f"FILE: {rel_path} | TYPE: {subcat} | SIZE: {size_fmt}"
                     )
-                    await txt_file.write(f"{raw}\n")
-
-                if non_textual_files:
-                    await txt_file.write("\n=== 🎨 Non-Textual Assets ===\n")
-                    for asset in non_textual_files:
-                        rel_path = asset.resolve().relative_to(self.repo_root)
-                        subcat = await detect_subcategory(asset, "NON-TEXTUAL")
-                        asset_url = build_github_url(
-                            self.repo_url, rel_path, self.branch, self.subdir
-                        )
-                        size_fmt = format_size_short(asset.stat().st_size)
-                        await txt_file.write(
-                            f"FILE: {rel_path} | TYPE: {subcat} | SIZE: {size_fmt}"
-                        )
-                        if asset_url:
-                            await txt_file.write(f" | {asset_url}")
-                        await txt_file.write("\n")
-
-                return output_file
+                    if asset_url:
+                        await txt_file.write(f" | {asset_url}")
+                    await txt_file.write("\n")
+                    if index:
+                        index.add_asset(rel_path, size=size_bytes, subcategory=subcat)
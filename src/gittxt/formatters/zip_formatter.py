@@ -7,9 +7,13 @@ from pathlib import Path
 from datetime import datetime, timezone
 from gittxt.utils.summary_utils import format_size_short
 from gittxt.core.logger import Logger
+from gittxt.core.sources import VirtualFile
 
 logger = Logger.get_logger(__name__)
 
+# Earliest timestamp the ZIP format can store
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
 
 class ZipFormatter:
     def __init__(
@@ -20,6 +24,7 @@ class ZipFormatter:
         non_textual_files,
         repo_path: Path,
         repo_url: str = None,
+        reproducible: bool = False,
     ):
         self.repo_name = repo_name
         self.output_dir = output_dir
@@ -28,6 +33,7 @@ class ZipFormatter:
         self.repo_path = Path(repo_path).resolve()
         self.repo_url = repo_url
         self.flatten_zip = False
+        self.reproducible = reproducible
 
     async def generate(self):
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
@@ -70,7 +76,10 @@ class ZipFormatter:
                             rel = Path("unknown") / asset.name
                         target = assets_dir / rel
                         target.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy(asset, target)
+                        if isinstance(asset, VirtualFile):
+                            target.write_bytes(asset.read_bytes())
+                        else:
+                            shutil.copy(asset, target)
                         logger.info(f"✅ Included asset: {asset} → {target}")
                     except ValueError:
                         rel = Path("unknown") / asset.name
@@ -96,7 +105,12 @@ class ZipFormatter:
                     for file in sorted(tempdir.rglob("*")):
                         if file.is_file():
                             try:
-                                zf.write(file, file.relative_to(tempdir))
+                                if self.reproducible:
+                                    self._write_fixed_entry(
+                                        zf, file, file.relative_to(tempdir)
+                                    )
+                                else:
+                                    zf.write(file, file.relative_to(tempdir))
                             except Exception as e:
                                 print(f"⚠️ Failed to add {file} to ZIP: {e}")
             except Exception as e:
@@ -108,11 +122,25 @@ class ZipFormatter:
 
         return zip_path
 
+    def _write_fixed_entry(self, zf: zipfile.ZipFile, file: Path, arcname: Path):
+        """
+        Add a file with a fixed timestamp and mode so the archive bytes depend
+        only on the contents.
+        """
+        info = zipfile.ZipInfo(arcname.as_posix(), date_time=ZIP_EPOCH)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        zf.writestr(info, file.read_bytes())
+
     async def _write_summary_json(self, path: Path):
         summary_data = {
             "repo": self.repo_name,
             "url": self.repo_url,
-            "generated_at": datetime.now(timezone.utc).isoformat() + " UTC",
+            **(
+                {}
+                if self.reproducible
+                else {"generated_at": datetime.now(timezone.utc).isoformat() + " UTC"}
+            ),
             "files": [
                 (
                     str(f.relative_to(self.output_dir))
@@ -164,10 +192,11 @@ class ZipFormatter:
             await f.write(json.dumps(entries, indent=2))
 
     async def _write_readme(self, path: Path):
-        lines = [
-            f"# 🧾 Gittxt ZIP Bundle for `{self.repo_name}`\n",
-            f"- Generated at: `{datetime.now(timezone.utc).isoformat()} UTC`",
-        ]
+        lines = [f"# 🧾 Gittxt ZIP Bundle for `{self.repo_name}`\n"]
+        if not self.reproducible:
+            lines.append(
+                f"- Generated at: `{datetime.now(timezone.utc).isoformat()} UTC`"
+            )
         if self.repo_url:
             lines.append(f"- Repository: [{self.repo_url}]({self.repo_url})")
 
@@ -1,6 +1,8 @@
+import asyncio
 from pathlib import Path
 import aiofiles
 from gittxt.core.logger import Logger
+from gittxt.core.sources import VirtualFile
 from typing import Optional
 
 logger = Logger.get_logger(__name__)
@@ -11,6 +13,8 @@ async def async_read_text(file_path: Path) -> Optional[str]:
     Asynchronously read a file as text (UTF-8, ignoring errors).
     """
     try:
+        if isinstance(file_path, VirtualFile):
+            return await asyncio.to_thread(file_path.read_text)
         async with aiofiles.open(
             file_path, "r", encoding="utf-8", errors="ignore"
         ) as f:
@@ -20,6 +24,20 @@ async def async_read_text(file_path: Path) -> Optional[str]:
         return None
 
 
+async def async_read_bytes(file_path: Path) -> Optional[bytes]:
+    """
+    Asynchronously read a file as raw bytes.
+    """
+    try:
+        if isinstance(file_path, VirtualFile):
+            return await asyncio.to_thread(file_path.read_bytes)
+        async with aiofiles.open(file_path, "rb") as f:
+            return await f.read()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to read file {file_path}: {e}")
+        return None
+
+
 def load_gittxtignore(repo_path: Path) -> list:
     ignore_file = repo_path / ".gittxtignore"
     if ignore_file.exists():
@@ -3,6 +3,7 @@ import mimetypes
 from gittxt.core.logger import Logger
 from gittxt.core.constants import DEFAULT_FILETYPE_CONFIG
 from gittxt.core.config import ConfigManager
+from gittxt.core.sources import memo_key
 
 logger = Logger.get_logger(__name__)
 
@@ -67,14 +68,18 @@ def is_binary(path: Path, chunk_size: int = 1024) -> bool:
     """
     Returns True if file appears to be binary, using null-byte scan.
     """
+    key = memo_key(path, "binary", chunk_size)
+    if key and key in path.source.memo:
+        return path.source.memo[key]
     try:
-        with open(path, "rb") as f:
+        with path.open("rb") as f:
             chunk = f.read(chunk_size)
-            if b"\0" in chunk:
-                return True
+            binary = b"\0" in chunk
     except Exception:
         return True  # Conservative fallback
-    return False
+    if key:
+        path.source.memo[key] = binary
+    return binary
 
 
 def guess_mime(path: Path) -> str:
@@ -1,6 +1,4 @@
 from pathlib import Path
-from pygments.lexers import get_lexer_for_filename
-from pygments.util import ClassNotFound
 from gittxt.core.logger import Logger
 
 logger = Logger.get_logger(__name__)
@@ -29,6 +27,9 @@ def sort_textual_files(files: list[Path], base_path: Path = None) -> list[Path]:
 
 
 def detect_language(file: Path) -> str:
+    from pygments.lexers import get_lexer_for_filename
+    from pygments.util import ClassNotFound
+
     try:
         lexer = get_lexer_for_filename(file.name)
         return lexer.name.lower()
@@ -0,0 +1,229 @@
+import os
+import re
+import time
+import signal
+import asyncio
+import subprocess
+from collections import deque
+from pathlib import Path
+from typing import Callable, Optional
+from gittxt.core.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+# Never block on credential prompts; fail fast instead.
+GIT_ENV = {"GIT_TERMINAL_PROMPT": "0", "GIT_ASKPASS": "echo"}
+
+# e.g. "Receiving objects:  45% (450/1000), 1.20 MiB | 2.00 MiB/s"
+PROGRESS_RE = re.compile(
+    r"^(?:remote: )?(?P<phase>[A-Za-z][A-Za-z ]+):\s+(?P<pct>\d+)%"
+)
+
+ProgressCallback = Callable[[str, int], None]
+
+# url -> (default branch, monotonic expiry), least recently used first
+_default_branches: dict = {}
+DEFAULT_BRANCH_CACHE_SIZE = 256
+
+
+def run_git(
+    *args: str, cwd: Optional[Path] = None, check: bool = True
+) -> subprocess.CompletedProcess:
+    """
+    Run a git command and capture its output.
+    Raises RuntimeError with git's stderr when `check` is set and git fails.
+    """
+    cmd = ["git", *args]
+    logger.debug(f"🔧 {' '.join(cmd)}")
+    result = subprocess.run(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        capture_output=True,
+        text=True,
+        env={**os.environ, **GIT_ENV},
+    )
+    if check and result.returncode != 0:
+        raise RuntimeError(
+            f"❌ git command failed ({' '.join(args)}): {result.stderr.strip()}"
+        )
+    return result
+
+
+def _kill(proc: asyncio.subprocess.Process):
+    """
+    Kill git and its helpers (remote-https, index-pack), which share its
+    process group and would otherwise keep the pipes open.
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def run_git_async(
+    *args: str,
+    cwd: Optional[Path] = None,
+    check: bool = True,
+    timeout: Optional[float] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Async counterpart of run_git that never blocks the event loop.
+
+    stderr is parsed as it streams: progress lines (`Receiving objects: 45%`)
+    go to `on_progress(phase, percent)`, everything else is kept for errors.
+    On timeout or cancellation the git process is killed before returning.
+    """
+    cmd = ["git", *args]
+    logger.debug(f"🔧 {' '.join(cmd)}")
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(cwd) if cwd else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env={**os.environ, **GIT_ENV},
+        start_new_session=hasattr(os, "killpg"),
+    )
+    messages = deque(maxlen=50)
+
+    def handle(line: bytes):
+        text = line.decode("utf-8", errors="replace").strip()
+        if not text:
+            return
+        match = PROGRESS_RE.match(text)
+        if match:
+            if on_progress:
+                on_progress(match["phase"], int(match["pct"]))
+        else:
+            messages.append(text)
+
+    async def pump_stderr():
+        # Progress updates are separated by \r, not \n
+        buffer = b""
+        while chunk := await proc.stderr.read(4096):
+            *lines, buffer = re.split(rb"[\r\n]", buffer + chunk)
+            for line in lines:
+                handle(line)
+        handle(buffer)
+
+    try:
+        stdout, _, returncode = await asyncio.wait_for(
+            asyncio.gather(proc.stdout.read(), pump_stderr(), proc.wait()), timeout
+        )
+    except asyncio.TimeoutError:
+        _kill(proc)
+        await proc.wait()
+        raise RuntimeError(
+            f"❌ git command timed out after {timeout}s ({' '.join(args)})"
+        )
+    except asyncio.CancelledError:
+        _kill(proc)
+        await asyncio.shield(proc.wait())
+        raise
+
+    stderr = "\n".join(messages)
+    if check and returncode != 0:
+        raise RuntimeError(f"❌ git command failed ({' '.join(args)}): {stderr}")
+    return subprocess.CompletedProcess(
+        cmd, returncode, stdout.decode("utf-8", errors="replace"), stderr
+    )
+
+
+async def ref_exists(git_dir: Path, ref: str) -> bool:
+    result = await run_git_async(
+        "--git-dir",
+        str(git_dir),
+        "rev-parse",
+        "--verify",
+        "--quiet",
+        f"{ref}^{{commit}}",
+        check=False,
+    )
+    return result.returncode == 0
+
+
+async def symbolic_head(git_dir: Path) -> Optional[str]:
+    """
+    Return the branch HEAD points at in a (bare) repository, if any.
+    """
+    result = await run_git_async(
+        "--git-dir", str(git_dir), "symbolic-ref", "--short", "HEAD", check=False
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+async def sparse_checkout(worktree: Path, paths: list, ref: str):
+    """
+    Restrict a --no-checkout clone to `paths` (cone mode) and check out `ref`.
+    """
+    cone = [p.strip("/") for p in paths if p and p.strip("/")]
+    await run_git_async("-C", str(worktree), "sparse-checkout", "set", "--cone", *cone)
+    await run_git_async("-C", str(worktree), "checkout", "--quiet", ref)
+
+
+async def remote_default_branch(
+    url: str, ttl: float = 3600, timeout: Optional[float] = None
+) -> Optional[str]:
+    """
+    Return the branch a remote's HEAD points at, via a single
+    `git ls-remote --symref <url> HEAD` (no clone). Answers are cached per
+    URL for `ttl` seconds. Returns None if the remote HEAD is not a branch.
+    """
+    cached = _default_branches.pop(url, None)
+    if cached and cached[1] > time.monotonic():
+        _default_branches[url] = cached
+        return cached[0]
+
+    result = await run_git_async("ls-remote", "--symref", url, "HEAD", timeout=timeout)
+    branch = None
+    for line in result.stdout.splitlines():
+        # ref: refs/heads/main\tHEAD
+        if line.startswith("ref: ") and line.endswith("\tHEAD"):
+            branch = line[5:].split("\t")[0].removeprefix("refs/heads/")
+            break
+
+    if branch and ttl:
+        _remember_default_branch(url, branch, ttl)
+    return branch
+
+
+def _remember_default_branch(url: str, branch: str, ttl: float):
+    """
+    Cache `branch` for `url`, dropping expired answers and then the least
+    recently used ones past DEFAULT_BRANCH_CACHE_SIZE.
+    """
+    now = time.monotonic()
+    for key in [k for k, (_, expiry) in _default_branches.items() if expiry <= now]:
+        del _default_branches[key]
+    _default_branches[url] = (branch, now + ttl)
+    while len(_default_branches) > DEFAULT_BRANCH_CACHE_SIZE:
+        del _default_branches[next(iter(_default_branches))]
+
+
+async def remote_commit(
+    url: str, ref: Optional[str] = None, timeout: Optional[float] = None
+) -> Optional[str]:
+    """
+    Return the commit `ref` (a branch or tag; the remote HEAD by default)
+    currently points at, via one `git ls-remote` (no clone). A full commit
+    hash is returned as is. None if the ref does not exist.
+    """
+    if ref and re.fullmatch(r"[0-9a-f]{40}", ref):
+        return ref
+    patterns = [ref, f"{ref}^{{}}"] if ref else ["HEAD"]
+    result = await run_git_async("ls-remote", url, *patterns, timeout=timeout)
+    refs = {}
+    for line in result.stdout.splitlines():
+        sha, _, name = line.partition("\t")
+        refs[name] = sha
+    candidates = (
+        [f"refs/heads/{ref}", f"refs/tags/{ref}^{{}}", f"refs/tags/{ref}", ref]
+        if ref
+        else ["HEAD"]
+    )
+    return next((refs[name] for name in candidates if name in refs), None)
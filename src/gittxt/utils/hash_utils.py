@@ -28,3 +28,29 @@ def get_file_hash(file_path: Path, algo: str = "sha256") -> str:
     except Exception as e:
         logger.warning(f"⚠️ Failed to hash file {file_path}: {e}")
         return None
+
+
+def git_blob_hash(data: bytes) -> str:
+    """
+    Return the git blob id (sha1 over "blob <size>\\0" + data) for raw bytes.
+    Matches `git hash-object`, so rows can be joined against git history.
+    """
+    h = hashlib.sha1(f"blob {len(data)}\0".encode())
+    h.update(data)
+    return h.hexdigest()
+
+
+def get_git_blob_hash(file_path: Path) -> str:
+    """
+    Streaming variant of git_blob_hash for files that may be large.
+    Returns None if hashing fails.
+    """
+    try:
+        h = hashlib.sha1(f"blob {file_path.stat().st_size}\0".encode())
+        with file_path.open("rb") as f:
+            for chunk in iter(lambda: f.read(8192), b""):
+                h.update(chunk)
+        return h.hexdigest()
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to hash file {file_path}: {e}")
+        return None
@@ -0,0 +1,291 @@
+import os
+import json
+import hashlib
+from pathlib import Path, PurePath
+from typing import Dict, List, Optional
+import aiofiles
+from gittxt.core.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+
+def index_path_for(report_path: Path) -> Path:
+    """
+    Return the sidecar index location for a report, e.g. repo.txt -> repo.txt.idx
+    """
+    report_path = Path(report_path)
+    return report_path.with_name(report_path.name + INDEX_SUFFIX)
+
+
+def _normalize_rel_path(rel_path) -> str:
+    return PurePath(rel_path).as_posix()
+
+
+class TrackedWriter:
+    """
+    Wraps a binary sink (file handle or stream) and keeps the byte offset of
+    everything written, so formatters can record where each file lands.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.offset = 0
+
+    async def write(self, text: str) -> int:
+        return await self.write_bytes(text.encode("utf-8"))
+
+    async def write_bytes(self, data: bytes) -> int:
+        await self.sink.write(data)
+        self.offset += len(data)
+        return len(data)
+
+
+class ReportIndexBuilder:
+    """
+    Collects (offset, length, sha256, tokens) per file while a formatter writes
+    its report, then saves them as a compact JSON sidecar next to the report.
+    """
+
+    def __init__(self, fmt: str, mode: str, repo_name: str = None):
+        self.fmt = fmt
+        self.mode = mode
+        self.repo_name = repo_name
+        self.files: Dict[str, dict] = {}
+        self.assets: Dict[str, dict] = {}
+        # Extra top-level fields, e.g. the commit and scan options
+        self.meta: Dict[str, object] = {}
+
+    def add_file(
+        self,
+        rel_path,
+        offset: int,
+        length: int,
+        content: str,
+        tokens: int = 0,
+        section: Optional[List[int]] = None,
+        subcategory: str = None,
+        size: int = None,
+    ):
+        entry = {
+            "offset": offset,
+            "length": length,
+            "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            "tokens": tokens,
+        }
+        if section is not None:
+            entry["section"] = list(section)
+        if subcategory is not None:
+            entry["subcategory"] = subcategory
+        if size is not None:
+            entry["size"] = size
+        self.files[_normalize_rel_path(rel_path)] = entry
+
+    def add_entry(self, rel_path, entry: dict):
+        """
+        Record a precomputed file entry (e.g. one spliced from an older report).
+        """
+        self.files[_normalize_rel_path(rel_path)] = entry
+
+    def add_asset(self, rel_path, size: int = None, subcategory: str = None):
+        self.assets[_normalize_rel_path(rel_path)] = {
+            "size": size,
+            "subcategory": subcategory,
+        }
+
+    async def add_assets(self, assets, repo_root: Path):
+        """
+        Index assets a report does not list itself (lite mode), so the index
+        still describes the full scan.
+        """
+        from gittxt.utils.subcat_utils import detect_subcategory
+
+        for asset in assets:
+            self.add_asset(
+                asset.resolve().relative_to(repo_root),
+                size=asset.stat().st_size,
+                subcategory=await detect_subcategory(asset, "NON-TEXTUAL"),
+            )
+
+    def to_dict(self, report_path: Path) -> dict:
+        return {
+            **self.meta,
+            "version": INDEX_VERSION,
+            "report": Path(report_path).name,
+            "format": self.fmt,
+            "mode": self.mode,
+            "repo": self.repo_name,
+            "report_size": Path(report_path).stat().st_size,
+            "files": self.files,
+            "assets": self.assets,
+        }
+
+    async def save(self, report_path: Path) -> Path:
+        index_file = index_path_for(report_path)
+        payload = json.dumps(self.to_dict(report_path), separators=(",", ":"))
+        async with aiofiles.open(index_file, "w", encoding="utf-8") as f:
+            await f.write(payload)
+        logger.debug(f"🗂️ Wrote report index: {index_file}")
+        return index_file
+
+
+def _pread(path: Path, offset: int, length: int) -> bytes:
+    """
+    Read `length` bytes at `offset` without scanning the report.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        chunks = []
+        remaining = length
+        while remaining > 0:
+            if hasattr(os, "pread"):
+                chunk = os.pread(fd, remaining, offset)
+            else:
+                os.lseek(fd, offset, os.SEEK_SET)
+                chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+class ReportIndex:
+    """
+    Random-access reader for a report through its sidecar index.
+    """
+
+    def __init__(self, report_path: Path, data: dict):
+        self.report_path = Path(report_path)
+        self.data = data
+        self.format = data.get("format")
+        self.mode = data.get("mode")
+        self.files: Dict[str, dict] = data.get("files", {})
+        self.assets: Dict[str, dict] = data.get("assets", {})
+
+    @classmethod
+    def load(cls, report_path: Path) -> "ReportIndex":
+        report_path = Path(report_path)
+        index_file = index_path_for(report_path)
+        if not index_file.exists():
+            raise FileNotFoundError(f"No index found for report: {report_path}")
+        data = json.loads(index_file.read_text(encoding="utf-8"))
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"Unsupported index version {data.get('version')} in {index_file}"
+            )
+        expected_size = data.get("report_size")
+        if expected_size is not None and report_path.stat().st_size != expected_size:
+            raise ValueError(f"Index {index_file} is stale for {report_path}")
+        return cls(report_path, data)
+
+    def __contains__(self, rel_path) -> bool:
+        return _normalize_rel_path(rel_path) in self.files
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def paths(self) -> List[str]:
+        return list(self.files)
+
+    def entry(self, rel_path) -> dict:
+        key = _normalize_rel_path(rel_path)
+        if key not in self.files:
+            raise KeyError(f"File not in report index: {key}")
+        return self.files[key]
+
+    def read_bytes(self, rel_path) -> bytes:
+        """
+        Return the raw bytes stored in the report for one file.
+        For JSON reports this is the encoded string literal.
+        """
+        entry = self.entry(rel_path)
+        return _pread(self.report_path, entry["offset"], entry["length"])
+
+    def read(self, rel_path) -> str:
+        """
+        Return the content of one file as it appears in the report.
+        """
+        raw = self.read_bytes(rel_path).decode("utf-8")
+        if self.format == "json":
+            return json.loads(raw)
+        return raw
+
+
+def read_report_file(report_path: Path, rel_path) -> str:
+    """
+    Convenience wrapper: fetch one file's content from an indexed report.
+    """
+    return ReportIndex.load(report_path).read(rel_path)
+
+
+def stamp_index(report_path: Path, **fields) -> Path:
+    """
+    Merge extra top-level fields (e.g. commit, scan options) into a saved index.
+    """
+    index_file = index_path_for(report_path)
+    data = json.loads(index_file.read_text(encoding="utf-8"))
+    data.update(fields)
+    index_file.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    return index_file
+
+
+class SectionReuse:
+    """
+    Serves the byte-exact sections of unchanged files from a previous report,
+    so a formatter can copy them instead of re-reading and re-tokenizing.
+    """
+
+    def __init__(self, old_index: ReportIndex, unchanged):
+        self.old_index = old_index
+        self.unchanged = {_normalize_rel_path(p) for p in unchanged}
+        self.spliced = 0
+
+    def __contains__(self, rel_path) -> bool:
+        return _normalize_rel_path(rel_path) in self.unchanged
+
+    async def splice(
+        self,
+        writer: TrackedWriter,
+        rel_path,
+        index: ReportIndexBuilder = None,
+        separator: str = "",
+        strip: bytes = b"",
+    ) -> bool:
+        """
+        Copy the old section for `rel_path` into `writer` and record its shifted
+        index entry. `strip` drops a position-dependent prefix (e.g. a JSON
+        comma) from the old bytes and `separator` writes the right one.
+        Returns False if the file has no reusable section.
+        """
+        key = _normalize_rel_path(rel_path)
+        entry = self.old_index.files.get(key)
+        if key not in self.unchanged or not entry or "section" not in entry:
+            return False
+
+        old_start, old_end = entry["section"]
+        data = _pread(self.old_index.report_path, old_start, old_end - old_start)
+        body = data.lstrip(strip) if strip else data
+        old_body_start = old_start + len(data) - len(body)
+
+        section_start = writer.offset
+        await writer.write(separator)
+        shift = writer.offset - old_body_start
+        await writer.write_bytes(body)
+        self.spliced += 1
+
+        if index:
+            index.add_entry(
+                key,
+                {
+                    **entry,
+                    "offset": entry["offset"] + shift,
+                    "section": [section_start, writer.offset],
+                },
+            )
+        return True
@@ -11,6 +11,8 @@ def parse_github_url(url: str) -> dict:
 
     Returns a dict with:
       - host, owner, repo, branch, subdir
+    `branch` is None unless the URL names one; the caller resolves the
+    remote's default branch.
     """
     data = {"host": None, "owner": None, "repo": None, "branch": None, "subdir": None}
 
@@ -32,7 +34,6 @@ def parse_github_url(url: str) -> dict:
         if data["host"] not in allowed_domains:
             raise ValueError(f"Unsupported Git host: {data['host']}")
         data["repo"] = data["repo"].replace(".git", "")
-        data["branch"] = "main"
         return data
 
     # === HTTPS format ===
@@ -57,7 +58,5 @@ def parse_github_url(url: str) -> dict:
         if len(path_parts) > 4:
             subdir = "/".join(path_parts[4:]).strip("/")
             data["subdir"] = subdir if subdir else None
-    else:
-        data["branch"] = "main"
 
     return data
@@ -1,10 +1,9 @@
 from pathlib import Path
-from pygments.lexers import get_lexer_for_filename
-from pygments.util import ClassNotFound
 import mimetypes
 
 from gittxt.core.logger import Logger
 from gittxt.utils.file_utils import async_read_text
+from gittxt.core.sources import memo_key
 
 logger = Logger.get_logger(__name__)
 
@@ -16,10 +15,24 @@ async def detect_subcategory(file: Path, primary: str) -> str:
 
 
 async def _detect_textual_subcat(file: Path) -> str:
+    key = memo_key(file, "subcategory", file.name)
+    if key and key in file.source.memo:
+        return file.source.memo[key]
+    subcat = await _infer_from_content(file)
+    if key:
+        file.source.memo[key] = subcat
+    return subcat
+
+
+async def _infer_from_content(file: Path) -> str:
     content = await async_read_text(file)
     if not content:
         return "other"
 
+    # pygments loads its lexer tables on import; only pay for it when sniffing
+    from pygments.lexers import get_lexer_for_filename
+    from pygments.util import ClassNotFound
+
     try:
         lexer = get_lexer_for_filename(file.name)
         lexer_name = lexer.name.lower()
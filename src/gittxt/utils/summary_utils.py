@@ -1,11 +1,12 @@
+import asyncio
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict
 import aiofiles
-import humanize
-import tiktoken
 from gittxt.utils.filetype_utils import classify_simple
 from gittxt.utils.subcat_utils import detect_subcategory
 from gittxt.core.logger import Logger
+from gittxt.core.sources import VirtualFile, memo_key
 
 logger = Logger.get_logger(__name__)
 
@@ -28,21 +29,52 @@ def format_size_short(n: int) -> str:
     Use humanize.naturalsize to produce a more readable size,
     e.g., 1024 => '1.0 kB'.
     """
+    import humanize
+
     return humanize.naturalsize(n, binary=False)
 
 
+@lru_cache(maxsize=None)
+def get_encoder(encoding_name: str = "cl100k_base"):
+    """
+    One tiktoken encoder per encoding for the whole process, shared by
+    every scan (and every repo in a parallel CLI run). tiktoken is only
+    imported here, on the first token count, to keep imports cheap.
+    """
+    import tiktoken
+
+    return tiktoken.get_encoding(encoding_name)
+
+
 async def estimate_tokens_from_file(
     file: Path, encoding_name: str = "cl100k_base", use_fallback: bool = True
 ) -> int:
     """
     Estimate the number of tokens by reading the file and using tiktoken.
     Fallback is length/4 if tiktoken fails or not installed.
+    Counts for git blobs are memoised per blob, so shared content is
+    tokenized once.
     """
+    key = memo_key(file, "tokens", encoding_name, use_fallback)
+    if key and key in file.source.memo:
+        return file.source.memo[key]
+    tokens = await _count_tokens(file, encoding_name, use_fallback)
+    if key and tokens is not None:
+        file.source.memo[key] = tokens
+    return tokens
+
+
+async def _count_tokens(file: Path, encoding_name: str, use_fallback: bool) -> int:
     try:
-        async with aiofiles.open(file, "r", encoding="utf-8", errors="ignore") as f:
-            content = await f.read()
+        if isinstance(file, VirtualFile):
+            content = await asyncio.to_thread(file.read_text)
+        else:
+            async with aiofiles.open(
+                file, "r", encoding="utf-8", errors="ignore"
+            ) as f:
+                content = await f.read()
         try:
-            encoding = tiktoken.get_encoding(encoding_name)
+            encoding = get_encoder(encoding_name)
             return len(encoding.encode(content))
         except Exception:
             if use_fallback:
@@ -53,7 +85,11 @@ async def estimate_tokens_from_file(
 
 
 async def generate_summary(
-    file_paths: List[Path], estimate_tokens: bool = True
+    file_paths: List[Path],
+    estimate_tokens: bool = True,
+    file_stats: Dict = None,
+    known: Dict = None,
+    events=None,
 ) -> Dict:
     """
     Returns a dictionary containing:
@@ -63,7 +99,13 @@ async def generate_summary(
     - file_type_breakdown: {subcat: count}
     - tokens_by_type: {subcat: raw token count}
     - formatted: Human-friendly summary of size and tokens
+    If `file_stats` is given, it is filled with {path: (size, tokens)}.
+    `known` maps paths to precomputed (primary, subcategory, size, tokens);
+    those files are counted without being classified or read again.
+    `events` (a ScanEvents) gets the tokenize stage and its counters.
     """
+    if events is not None:
+        events.stage("tokenize")
     summary = {
         "total_files": len(file_paths),
         "total_size": 0,
@@ -72,23 +114,35 @@ async def generate_summary(
         "tokens_by_type": {},
     }
 
+    known = known or {}
     for file in file_paths:
-        if not file.exists():
-            continue
-        primary, _reason = classify_simple(file)
-        subcat = await detect_subcategory(file, primary)
-        size = file.stat().st_size
+        if file in known:
+            primary, subcat, size, tokens = known[file]
+        else:
+            if not file.exists():
+                continue
+            primary, _reason = classify_simple(file)
+            subcat = await detect_subcategory(file, primary)
+            size = file.stat().st_size
+            tokens = 0
+            if primary == "TEXTUAL" and estimate_tokens:
+                tokens = await estimate_tokens_from_file(file)
+                if events is not None:
+                    events.add("bytes_read", size)
+                    events.add("tokens_counted", tokens)
         summary["total_size"] += size
 
         summary["file_type_breakdown"].setdefault(subcat, 0)
         summary["file_type_breakdown"][subcat] += 1
 
         if primary == "TEXTUAL" and estimate_tokens:
-            tokens = await estimate_tokens_from_file(file)
             summary["estimated_tokens"] += tokens
             summary["tokens_by_type"].setdefault(subcat, 0)
             summary["tokens_by_type"][subcat] += tokens
 
+        if file_stats is not None:
+            file_stats[file] = (size, tokens)
+
     # Add human-readable formatting (does not affect downstream logic)
     summary["formatted"] = {
         "total_size": format_size_short(summary.get("total_size", 0)),
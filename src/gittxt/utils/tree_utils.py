@@ -1,64 +1,214 @@
 from pathlib import Path
-import os
+from typing import Dict, Iterable, Tuple
 from gittxt.core.logger import Logger
+from gittxt.utils.summary_utils import format_number_short, format_size_short
 
 logger = Logger.get_logger(__name__)
 
+BRANCH = "├── "
+LAST = "└── "
+PIPE = "│   "
+SPACE = "    "
+MORE = "…"
 
-def generate_tree(
-    path: Path,
-    prefix: str = "",
+# Rough chars-per-token ratio used for the tree's token budget
+CHARS_PER_TOKEN = 4
+
+
+class TreeNode:
+    """
+    A directory in the tree index, with rollups of every file below it.
+    Children map names to TreeNode (directories) or (size, tokens) (files).
+    """
+
+    __slots__ = ("children", "files", "size", "tokens")
+
+    def __init__(self):
+        self.children: Dict[str, object] = {}
+        self.files = 0
+        self.size = 0
+        self.tokens = 0
+
+    def add(self, size: int, tokens: int):
+        self.files += 1
+        self.size += size
+        self.tokens += tokens
+
+    def __bool__(self):
+        return bool(self.children)
+
+
+def _rollup(child) -> Tuple[int, int, int]:
+    if isinstance(child, TreeNode):
+        return child.files, child.size, child.tokens
+    return (1, *child)
+
+
+def build_tree_index(
+    files: Iterable[Path], root: Path, stats: Dict[Path, Tuple[int, int]] = None
+) -> TreeNode:
+    """
+    Nest scanned file paths under `root` into a TreeNode trie, rolling
+    (count, size, tokens) up into every ancestor as each path is inserted.
+    Pure path arithmetic, no I/O; sizes and tokens come from `stats`.
+    """
+    root = Path(root)
+    tree = TreeNode()
+    for file_path in files:
+        try:
+            parts = file_path.relative_to(root).parts
+        except ValueError:
+            logger.debug(f"Skipping {file_path}: not under tree root {root}")
+            continue
+        if not parts:
+            continue
+        size, tokens = (stats or {}).get(file_path, (0, 0))
+        node = tree
+        node.add(size, tokens)
+        for part in parts[:-1]:
+            child = node.children.get(part)
+            if not isinstance(child, TreeNode):
+                child = node.children[part] = TreeNode()
+            node = child
+            node.add(size, tokens)
+        node.children[parts[-1]] = (size, tokens)
+    return tree
+
+
+def format_more_line(files: int, size: int = 0, tokens: int = 0) -> str:
+    """
+    e.g. `… 48,213 more files (312.0 MB, 9.1M tokens)`
+    """
+    noun = "file" if files == 1 else "files"
+    details = []
+    if size:
+        details.append(format_size_short(size))
+    if tokens:
+        details.append(f"{format_number_short(tokens)} tokens")
+    suffix = f" ({', '.join(details)})" if details else ""
+    return f"{MORE} {files:,} more {noun}{suffix}"
+
+
+def _sorted_children(node: TreeNode, max_entries: int = None):
+    """
+    Yield (name, child, is_last) with directories first, then case-insensitive.
+    Past `max_entries`, the remaining children collapse into one rollup
+    yielded as (None, (files, size, tokens), True).
+    """
+    entries = sorted(
+        node.children.items(),
+        key=lambda kv: (not isinstance(kv[1], TreeNode), kv[0].lower()),
+    )
+    hidden = []
+    if max_entries and len(entries) > max_entries:
+        entries, hidden = entries[:max_entries], entries[max_entries:]
+
+    for i, (name, child) in enumerate(entries):
+        yield name, child, not hidden and i == len(entries) - 1
+    if hidden:
+        rollups = [_rollup(child) for _, child in hidden]
+        yield None, tuple(map(sum, zip(*rollups))), True
+
+
+def render_tree(
+    tree: TreeNode,
     max_depth: int = None,
-    current_depth: int = 0,
-    exclude_dirs: list = None,
+    max_entries: int = None,
+    max_lines: int = None,
+    max_tokens: int = None,
 ) -> str:
     """
-    Generate a directory tree structure with optional max depth & excludes.
+    Render a tree index as text in a single iterative pass.
+
+    - Directories below `max_depth` are shown as `└── ...`.
+    - Directories with more than `max_entries` children list the first ones
+      and fold the rest into a `… N more files (size, tokens)` line.
+    - Once `max_lines` or `max_tokens` (estimated) is reached, rendering
+      stops and one final line summarises everything not shown.
     """
-    if exclude_dirs is None:
-        exclude_dirs = [
-            ".git",
-            "__pycache__",
-            ".mypy_cache",
-            ".pytest_cache",
-            ".vscode",
-        ]
-
-    path = Path(path).resolve()
-
-    if not path.exists() or not path.is_dir():
+    if not tree:
         return ""
-
-    if max_depth is not None and current_depth >= max_depth:
-        return f"{prefix}└── ..."
+    if max_depth is not None and max_depth <= 0:
+        return f"{LAST}..."
 
     lines = []
-    try:
-        with os.scandir(path) as entries:
-            entries_list = sorted(
-                (e for e in entries if e.name not in exclude_dirs),
-                key=lambda e: (not e.is_dir(), e.name.lower()),
-            )
+    chars = 0
+    shown = [0, 0, 0]  # files, size, tokens accounted for by emitted lines
+
+    def out_of_budget() -> bool:
+        # Keep one line in reserve for the closing summary
+        if max_lines and len(lines) >= max_lines - 1:
+            return True
+        return bool(max_tokens and chars / CHARS_PER_TOKEN >= max_tokens)
+
+    def account(rollup):
+        for i, value in enumerate(rollup):
+            shown[i] += value
+
+    stack = [(_sorted_children(tree, max_entries), "", 1)]
+    while stack:
+        children, prefix, depth = stack[-1]
+        entry = next(children, None)
+        if entry is None:
+            stack.pop()
+            continue
+        if out_of_budget():
+            break
 
-            pointers = (
-                ["├── "] * (len(entries_list) - 1) + ["└── "] if entries_list else []
+        name, child, is_last = entry
+        pointer = LAST if is_last else BRANCH
+        if name is None:
+            line = f"{prefix}{pointer}{format_more_line(*child)}"
+            account(child)
+        else:
+            line = f"{prefix}{pointer}{name}"
+        lines.append(line)
+        chars += len(line) + 1
+
+        if name is None:
+            continue
+        if not isinstance(child, TreeNode):
+            account(_rollup(child))
+            continue
+
+        child_prefix = prefix + (SPACE if is_last else PIPE)
+        if max_depth is not None and depth >= max_depth:
+            # Without room for the marker, its files go to the closing summary
+            if out_of_budget():
+                break
+            lines.append(f"{child_prefix}{LAST}...")
+            chars += len(lines[-1]) + 1
+            account(_rollup(child))
+        else:
+            stack.append(
+                (_sorted_children(child, max_entries), child_prefix, depth + 1)
             )
 
-            for pointer, entry in zip(pointers, entries_list):
-                lines.append(f"{prefix}{pointer}{entry.name}")
-                if entry.is_dir(follow_symlinks=False):
-                    extension = "│   " if pointer != "└── " else "    "
-                    subtree = generate_tree(
-                        Path(entry.path),
-                        prefix + extension,
-                        max_depth,
-                        current_depth + 1,
-                        exclude_dirs,
-                    )
-                    if subtree:
-                        lines.append(subtree)
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to scan directory {path}: {e}")
-        return ""
+    remaining = tree.files - shown[0]
+    if remaining > 0:
+        lines.append(
+            format_more_line(remaining, tree.size - shown[1], tree.tokens - shown[2])
+        )
 
     return "\n".join(lines)
+
+
+def generate_tree(
+    files: Iterable[Path],
+    root: Path,
+    max_depth: int = None,
+    stats: Dict[Path, Tuple[int, int]] = None,
+    max_entries: int = None,
+    max_lines: int = None,
+    max_tokens: int = None,
+) -> str:
+    """
+    Generate a directory tree for exactly the files the scanner collected.
+    """
+    return render_tree(
+        build_tree_index(files, root, stats),
+        max_depth=max_depth,
+        max_entries=max_entries,
+        max_lines=max_lines,
+        max_tokens=max_tokens,
+    )
@@ -1,6 +1,97 @@
 from pathlib import Path
+from fastapi import HTTPException
 from gittxt.core.config import ConfigManager
+from plugins.gittxt_api.core.services.admission import (
+    AdmissionController,
+    AdmissionRejected,
+)
+from plugins.gittxt_api.core.services.artifact_gc import ArtifactCollector
+from plugins.gittxt_api.core.services.artifact_store import ArtifactStore
+from plugins.gittxt_api.core.services.job_store import JobStore
+from plugins.gittxt_api.core.services.job_queue import ScanJobQueue
+
+_job_queue = None
+_artifact_collector = None
+_admission = None
 
 def get_output_dir() -> Path:
     config = ConfigManager.load_config()
     return Path(config.get("output_dir", "./gittxt_output")).resolve()
+
+def get_artifact_store() -> ArtifactStore:
+    return ArtifactStore(get_output_dir())
+
+def get_upload_limits() -> dict:
+    config = ConfigManager.load_config()
+    return {
+        "max_bytes": config.get("upload_max_bytes"),
+        "max_uncompressed_bytes": config.get("upload_max_uncompressed_bytes"),
+        "max_entries": config.get("upload_max_entries"),
+        "chunk_size": config.get("upload_chunk_size") or 1024 * 1024,
+    }
+
+def get_job_store() -> JobStore:
+    return JobStore(get_output_dir())
+
+def get_job_queue() -> ScanJobQueue:
+    """
+    The process-wide scan job queue; workers start on first use.
+    """
+    global _job_queue
+    if _job_queue is None:
+        from plugins.gittxt_api.core.services.batch_service import run_batch_job
+        from plugins.gittxt_api.core.services.scan_service import run_scan_job
+
+        config = ConfigManager.load_config()
+        _job_queue = ScanJobQueue(
+            get_job_store(),
+            {"scan": run_scan_job, "batch": run_batch_job},
+            concurrency=config.get("api_scan_concurrency", 2),
+        )
+    return _job_queue
+
+def get_artifact_collector() -> ArtifactCollector:
+    """
+    The process-wide artifact collector; sweeps start with the app.
+    """
+    global _artifact_collector
+    if _artifact_collector is None:
+        config = ConfigManager.load_config()
+        _artifact_collector = ArtifactCollector(
+            get_artifact_store(),
+            max_age=config.get("artifact_max_age"),
+            max_bytes=config.get("artifact_max_bytes"),
+            interval=config.get("artifact_gc_interval") or 300,
+            on_delete=get_job_store().forget,
+        )
+    return _artifact_collector
+
+
+def get_admission_controller() -> AdmissionController:
+    """
+    The process-wide admission controller shared by every scan path.
+    """
+    global _admission
+    if _admission is None:
+        config = ConfigManager.load_config()
+        _admission = AdmissionController(
+            memory_bytes=config.get("api_admission_memory_bytes"),
+            cpu_slots=config.get("api_admission_cpu_slots"),
+            max_queue=config.get("api_admission_max_queue"),
+        )
+    return _admission
+
+def admit_scan_request():
+    """
+    Route dependency: answer 429 with Retry-After instead of taking on a
+    scan while too many are already waiting.
+    """
+    queued = _job_queue.depth if _job_queue is not None else 0
+    try:
+        get_admission_controller().check(queued)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
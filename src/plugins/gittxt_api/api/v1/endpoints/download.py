@@ -1,36 +1,75 @@
-from fastapi import APIRouter, HTTPException, Query, Path, status
-from fastapi.responses import FileResponse
-from plugins.gittxt_api.api.v1.deps import get_output_dir
+from fastapi import APIRouter, HTTPException, Query, Path, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from plugins.gittxt_api.api.v1.deps import get_artifact_store
+from plugins.gittxt_api.core.services.artifact_store import MEDIA_TYPES
+from plugins.gittxt_api.core.services.download_service import (
+    RangeNotSatisfiable,
+    choose_encoding,
+    etag_for,
+    etag_matches,
+    parse_range,
+    read_window,
+)
 
 router = APIRouter(tags=["Download"])
 
 @router.get("/{scan_id}", status_code=status.HTTP_200_OK)
 async def download_artifact(
+    request: Request,
     scan_id: str = Path(..., description="Scan ID"),
     format: str = Query(..., pattern="^(txt|json|md|zip)$", description="Download format")
 ):
     """
     Download a scan artifact in the desired format.
+
+    Responses carry a content-hash ETag (`If-None-Match` gives `304`), honour
+    a single `Range` window on the uncompressed artifact (`206`), and serve a
+    precompressed zstd/gzip variant when `Accept-Encoding` allows.
     """
-    output_dir = get_output_dir()
-    artifact_dir = output_dir / scan_id / format
-    if not artifact_dir.exists():
-        raise HTTPException(status_code=404, detail=f"No '{format}' folder found.")
+    store = get_artifact_store()
+    try:
+        blob_path, entry = store.resolve(scan_id, format)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    range_header = request.headers.get("range")
+    variants = {} if range_header else store.encodings(entry)
+    encoding = choose_encoding(request.headers.get("accept-encoding"), variants)
+    etag = etag_for(entry["sha256"], encoding)
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Vary": "Accept-Encoding"}
 
-    files = list(artifact_dir.glob(f"*.{format}"))
-    if not files:
-        raise HTTPException(status_code=404, detail=f"No .{format} file found.")
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    file_path = files[0]
-    media_map = {
-        "txt": "text/plain",
-        "json": "application/json",
-        "md": "text/markdown",
-        "zip": "application/zip"
-    }
+    media_type = MEDIA_TYPES.get(format, "application/octet-stream")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        size = entry["size"]
+        try:
+            window = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            raise HTTPException(
+                status_code=416,
+                detail=f"Range not satisfiable: {range_header}",
+                headers={"Content-Range": f"bytes */{size}"},
+            )
+        if window is not None:
+            start, end = window
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            headers["Content-Disposition"] = f'attachment; filename="{entry["name"]}"'
+            return StreamingResponse(
+                read_window(blob_path, start, end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=media_type,
+                headers=headers,
+            )
 
+    if encoding:
+        headers["Content-Encoding"] = encoding
     return FileResponse(
-        path=str(file_path),
-        media_type=media_map.get(format, "application/octet-stream"),
-        filename=file_path.name
+        path=str(variants[encoding] if encoding else blob_path),
+        media_type=media_type,
+        filename=entry["name"],
+        headers=headers,
     )
@@ -1,17 +1,199 @@
-from fastapi import APIRouter, HTTPException, status
-from plugins.gittxt_api.api.v1.models.scan_models import ScanRequest, ScanResponse
-from plugins.gittxt_api.core.services.scan_service import perform_scan
+import asyncio
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from gittxt.core.config import ConfigManager
+from gittxt.core.output_builder import STREAM_FORMATS
+from plugins.gittxt_api.api.v1.deps import (
+    admit_scan_request,
+    get_job_queue,
+    get_job_store,
+)
+from plugins.gittxt_api.api.v1.models.scan_models import (
+    BatchScanRequest,
+    ScanRequest,
+)
+from plugins.gittxt_api.core.services.job_store import DONE, FAILED, QUEUED
+from plugins.gittxt_api.core.services.scan_service import submit_scan
+from plugins.gittxt_api.core.services.event_stream import job_event_stream
+from plugins.gittxt_api.core.services.stream_service import ReportStream
 from plugins.gittxt_api.api.v1.models.response_models import ApiResponse
 
 router = APIRouter(tags=["Scan"])
 
-@router.post("/", response_model=ApiResponse, status_code=status.HTTP_201_CREATED)
-async def scan_repo(request: ScanRequest):
+STREAM_MEDIA_TYPES = {
+    "txt": "text/plain; charset=utf-8",
+    "md": "text/markdown; charset=utf-8",
+    "json": "application/json",
+}
+
+
+def _must_wait(wait: bool) -> bool:
+    """
+    Whether the request blocks until its job is done: asked for, or forced
+    by `api_always_wait` where nothing runs between requests (Lambda).
+    """
+    return wait or bool(ConfigManager.load_config().get("api_always_wait"))
+
+
+async def _wait_for_job(scan_id: str) -> dict:
+    """
+    Block until the job has finished; 410 if it was removed meanwhile,
+    500 with its error if it failed.
+    """
+    job = await get_job_queue().wait(scan_id)
+    if job is None:
+        raise HTTPException(status_code=410, detail="Scan job no longer exists.")
+    if job["state"] == FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    return job
+
+
+@router.post(
+    "/",
+    response_model=ApiResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admit_scan_request)],
+)
+async def scan_repo(request: ScanRequest, response: Response, wait: bool = False):
+    """
+    Queue a scan of a GitHub/local repository and return its scan_id at once.
+    Poll `GET /v1/scan/{scan_id}` for progress; with `wait=true` the request
+    blocks until the scan has finished and returns its result.
+    A finished scan of the same commit with the same options is returned
+    straight away (200), and identical requests share one running job.
+    """
+    try:
+        scan_id = await submit_scan(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    job = await asyncio.to_thread(get_job_store().get, scan_id)
+    if job["state"] == DONE:
+        response.status_code = status.HTTP_200_OK
+        return ApiResponse(message="Scan served from cache", data=job["result"])
+    if not _must_wait(wait):
+        return ApiResponse(
+            message=f"Scan {job['state']}",
+            data={
+                "scan_id": scan_id,
+                "state": job["state"],
+                "status_url": f"/v1/scan/{scan_id}",
+            },
+        )
+
+    job = await _wait_for_job(scan_id)
+    response.status_code = status.HTTP_201_CREATED
+    return ApiResponse(message="Scan completed successfully", data=job["result"])
+
+
+@router.post(
+    "/batch",
+    response_model=ApiResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admit_scan_request)],
+)
+async def scan_batch(request: BatchScanRequest, response: Response, wait: bool = False):
     """
-    Scan a GitHub/local repository and generate outputs (text, markdown, json, zip).
+    Queue one job that scans every repo in `repos`, a few at a time, sharing
+    the worker's encoder, thread pool and mirror cache. The result lists each
+    repo's own scan_id and result (or error) plus aggregate throughput.
     """
+    max_repos = ConfigManager.load_config().get("api_batch_max_repos")
+    if max_repos and len(request.repos) > max_repos:
+        raise HTTPException(
+            status_code=400, detail=f"A batch takes at most {max_repos} repos"
+        )
+
+    queue = get_job_queue()
+    try:
+        scan_id = await queue.submit("batch", request.dict())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not _must_wait(wait):
+        return ApiResponse(
+            message="Batch queued",
+            data={
+                "scan_id": scan_id,
+                "state": QUEUED,
+                "repos": len(request.repos),
+                "status_url": f"/v1/scan/{scan_id}",
+            },
+        )
+
+    job = await _wait_for_job(scan_id)
+    response.status_code = status.HTTP_201_CREATED
+    return ApiResponse(message="Batch completed", data=job["result"])
+
+
+@router.post("/stream", dependencies=[Depends(admit_scan_request)])
+async def stream_scan(
+    request: ScanRequest,
+    format: str = Query("txt", description="Report format: txt, md or json"),
+    gzip: bool = Query(False, description="Gzip-compress the response body"),
+):
+    """
+    Scan a repository and stream the report back as it is formatted.
+    Nothing is queued, cached or written to the output directory.
+    """
+    if format not in STREAM_FORMATS:
+        allowed = ", ".join(STREAM_FORMATS)
+        raise HTTPException(
+            status_code=400, detail=f"Format '{format}' cannot be streamed: {allowed}"
+        )
+
+    stream = ReportStream(request, format, compress=gzip)
     try:
-        scan_result = await perform_scan(request)
-        return ApiResponse(message="Scan completed successfully", data=scan_result.dict())
+        await stream.prepare()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{stream.repo_name}.{format}"',
+        "X-Accel-Buffering": "no",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream.body(), media_type=STREAM_MEDIA_TYPES[format], headers=headers
+    )
+
+
+@router.get("/{scan_id}", response_model=ApiResponse)
+async def scan_status(scan_id: str = Path(..., description="Scan ID to look up")):
+    """
+    State (queued/running/done/failed), stage timings and, once done, the result.
+    """
+    job = await asyncio.to_thread(get_job_store().get, scan_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan ID not found.")
+    return ApiResponse(message=f"Scan {job['state']}", data=job)
+
+
+@router.get("/{scan_id}/events")
+async def scan_events(scan_id: str = Path(..., description="Scan ID to follow")):
+    """
+    Server-sent events: `stage` on each transition (clone, walk, classify,
+    tokenize, format, zip), throttled `progress` with counters and
+    throughput, and a final `end` with the job state.
+    """
+    events = get_job_queue().events.get(scan_id)
+    store = get_job_store()
+    if events is None and await asyncio.to_thread(store.get, scan_id) is None:
+        raise HTTPException(status_code=404, detail="Scan ID not found.")
+    return StreamingResponse(
+        job_event_stream(scan_id, events, store),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
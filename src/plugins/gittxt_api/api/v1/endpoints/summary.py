@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Path, status
-from plugins.gittxt_api.core.utils.json_utils import load_json_summary
-from plugins.gittxt_api.api.v1.deps import get_output_dir
+from plugins.gittxt_api.core.utils.json_utils import load_json_summary, summary_cache
+from plugins.gittxt_api.api.v1.deps import get_artifact_store
 from plugins.gittxt_api.api.v1.models.response_models import ApiResponse
 
 router = APIRouter(tags=["Summary"])
@@ -8,11 +8,20 @@ router = APIRouter(tags=["Summary"])
 @router.get("/{scan_id}", response_model=ApiResponse, status_code=status.HTTP_200_OK)
 async def get_summary(scan_id: str = Path(..., description="Scan ID of completed scan job")):
     """
-    Fetch the JSON summary of a completed scan.
+    Fetch the summary of a completed scan: stats, breakdowns and per-file
+    metadata, served from the scan's compact summary artifact.
     """
+    store = get_artifact_store()
     try:
-        summary_dir = get_output_dir() / scan_id / "json"
-        summary_data = await load_json_summary(summary_dir)
+        try:
+            summary_file, entry = store.resolve(scan_id, "summary")
+        except FileNotFoundError:
+            # Scans stored before summary.json existed only have the report
+            summary_file, entry = store.resolve(scan_id, "json")
+        summary_data = summary_cache.get(scan_id, entry["sha256"])
+        if summary_data is None:
+            summary_data = await load_json_summary(summary_file)
+            summary_cache.put(scan_id, entry["sha256"], summary_data)
         return ApiResponse(message="Summary loaded", data=summary_data)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
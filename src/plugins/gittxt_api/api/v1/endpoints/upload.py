@@ -1,21 +1,42 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+import tarfile
+import zipfile
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from gittxt.core.sources import ARCHIVE_SUFFIXES, ArchiveLimitError
+from plugins.gittxt_api.api.v1.deps import admit_scan_request
 from plugins.gittxt_api.api.v1.models.upload_models import UploadResponse
-from plugins.gittxt_api.core.services.upload_service import handle_uploaded_zip
+from plugins.gittxt_api.core.services.upload_service import (
+    UploadTooLarge,
+    handle_uploaded_zip,
+)
 from plugins.gittxt_api.api.v1.models.response_models import ApiResponse
 
 router = APIRouter(tags=["Upload"])
 
-@router.post("/", response_model=ApiResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=ApiResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_scan_request)],
+)
 async def upload_zip(file: UploadFile = File(...), lite: bool = False):
     """
-    Accepts a zipped repository, scans and processes files.
+    Accepts a zipped (or tarred) repository, scans and processes files.
+    Uploads over the configured size, entry or uncompressed-size limits
+    are rejected with 413 before anything is scanned, and uploads that
+    arrive while the server is overloaded with 429.
     """
-    if not file.filename.lower().endswith(".zip"):
-        raise HTTPException(status_code=400, detail="Only .zip files are supported")
+    if not file.filename.lower().endswith(ARCHIVE_SUFFIXES):
+        raise HTTPException(
+            status_code=400, detail="Only .zip and tar archives are supported"
+        )
 
     try:
         upload_result = await handle_uploaded_zip(file, lite=lite)
         return ApiResponse(message="Upload & scan completed", data=upload_result.dict())
 
+    except (UploadTooLarge, ArchiveLimitError) as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise HTTPException(status_code=400, detail=f"Unreadable archive: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
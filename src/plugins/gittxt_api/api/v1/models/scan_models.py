@@ -14,6 +14,8 @@ class ScanRequest(BaseModel):
     size_limit: Optional[int] = None
     tree_depth: Optional[int] = None
     skip_tree: bool = False
+    # Scan again even if a finished scan of the same commit and options exists
+    refresh: bool = False
 
 class ScanResponse(BaseModel):
     scan_id: str
@@ -23,3 +25,9 @@ class ScanResponse(BaseModel):
     artifact_dir: str
     message: str
     summary: Dict[str, Any] = {}
+    artifacts: Dict[str, Any] = {}
+
+class BatchScanRequest(BaseModel):
+    repos: List[ScanRequest] = Field(..., min_length=1)
+    # Repos scanned at once; capped by api_batch_concurrency
+    concurrency: Optional[int] = Field(None, ge=1)
@@ -5,4 +5,6 @@ class UploadResponse(BaseModel):
     repo_name: str
     num_textual_files: int
     num_non_textual_files: int
+    archive_bytes: int
+    archive_sha256: str
     message: str
@@ -0,0 +1,216 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Iterable, Optional
+from gittxt.core.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+# Report bytes held in memory per byte of file content, by format (rich mode)
+FORMAT_MEMORY_FACTORS = {"txt": 1.0, "md": 1.1, "json": 1.5}
+# Stats, summary and tree entries kept per file whatever the mode
+PER_FILE_BYTES = 4 * 1024
+# Retry-After guess before any scan has finished
+DEFAULT_SCAN_SECONDS = 5.0
+MAX_RETRY_AFTER = 300
+
+
+class AdmissionRejected(RuntimeError):
+    """
+    Raised when the server is too busy to queue another scan.
+    `retry_after` is a hint in whole seconds.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_memory(files: Iterable, formats: Iterable[str], lite: bool = False) -> int:
+    """
+    Bytes a scan of `files` is expected to hold while formatting: the file
+    contents once (read for tokens), once more per rich report format, and
+    a fixed overhead per file. Sizes come from `stat()`, which archive and
+    git-object files answer without reading.
+    """
+    count, content = 0, 0
+    for file in files:
+        count += 1
+        try:
+            content += file.stat().st_size
+        except OSError:
+            continue
+    factor = 1.0
+    if not lite:
+        factor += sum(FORMAT_MEMORY_FACTORS.get(fmt, 1.0) for fmt in formats)
+    return int(content * factor) + count * PER_FILE_BYTES
+
+
+class AdmissionController:
+    """
+    Admit API scans against a CPU and a memory budget.
+
+    Every running scan holds one of `cpu_slots`; it also reserves its
+    estimated memory (see estimate_memory) for the formatting stage, where
+    whole reports are built, and waits while the reservations of the scans
+    already formatting would exceed `memory_bytes`. A scan larger than the
+    whole budget runs once nothing else holds memory. Waiters are served in
+    order. `check` refuses new requests with AdmissionRejected once
+    `max_queue` jobs are waiting, counting the caller's own queue.
+    All methods must be called from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: Optional[int] = None,
+        cpu_slots: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.memory_bytes = memory_bytes
+        self.cpu_slots = max(1, int(cpu_slots or os.cpu_count() or 1))
+        self.max_queue = max_queue
+        self.running = 0
+        self.memory_in_use = 0
+        self._slot_waiters: deque = deque()
+        self._memory_waiters: deque = deque()
+        self._scan_seconds: Optional[float] = None
+        self.counters = {"checked": 0, "rejected": 0, "admitted": 0}
+
+    @property
+    def waiting(self) -> int:
+        return len(self._slot_waiters) + len(self._memory_waiters)
+
+    def check(self, queued: int = 0):
+        """
+        Refuse a new scan request when `queued` jobs plus the scans waiting
+        here reach `max_queue`.
+        """
+        self.counters["checked"] += 1
+        depth = queued + self.waiting
+        if self.max_queue is None or depth < self.max_queue:
+            return
+        self.counters["rejected"] += 1
+        retry_after = self.retry_after(depth)
+        logger.warning(f"🚦 Scan refused: {depth} waiting, retry in {retry_after}s")
+        raise AdmissionRejected(
+            f"Server busy: {depth} scans waiting", retry_after=retry_after
+        )
+
+    def retry_after(self, depth: int) -> int:
+        """
+        Seconds until `depth` waiting scans have drained, from the average
+        duration of recent scans.
+        """
+        per_scan = self._scan_seconds or DEFAULT_SCAN_SECONDS
+        rounds = math.ceil((depth + 1) / self.cpu_slots)
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(per_scan * rounds)))
+
+    async def acquire_slot(self) -> float:
+        """
+        Wait for a CPU slot; returns the monotonic time it was granted.
+        """
+        if self.running >= self.cpu_slots or self._slot_waiters:
+            waiter = asyncio.get_running_loop().create_future()
+            self._slot_waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                # Leave the line, or hand back a slot granted as we were cancelled
+                if waiter in self._slot_waiters:
+                    self._slot_waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    self._release_slot()
+                raise
+        else:
+            self.running += 1
+        self.counters["admitted"] += 1
+        return time.monotonic()
+
+    def release_slot(self, granted: Optional[float] = None):
+        if granted is not None:
+            seconds = time.monotonic() - granted
+            previous = self._scan_seconds
+            self._scan_seconds = (
+                seconds if previous is None else 0.8 * previous + 0.2 * seconds
+            )
+        self._release_slot()
+
+    def _release_slot(self):
+        self.running -= 1
+        while self._slot_waiters and self.running < self.cpu_slots:
+            waiter = self._slot_waiters.popleft()
+            if not waiter.done():
+                self.running += 1
+                waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self):
+        granted = await self.acquire_slot()
+        try:
+            yield
+        finally:
+            self.release_slot(granted)
+
+    @asynccontextmanager
+    async def memory(self, cost: int):
+        """
+        Reserve `cost` bytes of the memory budget for the enclosed block.
+        """
+        if self.memory_bytes:
+            cost = min(cost, self.memory_bytes)
+        if not self._fits(cost) or self._memory_waiters:
+            waiter = asyncio.get_running_loop().create_future()
+            self._memory_waiters.append((cost, waiter))
+            try:
+                await waiter
+            except BaseException:
+                if (cost, waiter) in self._memory_waiters:
+                    self._memory_waiters.remove((cost, waiter))
+                    self._free(0)
+                elif not waiter.cancelled():
+                    self._free(cost)
+                raise
+        else:
+            self.memory_in_use += cost
+        try:
+            yield
+        finally:
+            self._free(cost)
+
+    def _fits(self, cost: int) -> bool:
+        if not self.memory_bytes or self.memory_in_use == 0:
+            return True
+        return self.memory_in_use + cost <= self.memory_bytes
+
+    def _free(self, cost: int):
+        self.memory_in_use -= cost
+        while self._memory_waiters:
+            cost, waiter = self._memory_waiters[0]
+            if not self._fits(cost):
+                break
+            self._memory_waiters.popleft()
+            if not waiter.done():
+                self.memory_in_use += cost
+                waiter.set_result(None)
+
+    @property
+    def metrics(self) -> dict:
+        checked = self.counters["checked"]
+        return {
+            **self.counters,
+            "rejection_rate": round(self.counters["rejected"] / checked, 4)
+            if checked
+            else 0.0,
+            "running": self.running,
+            "cpu_slots": self.cpu_slots,
+            "waiting_for_slot": len(self._slot_waiters),
+            "waiting_for_memory": len(self._memory_waiters),
+            "memory_in_use": self.memory_in_use,
+            "memory_budget": self.memory_bytes,
+            "avg_scan_seconds": None
+            if self._scan_seconds is None
+            else round(self._scan_seconds, 3),
+        }
@@ -0,0 +1,158 @@
+import asyncio
+import shutil
+import threading
+import time
+from typing import Callable, List, Optional, Set
+from gittxt.core.logger import Logger
+from plugins.gittxt_api.core.services.artifact_store import ArtifactStore
+
+logger = Logger.get_logger(__name__)
+
+
+class ArtifactCollector:
+    """
+    Background garbage collector for stored scans.
+
+    Every `interval` seconds a sweep deletes scans not accessed for `max_age`
+    seconds, then evicts the least-recently-accessed scans until the blobs fit
+    in `max_bytes`. Deletions requested through `enqueue` (the cleanup
+    endpoint) go through the same single worker. All filesystem work runs in
+    a thread; `metrics` counts what was deleted and reclaimed.
+    """
+
+    def __init__(
+        self,
+        store: ArtifactStore,
+        max_age: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        interval: float = 300,
+        on_delete: Optional[Callable[[str], None]] = None,
+    ):
+        self.store = store
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.on_delete = on_delete
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._metrics_lock = threading.Lock()
+        # Sweeps and queued deletions run in different threads
+        self._delete_lock = threading.RLock()
+        self.metrics = {
+            "scans_deleted": 0,
+            "bytes_reclaimed": 0,
+            "expired": 0,
+            "evicted": 0,
+            "requested": 0,
+            "stored_bytes": None,
+            "last_sweep": None,
+        }
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker())]
+        if self.max_age or self.max_bytes:
+            self._tasks.append(asyncio.create_task(self._sweep_loop()))
+        logger.info("🧹 Artifact collector started")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def enqueue(self, scan_id: str):
+        """
+        Schedule a scan for deletion and return at once.
+        """
+        await self.start()
+        if scan_id in self._pending:
+            return
+        self._pending.add(scan_id)
+        self._queue.put_nowait(("requested", scan_id))
+
+    async def join(self):
+        """
+        Wait until every queued deletion has been carried out.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def sweep(self):
+        """
+        Delete expired scans, then least-recently-used ones over the quota.
+        """
+        await self.start()
+        await self._queue.join()
+        await asyncio.to_thread(self._sweep)
+
+    async def _sweep_loop(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"❌ Artifact sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _worker(self):
+        while True:
+            reason, scan_id = await self._queue.get()
+            try:
+                await asyncio.to_thread(self._delete, scan_id, reason)
+            except Exception as e:
+                logger.error(f"❌ Could not delete scan {scan_id}: {e}")
+            finally:
+                self._pending.discard(scan_id)
+                self._queue.task_done()
+
+    def _delete(self, scan_id: str, reason: str) -> int:
+        with self._delete_lock:
+            try:
+                reclaimed = self.store.delete_scan(scan_id)
+            except FileNotFoundError:
+                return 0
+            if self.on_delete is not None:
+                self.on_delete(scan_id)
+        with self._metrics_lock:
+            self.metrics["scans_deleted"] += 1
+            self.metrics["bytes_reclaimed"] += reclaimed
+            self.metrics[reason] += 1
+        logger.info(f"🧹 Removed scan {scan_id} ({reason}, {reclaimed} bytes)")
+        return reclaimed
+
+    def _sweep(self):
+        with self._delete_lock:
+            self._sweep_locked()
+
+    def _sweep_locked(self):
+        now = time.time()
+        scans = sorted(
+            (self.store.last_access(scan_id), scan_id)
+            for scan_id in self.store.scan_ids()
+            if scan_id not in self._pending
+        )
+
+        if self.max_age:
+            while scans and now - scans[0][0] > self.max_age:
+                _, scan_id = scans.pop(0)
+                self._delete(scan_id, "expired")
+            for staging in self.store.stale_staging(self.max_age):
+                shutil.rmtree(staging, ignore_errors=True)
+
+        stored = self.store.stored_bytes()
+        if self.max_bytes:
+            while scans and stored > self.max_bytes:
+                _, scan_id = scans.pop(0)
+                self._delete(scan_id, "evicted")
+                stored = self.store.stored_bytes()
+
+        with self._metrics_lock:
+            self.metrics["stored_bytes"] = stored
+            self.metrics["last_sweep"] = now
@@ -0,0 +1,340 @@
+import os
+import gzip
+import json
+import shutil
+import sqlite3
+import hashlib
+import tempfile
+import threading
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from datetime import datetime, timezone
+from gittxt.core.logger import Logger
+from gittxt.core.output_builder import SUMMARY_FILENAME
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = Logger.get_logger(__name__)
+
+BLOB_DIR = "blobs"
+ENCODED_DIR = "encoded"
+STAGING_DIR = ".staging"
+DB_NAME = "artifacts.db"
+MANIFEST_NAME = "manifest.json"
+LAST_ACCESS_MARKER = ".last_access"
+TOUCH_INTERVAL = 60
+MANIFEST_VERSION = 1
+
+MEDIA_TYPES = {
+    "txt": "text/plain",
+    "json": "application/json",
+    "md": "text/markdown",
+    "summary": "application/json",
+    "sqlite": "application/vnd.sqlite3",
+    "zip": "application/zip",
+}
+
+# Formats worth precompressing; zip bundles are already compressed.
+COMPRESSIBLE_FORMATS = ("txt", "json", "md", "sqlite")
+ENCODING_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+
+
+def available_encodings():
+    """
+    Content encodings this install can produce, best first.
+    """
+    return [e for e in ENCODING_SUFFIXES if e != "zstd" or zstandard is not None]
+
+
+def _compress_file(source: Path, target: Path, encoding: str):
+    with open(source, "rb") as src, open(target, "wb") as raw:
+        if encoding == "zstd":
+            dst = zstandard.ZstdCompressor(level=10).stream_writer(raw)
+        else:
+            # mtime=0 keeps the variant byte-identical for identical blobs
+            dst = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+        with dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+
+
+def _sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Content-addressed storage for scan artifacts.
+
+    Reports and bundles live once under `<root>/blobs/<ab>/<sha256>`; each scan
+    directory only holds a manifest mapping formats to blob hashes. A small
+    SQLite table keeps a reference count per blob so deleting a scan frees
+    exactly the blobs no other scan points at.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        self.blob_root = self.root / BLOB_DIR
+        self.db_path = self.root / DB_NAME
+        self.blob_root.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                " digest TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " refcount INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None lets us issue BEGIN IMMEDIATE ourselves, which
+        # also serialises writers across API worker processes.
+        return sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_root / digest[:2] / digest
+
+    def encoded_path(self, digest: str, encoding: str) -> Path:
+        suffix = ENCODING_SUFFIXES[encoding]
+        return self.root / ENCODED_DIR / digest[:2] / f"{digest}{suffix}"
+
+    def scan_dir(self, scan_id: str) -> Path:
+        return self.root / scan_id
+
+    def staging_dir(self, scan_id: str) -> Path:
+        """
+        Scratch directory where formatters write before ingestion.
+        """
+        path = self.root / STAGING_DIR / scan_id
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def put_file(self, path: Path, compress: bool = False) -> dict:
+        """
+        Move a file into the store (or drop it if the blob already exists)
+        and take one reference on it. With `compress`, the entry also lists
+        the precompressed variants under "encodings".
+        """
+        path = Path(path)
+        digest = _sha256_file(path)
+        size = path.stat().st_size
+        target = self.blob_path(digest)
+
+        with self._transaction() as conn:
+            if target.exists():
+                path.unlink()
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.replace(path, target)
+                except OSError:
+                    shutil.move(str(path), str(target))
+            conn.execute(
+                "INSERT INTO blobs (digest, size, refcount) VALUES (?, ?, 1)"
+                " ON CONFLICT(digest) DO UPDATE SET refcount = refcount + 1",
+                (digest, size),
+            )
+        entry = {"sha256": digest, "size": size}
+        if compress:
+            entry["encodings"] = self._precompress(digest, size)
+        return entry
+
+    def _precompress(self, digest: str, size: int) -> dict:
+        """
+        Write the missing encoded variants of a blob. Variants that come out
+        no smaller than the blob are dropped.
+        """
+        variants = {}
+        for encoding in available_encodings():
+            target = self.encoded_path(digest, encoding)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+                os.close(fd)
+                try:
+                    _compress_file(self.blob_path(digest), Path(tmp), encoding)
+                    os.replace(tmp, target)
+                finally:
+                    Path(tmp).unlink(missing_ok=True)
+            encoded_size = target.stat().st_size
+            if encoded_size < size:
+                variants[encoding] = {"size": encoded_size}
+        return variants
+
+    def encodings(self, entry: dict) -> dict:
+        """
+        Encoded variants of a manifest entry that exist on disk, by encoding.
+        """
+        return {
+            encoding: self.encoded_path(entry["sha256"], encoding)
+            for encoding in entry.get("encodings", {})
+            if encoding in ENCODING_SUFFIXES
+            and self.encoded_path(entry["sha256"], encoding).is_file()
+        }
+
+    def ingest_scan(self, scan_id: str, output_files, metadata: dict = None) -> dict:
+        """
+        Store every generated output, write the scan manifest and drop staging.
+        Artifacts are keyed by format (file suffix), e.g. "txt" or "zip";
+        the compact summary is stored as "summary".
+        """
+        artifacts = {}
+        for output in output_files:
+            output = Path(output)
+            if not output.is_file():
+                continue
+            fmt = (
+                "summary" if output.name == SUMMARY_FILENAME else output.suffix[1:]
+            )
+            entry = self.put_file(output, compress=fmt in COMPRESSIBLE_FORMATS)
+            artifacts[fmt] = {"name": output.name, **entry}
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "scan_id": scan_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **(metadata or {}),
+            "artifacts": artifacts,
+        }
+        scan_dir = self.scan_dir(scan_id)
+        scan_dir.mkdir(parents=True, exist_ok=True)
+        tmp = scan_dir / f"{MANIFEST_NAME}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp, scan_dir / MANIFEST_NAME)
+
+        self.discard_staging(scan_id)
+        logger.info(f"🗃️ Stored {len(artifacts)} artifacts for scan {scan_id}")
+        return manifest
+
+    def discard_staging(self, scan_id: str):
+        shutil.rmtree(self.root / STAGING_DIR / scan_id, ignore_errors=True)
+
+    def load_manifest(self, scan_id: str) -> dict:
+        manifest_path = self.scan_dir(scan_id) / MANIFEST_NAME
+        if not manifest_path.is_file():
+            raise FileNotFoundError(f"Scan ID not found: {scan_id}")
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        self.touch(scan_id)
+        return manifest
+
+    def has_scan(self, scan_id: str) -> bool:
+        return (self.scan_dir(scan_id) / MANIFEST_NAME).is_file()
+
+    def scan_ids(self):
+        """
+        Every stored scan (a directory holding a manifest).
+        """
+        return [p.parent.name for p in self.root.glob(f"*/{MANIFEST_NAME}")]
+
+    def touch(self, scan_id: str):
+        """
+        Record an access for LRU eviction, at most once per TOUCH_INTERVAL.
+        """
+        marker = self.scan_dir(scan_id) / LAST_ACCESS_MARKER
+        now = time.time()
+        try:
+            if now - marker.stat().st_mtime < TOUCH_INTERVAL:
+                return
+        except OSError:
+            pass
+        try:
+            marker.touch()
+        except OSError:
+            pass  # the scan is being deleted
+
+    def last_access(self, scan_id: str) -> float:
+        scan_dir = self.scan_dir(scan_id)
+        for path in (scan_dir / LAST_ACCESS_MARKER, scan_dir / MANIFEST_NAME):
+            try:
+                return path.stat().st_mtime
+            except OSError:
+                continue
+        return 0.0
+
+    def stored_bytes(self) -> int:
+        """
+        Total size of all blobs (encoded variants are not counted).
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return row[0]
+
+    def stale_staging(self, max_age: float):
+        """
+        Staging directories untouched for `max_age` seconds (abandoned scans).
+        """
+        cutoff = time.time() - max_age
+        staging = self.root / STAGING_DIR
+        if not staging.is_dir():
+            return []
+        return [p for p in staging.iterdir() if p.stat().st_mtime < cutoff]
+
+    def resolve(self, scan_id: str, fmt: str):
+        """
+        Return (blob_path, manifest_entry) for one artifact of a scan.
+        """
+        manifest = self.load_manifest(scan_id)
+        entry = manifest.get("artifacts", {}).get(fmt)
+        if not entry:
+            raise FileNotFoundError(f"No '{fmt}' artifact for scan {scan_id}")
+        blob = self.blob_path(entry["sha256"])
+        if not blob.is_file():
+            raise FileNotFoundError(
+                f"Blob missing for '{fmt}' artifact: {entry['sha256']}"
+            )
+        return blob, entry
+
+    def delete_scan(self, scan_id: str) -> int:
+        """
+        Drop a scan's references and delete blobs nobody else uses.
+        Returns the number of bytes reclaimed.
+        """
+        manifest = self.load_manifest(scan_id)
+        reclaimed = 0
+
+        with self._transaction() as conn:
+            for entry in manifest.get("artifacts", {}).values():
+                digest = entry["sha256"]
+                conn.execute(
+                    "UPDATE blobs SET refcount = refcount - 1 WHERE digest = ?",
+                    (digest,),
+                )
+                row = conn.execute(
+                    "SELECT refcount, size FROM blobs WHERE digest = ?", (digest,)
+                ).fetchone()
+                if row and row[0] <= 0:
+                    conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                    self.blob_path(digest).unlink(missing_ok=True)
+                    for encoding in ENCODING_SUFFIXES:
+                        self.encoded_path(digest, encoding).unlink(missing_ok=True)
+                    reclaimed += row[1]
+
+        shutil.rmtree(self.scan_dir(scan_id), ignore_errors=True)
+        logger.info(f"🗑️ Deleted scan {scan_id}, reclaimed {reclaimed} bytes")
+        return reclaimed
+
+    def refcount(self, digest: str) -> int:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT refcount FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        return row[0] if row else 0
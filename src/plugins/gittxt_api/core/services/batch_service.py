@@ -0,0 +1,96 @@
+import asyncio
+import time
+from gittxt.core.config import ConfigManager
+from gittxt.core.events import ScanEvents
+from gittxt.core.logger import Logger
+from gittxt.core.mirror_cache import MirrorCache
+from plugins.gittxt_api.api.v1.models.scan_models import BatchScanRequest
+from plugins.gittxt_api.core.services.job_store import DONE, FAILED
+from plugins.gittxt_api.core.services.prewarm import prewarm
+from plugins.gittxt_api.core.services.scan_service import perform_scan
+
+logger = Logger.get_logger(__name__)
+
+
+class RepoEvents(ScanEvents):
+    """
+    Progress of one repo in a batch; its counters also add to the batch's,
+    so the batch job's progress events carry the combined throughput.
+    """
+
+    def __init__(self, batch: ScanEvents):
+        super().__init__()
+        self.batch = batch
+
+    def add(self, counter: str, amount: int = 1):
+        super().add(counter, amount)
+        self.batch.add(counter, amount)
+
+
+def batch_concurrency(request: BatchScanRequest) -> int:
+    """
+    Repos scanned at once: the request's wish, capped by config and by the
+    number of repos.
+    """
+    limit = ConfigManager.load_config().get("api_batch_concurrency") or 1
+    wanted = request.concurrency or limit
+    return max(1, min(wanted, limit, len(request.repos)))
+
+
+async def run_batch_job(scan_id: str, payload: dict, events: ScanEvents) -> dict:
+    """
+    Job queue handler for `batch` jobs: scan every repo of the batch with
+    bounded concurrency. Repo `i` is stored as scan `{scan_id}-{i}`; a repo
+    that fails is reported in its result and does not fail the batch.
+    """
+    request = BatchScanRequest(**payload)
+    semaphore = asyncio.Semaphore(batch_concurrency(request))
+    # One mirror cache for the whole batch (False: disabled, don't re-read
+    # the config per repo); the encoder is process-wide once loaded
+    mirror_cache = MirrorCache.from_config() or False
+    await asyncio.to_thread(prewarm)
+    started = time.monotonic()
+
+    async def scan_one(index: int, repo) -> dict:
+        repo_id = f"{scan_id}-{index}"
+        async with semaphore:
+            repo_started = time.monotonic()
+            entry = {"repo_path": repo.repo_path, "scan_id": repo_id}
+            try:
+                result = await perform_scan(
+                    repo, repo_id, RepoEvents(events), mirror_cache
+                )
+            except Exception as e:
+                logger.error(f"❌ Batch {scan_id}: {repo.repo_path} failed: {e}")
+                entry.update(state=FAILED, error=str(e))
+            else:
+                entry.update(state=DONE, result=result.dict())
+            entry["elapsed"] = round(time.monotonic() - repo_started, 3)
+            return entry
+
+    results = await asyncio.gather(
+        *(scan_one(index, repo) for index, repo in enumerate(request.repos))
+    )
+    return {
+        "scan_id": scan_id,
+        "results": results,
+        "stats": _batch_stats(results, events, time.monotonic() - started),
+    }
+
+
+def _batch_stats(results: list, events: ScanEvents, elapsed: float) -> dict:
+    done = [entry["result"] for entry in results if entry["state"] == DONE]
+    files = sum(r["num_textual_files"] + r["num_non_textual_files"] for r in done)
+    elapsed = max(elapsed, 1e-9)
+    return {
+        "repos": len(results),
+        "succeeded": len(done),
+        "failed": len(results) - len(done),
+        "files": files,
+        "bytes_read": events.counters["bytes_read"],
+        "tokens_counted": events.counters["tokens_counted"],
+        "elapsed": round(elapsed, 3),
+        "repos_per_sec": round(len(results) / elapsed, 2),
+        "files_per_sec": round(files / elapsed, 1),
+        "bytes_per_sec": round(events.counters["bytes_read"] / elapsed),
+    }
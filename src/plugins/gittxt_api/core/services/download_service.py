@@ -0,0 +1,102 @@
+import re
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Tuple
+import aiofiles
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(ValueError):
+    """
+    A `Range` header that selects no byte of the artifact.
+    """
+
+
+def etag_for(digest: str, encoding: Optional[str] = None) -> str:
+    """
+    Strong ETag from the content hash; each encoded variant gets its own.
+    """
+    return f'"{digest}+{encoding}"' if encoding else f'"{digest}"'
+
+
+def _etags(header: str):
+    for tag in header.split(","):
+        tag = tag.strip()
+        yield tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    `If-None-Match` check (weak comparison, `*` matches anything).
+    """
+    if not header:
+        return False
+    return any(tag in ("*", etag) for tag in _etags(header))
+
+
+def choose_encoding(
+    accept_encoding: Optional[str], available: Iterable[str]
+) -> Optional[str]:
+    """
+    Pick the first of `available` (best first) the client accepts, or None
+    for the identity body.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    for encoding in available:
+        if weights.get(encoding, weights.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into an inclusive (start, end) window.
+
+    Returns None when the header should be ignored (absent, malformed or
+    multi-range), in which case the full artifact is sent.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise RangeNotSatisfiable(header)
+    return start, end
+
+
+async def read_window(
+    path: Path, start: int, end: int, chunk_size: int = 256 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Yield bytes `start`..`end` (inclusive) of a file.
+    """
+    remaining = end - start + 1
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        while remaining > 0:
+            chunk = await f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,55 @@
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+from gittxt.core.events import ScanEvents
+from plugins.gittxt_api.core.services.job_store import DONE, FAILED, JobStore
+
+KEEPALIVE_SECONDS = 15
+POLL_SECONDS = 1
+
+
+def format_sse(kind: str, data: dict) -> str:
+    return f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+
+
+async def job_event_stream(
+    scan_id: str, events: Optional[ScanEvents], store: JobStore
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for one scan job, ending with an `end` event.
+
+    Jobs queued in this process stream live from their ScanEvents. Anything
+    else (finished, or owned by another worker process) is followed through
+    the job store: one `stage` event per recorded stage, then `end`.
+    """
+    if events is not None:
+        queue = events.subscribe()
+        try:
+            while True:
+                try:
+                    kind, data = await asyncio.wait_for(
+                        queue.get(), timeout=KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(kind, data)
+                if kind == "end":
+                    return
+        finally:
+            events.unsubscribe(queue)
+
+    sent = 0
+    while True:
+        job = await asyncio.to_thread(store.get, scan_id)
+        if job is None:
+            yield format_sse("end", {"state": FAILED, "error": "Scan ID not found."})
+            return
+        for stage in job["stages"][sent:]:
+            yield format_sse("stage", {"stage": stage["name"]})
+        sent = len(job["stages"])
+        if job["state"] in (DONE, FAILED):
+            final = {"state": job["state"], "error": job["error"]}
+            yield format_sse("end", {**final, "elapsed": job["duration"]})
+            return
+        await asyncio.sleep(POLL_SECONDS)
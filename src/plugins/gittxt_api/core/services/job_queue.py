@@ -0,0 +1,238 @@
+import asyncio
+import os
+import socket
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+from gittxt.core.events import ScanEvents
+from gittxt.core.logger import Logger
+from plugins.gittxt_api.core.services.job_store import (
+    DONE,
+    FAILED,
+    RUNNING,
+    JobStore,
+)
+
+logger = Logger.get_logger(__name__)
+
+POLL_SECONDS = 1.0
+# A worker process renews its jobs' leases every LEASE_SECONDS / 4; jobs of
+# a process that stopped renewing are adopted by another once this runs out
+LEASE_SECONDS = 120.0
+
+# handler(scan_id, payload, events) -> result
+JobHandler = Callable[[str, dict, ScanEvents], Awaitable[dict]]
+
+
+class ScanJobQueue:
+    """
+    Run API scan jobs on a fixed number of asyncio workers.
+
+    `submit` records the job in the JobStore and returns its scan_id at once;
+    workers pick jobs up in order, dispatch on the job kind and write stage
+    transitions, the result or the error back to the store. Jobs are leased
+    to this queue while unfinished (see JobStore); a heartbeat renews the
+    leases and adopts the jobs of worker processes that have died,
+    including, at `start`, those left by a previous process.
+    Each job queued here has a ScanEvents in `events` that live progress
+    streams subscribe to; it is dropped once the job's end event is sent.
+    """
+
+    def __init__(
+        self, store: JobStore, handlers: Dict[str, JobHandler], concurrency: int = 2
+    ):
+        self.store = store
+        self.handlers = handlers
+        self.concurrency = max(1, int(concurrency or 1))
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._finished: Dict[str, asyncio.Event] = {}
+        self.events: Dict[str, ScanEvents] = {}
+
+    async def start(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        await self._adopt()
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+        self._heartbeat = asyncio.create_task(self._renew_leases())
+        logger.info(f"🧵 Scan job queue started with {self.concurrency} workers")
+
+    async def stop(self):
+        """
+        Cancel the workers and release this queue's leases. Jobs they were
+        running stay `running` in the store until another queue adopts them.
+        """
+        tasks = [*self._workers, self._heartbeat] if self._workers else []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers, self._heartbeat = [], None
+        if tasks:
+            await asyncio.to_thread(self.store.release, self.owner)
+
+    def _lease(self) -> float:
+        return time.time() + LEASE_SECONDS
+
+    async def _adopt(self):
+        adopted = await asyncio.to_thread(
+            self.store.adopt_expired, self.owner, self._lease()
+        )
+        for scan_id in adopted:
+            self._enqueue(scan_id)
+
+    async def _renew_leases(self):
+        while True:
+            await asyncio.sleep(LEASE_SECONDS / 4)
+            try:
+                await asyncio.to_thread(self.store.renew, self.owner, self._lease())
+                await self._adopt()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not renew scan job leases: {e}")
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def submit(self, kind: str, payload: dict, cache_key: str = None) -> str:
+        """
+        Queue a job and return its scan_id. Submissions sharing a `cache_key`
+        get the id of the existing (queued, running or done) job instead.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        await self.start()
+        scan_id, created = await asyncio.to_thread(
+            self.store.create,
+            str(uuid4()),
+            kind,
+            payload,
+            cache_key,
+            self.owner,
+            self._lease(),
+        )
+        if created:
+            self._enqueue(scan_id)
+        return scan_id
+
+    def _enqueue(self, scan_id: str):
+        self.events[scan_id] = ScanEvents()
+        self._queue.put_nowait(scan_id)
+
+    async def wait(self, scan_id: str) -> Optional[dict]:
+        """
+        Wait until the job is done or failed and return its record.
+        """
+        event = self._finished.setdefault(scan_id, asyncio.Event())
+        while True:
+            job = await asyncio.to_thread(self.store.get, scan_id)
+            if job is None or job["state"] in (DONE, FAILED):
+                return job
+            # Jobs run by another worker process never set the event
+            try:
+                await asyncio.wait_for(event.wait(), timeout=POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self):
+        while True:
+            scan_id = await self._queue.get()
+            try:
+                await self._run(scan_id)
+            except Exception as e:
+                # e.g. the job row vanished or the database is locked; the
+                # worker must outlive it so later jobs still run
+                logger.error(f"❌ Scan job {scan_id} could not be run: {e}")
+                await self._settle(scan_id, FAILED, error=str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, scan_id: str):
+        kind, payload = await asyncio.to_thread(self.store.load_job, scan_id)
+        claimed = await asyncio.to_thread(
+            self.store.claim, scan_id, self.owner, self._lease()
+        )
+        if not claimed:
+            # Finished already, or adopted by another process after our lease
+            # lapsed; that process runs it and records the outcome
+            logger.warning(f"⚠️ Scan job {scan_id} is no longer ours; skipped")
+            events = self.events.pop(scan_id, None)
+            if events is not None:
+                events.close(RUNNING, "Scan job moved to another worker process")
+            event = self._finished.pop(scan_id, None)
+            if event is not None:
+                event.set()
+            return
+        events = self.events.setdefault(scan_id, ScanEvents())
+        stages = StageWriter(self.store, scan_id)
+        events.begin(on_stage=stages.add)
+
+        try:
+            result = await self.handlers[kind](scan_id, payload, events)
+        except Exception as e:
+            logger.error(f"❌ Scan job {scan_id} failed: {e}")
+            await stages.flush()
+            await self._settle(scan_id, FAILED, error=str(e))
+        else:
+            await stages.flush()
+            await self._settle(scan_id, DONE, result=result)
+
+    async def _settle(self, scan_id: str, state: str, result=None, error=None):
+        """
+        Record the outcome, end the job's event stream and wake its waiters.
+        """
+        try:
+            if state == DONE:
+                await asyncio.to_thread(self.store.finish, scan_id, result)
+            else:
+                await asyncio.to_thread(self.store.fail, scan_id, error)
+        except Exception as e:
+            logger.error(f"❌ Could not record the end of scan job {scan_id}: {e}")
+        events = self.events.pop(scan_id, None)
+        if events is not None:
+            events.close(state, error)
+        event = self._finished.pop(scan_id, None)
+        if event is not None:
+            event.set()
+
+
+class StageWriter:
+    """
+    Persist a job's stage transitions without blocking the event loop.
+
+    `add` is the ScanEvents `on_stage` hook: it timestamps the transition
+    and leaves the SQLite write to one background task per job, which
+    writes whatever has piled up in a single transaction, in order.
+    """
+
+    def __init__(self, store: JobStore, scan_id: str):
+        self.store = store
+        self.scan_id = scan_id
+        self._pending: List[Tuple[str, float]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, stage: str):
+        self._pending.append((stage, time.time()))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._write())
+
+    async def _write(self):
+        while self._pending:
+            transitions, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(
+                    self.store.record_stages, self.scan_id, transitions
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Could not record stages of {self.scan_id}: {e}")
+
+    async def flush(self):
+        """
+        Wait until every transition so far is written.
+        """
+        if self._task is not None:
+            await self._task
@@ -0,0 +1,284 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import List, Optional, Tuple
+from gittxt.core.logger import Logger
+
+logger = Logger.get_logger(__name__)
+
+DB_NAME = "jobs.db"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobStore:
+    """
+    SQLite record of API scan jobs: state, request payload, per-stage timings
+    and the final result or error.
+
+    Payloads are stored with the job, so a job that was queued or running
+    when the server stopped can be picked up again. Unfinished jobs belong
+    to the queue (`owner`) that holds their lease; the owner renews it while
+    alive, only the owner can `claim` a queued job, and `adopt_expired` hands
+    jobs whose lease ran out to another queue. Several worker processes can
+    share one store without running a job twice.
+    A job may carry a `cache_key`; `create` hands back the newest queued,
+    running or finished job with the same key instead of adding another.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / DB_NAME
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " scan_id TEXT PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " state TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " stages TEXT NOT NULL DEFAULT '[]',"
+                " result TEXT,"
+                " error TEXT,"
+                " created_at REAL NOT NULL,"
+                " started_at REAL,"
+                " finished_at REAL,"
+                " cache_key TEXT,"
+                " owner TEXT,"
+                " lease_until REAL)"
+            )
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (
+                ("cache_key", "TEXT"),
+                ("owner", "TEXT"),
+                ("lease_until", "REAL"),
+            ):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (cache_key)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def create(
+        self,
+        scan_id: str,
+        kind: str,
+        payload: dict,
+        cache_key: str = None,
+        owner: str = None,
+        lease_until: float = None,
+    ) -> Tuple[str, bool]:
+        """
+        Insert a queued job leased to `owner`. With a `cache_key` already
+        held by a job that has not failed, nothing is inserted and that
+        job's id is returned. Returns (scan_id, created).
+        """
+        with self._transaction() as conn:
+            if cache_key is not None:
+                row = conn.execute(
+                    "SELECT scan_id FROM jobs WHERE cache_key = ? AND state != ?"
+                    " ORDER BY created_at DESC LIMIT 1",
+                    (cache_key, FAILED),
+                ).fetchone()
+                if row is not None:
+                    return row["scan_id"], False
+            conn.execute(
+                "INSERT INTO jobs (scan_id, kind, state, payload, created_at,"
+                " cache_key, owner, lease_until) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    scan_id,
+                    kind,
+                    QUEUED,
+                    json.dumps(payload),
+                    time.time(),
+                    cache_key,
+                    owner,
+                    lease_until,
+                ),
+            )
+        return scan_id, True
+
+    def forget(self, scan_id: str):
+        """
+        Stop serving a job for its cache key, e.g. once its artifacts are gone.
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET cache_key = NULL WHERE scan_id = ?", (scan_id,)
+            )
+
+    def claim(self, scan_id: str, owner: str, lease_until: float) -> bool:
+        """
+        Mark a queued job running for `owner`. False when the job is not
+        queued any more or is leased to another owner.
+        """
+        with self._transaction() as conn:
+            claimed = conn.execute(
+                "UPDATE jobs SET state = ?, started_at = ?, stages = '[]',"
+                " owner = ?, lease_until = ?"
+                " WHERE scan_id = ? AND state = ? AND (owner IS NULL OR owner = ?)",
+                (RUNNING, time.time(), owner, lease_until, scan_id, QUEUED, owner),
+            ).rowcount
+        return claimed == 1
+
+    def renew(self, owner: str, lease_until: float):
+        """
+        Extend the lease on every unfinished job `owner` holds.
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND state IN (?, ?)",
+                (lease_until, owner, QUEUED, RUNNING),
+            )
+
+    def release(self, owner: str):
+        """
+        Give up `owner`'s unfinished jobs, e.g. on shutdown, so the next
+        queue to look adopts them straight away.
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_until = 0 WHERE owner = ? AND state IN (?, ?)",
+                (owner, QUEUED, RUNNING),
+            )
+
+    def record_stages(self, scan_id: str, transitions: List[Tuple[str, float]]):
+        """
+        Apply stage transitions, (name, started_at) in order: each closes the
+        running stage (if any) and opens `name`.
+        """
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT stages FROM jobs WHERE scan_id = ?", (scan_id,)
+            ).fetchone()
+            if row is None:
+                return
+            stages = json.loads(row["stages"])
+            for name, started_at in transitions:
+                stages = _close_stage(stages, started_at)
+                stages.append(
+                    {"name": name, "started_at": started_at, "duration": None}
+                )
+            conn.execute(
+                "UPDATE jobs SET stages = ? WHERE scan_id = ?",
+                (json.dumps(stages), scan_id),
+            )
+
+    def _finish(self, scan_id: str, state: str, result=None, error=None):
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT stages FROM jobs WHERE scan_id = ?", (scan_id,)
+            ).fetchone()
+            stages = _close_stage(json.loads(row["stages"]), now) if row else []
+            conn.execute(
+                "UPDATE jobs SET state = ?, stages = ?, result = ?, error = ?,"
+                " finished_at = ? WHERE scan_id = ?",
+                (
+                    state,
+                    json.dumps(stages),
+                    None if result is None else json.dumps(result),
+                    error,
+                    now,
+                    scan_id,
+                ),
+            )
+
+    def finish(self, scan_id: str, result: dict):
+        self._finish(scan_id, DONE, result=result)
+
+    def fail(self, scan_id: str, error: str):
+        self._finish(scan_id, FAILED, error=error)
+
+    def get(self, scan_id: str) -> Optional[dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE scan_id = ?", (scan_id,)
+            ).fetchone()
+        return _job_record(row) if row else None
+
+    def load_job(self, scan_id: str):
+        """
+        Return (kind, payload) of a job.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT kind, payload FROM jobs WHERE scan_id = ?", (scan_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(scan_id)
+        return row["kind"], json.loads(row["payload"])
+
+    def adopt_expired(self, owner: str, lease_until: float) -> List[str]:
+        """
+        Take over unfinished jobs whose lease has run out (their owner died
+        or let go): interrupted runs go back to queued, and every adopted
+        scan_id is returned, oldest first.
+        """
+        now = time.time()
+        expired = "(lease_until IS NULL OR lease_until < ?)"
+        with self._transaction() as conn:
+            interrupted = conn.execute(
+                "UPDATE jobs SET state = ?, started_at = NULL, stages = '[]'"
+                f" WHERE state = ? AND {expired}",
+                (QUEUED, RUNNING, now),
+            ).rowcount
+            rows = conn.execute(
+                f"SELECT scan_id FROM jobs WHERE state = ? AND {expired}"
+                " ORDER BY created_at",
+                (QUEUED, now),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET owner = ?, lease_until = ? WHERE scan_id = ?",
+                [(owner, lease_until, row["scan_id"]) for row in rows],
+            )
+        if interrupted:
+            logger.warning(f"⚠️ Requeued {interrupted} interrupted scan jobs")
+        return [row["scan_id"] for row in rows]
+
+
+def _close_stage(stages: list, now: float) -> list:
+    if stages and stages[-1]["duration"] is None:
+        stages[-1]["duration"] = round(now - stages[-1]["started_at"], 3)
+    return stages
+
+
+def _job_record(row: sqlite3.Row) -> dict:
+    started, finished = row["started_at"], row["finished_at"]
+    return {
+        "scan_id": row["scan_id"],
+        "kind": row["kind"],
+        "state": row["state"],
+        "stages": json.loads(row["stages"]),
+        "created_at": row["created_at"],
+        "started_at": started,
+        "finished_at": finished,
+        "duration": round(finished - started, 3) if started and finished else None,
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+        "cache_key": row["cache_key"],
+    }
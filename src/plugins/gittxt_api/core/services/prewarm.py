@@ -0,0 +1,33 @@
+import importlib
+import time
+from gittxt.core.logger import Logger
+from gittxt.utils import summary_utils
+
+logger = Logger.get_logger(__name__)
+
+# Imported lazily by the scan path; loading them early moves the cost out
+# of the first request
+LAZY_MODULES = ("pygments.lexers", "humanize")
+
+
+def prewarm(encoding_name: str = "cl100k_base") -> dict:
+    """
+    Load what the first scan of a fresh process would otherwise pay for:
+    the lazily imported modules and the tiktoken encoder (read from
+    TIKTOKEN_CACHE_DIR when the BPE file is there). Returns seconds per
+    step. Failures are only logged; an unwarmed process still works.
+    """
+    steps = {name: (importlib.import_module, name) for name in LAZY_MODULES}
+    steps["encoder"] = (summary_utils.get_encoder, encoding_name)
+
+    timings = {}
+    for name, (load, arg) in steps.items():
+        started = time.perf_counter()
+        try:
+            load(arg)
+        except Exception as e:
+            logger.warning(f"⚠️ Prewarm step {name} failed: {e}")
+            continue
+        timings[name] = round(time.perf_counter() - started, 4)
+    logger.info(f"🔥 Prewarmed {', '.join(timings) or 'nothing'}")
+    return timings
@@ -1,5 +1,14 @@
+import asyncio
+import hashlib
+import json
+import tempfile
 from uuid import uuid4
 from pathlib import Path
+from typing import Optional
+from gittxt.core.config import ConfigManager
+from gittxt.core.events import ScanEvents
+from gittxt.core.logger import Logger
+from gittxt.core.mirror_cache import MirrorCache
 from gittxt.core.repository import RepositoryHandler
 from gittxt.core.scanner import Scanner
 from gittxt.core.output_builder import OutputBuilder
@@ -8,61 +17,131 @@ from gittxt.utils.cleanup_utils import cleanup_temp_folder
 from gittxt.core.constants import EXCLUDED_DIRS_DEFAULT
 from gittxt.utils.summary_utils import generate_summary
 from plugins.gittxt_api.api.v1.models.scan_models import ScanRequest, ScanResponse
-from plugins.gittxt_api.api.v1.deps import get_output_dir
+from plugins.gittxt_api.api.v1.deps import (
+    get_admission_controller,
+    get_artifact_store,
+    get_job_queue,
+    get_job_store,
+)
+from plugins.gittxt_api.core.services.admission import estimate_memory
+from plugins.gittxt_api.core.services.artifact_store import MANIFEST_NAME
+from plugins.gittxt_api.core.services.job_store import DONE
 
+logger = Logger.get_logger(__name__)
 
-async def perform_scan(request: ScanRequest) -> ScanResponse:
-    scan_id = str(uuid4())
-    output_dir = get_output_dir()
-    scan_output_dir = output_dir / scan_id
-    scan_output_dir.mkdir(parents=True, exist_ok=True)
+# Request fields that do not change what a scan produces
+UNKEYED_FIELDS = {"repo_path", "branch", "refresh"}
 
-    # 1. Resolve repo
-    handler = RepositoryHandler(source=request.repo_path, branch=request.branch)
-    await handler.resolve()
-    local_path, subdir, is_remote, repo_name, used_branch = handler.get_local_path()
-    scan_root = Path(local_path) / subdir if subdir else Path(local_path)
 
-    # 2. Merge excludes
+def build_scanner(
+    request: ScanRequest, scan_root: Path, events: ScanEvents = None, source=None
+) -> Scanner:
+    """
+    A Scanner over `scan_root` (or `source`, e.g. an archive) with the
+    request's excludes and patterns.
+    """
+    # Merge excludes
     merged_excludes = set(EXCLUDED_DIRS_DEFAULT) | set(request.exclude_dirs)
     if request.sync_ignore:
         merged_excludes |= set(load_gittxtignore(scan_root))
 
-    # 3. Include patterns for docs_only mode
-    include_patterns = request.include_patterns or (["**/*.md"] if request.docs_only else [])
-
-    # 4. Scan repo
-    scanner = Scanner(
+    # Include patterns for docs_only mode
+    include_patterns = request.include_patterns or (
+        ["**/*.md"] if request.docs_only else []
+    )
+    return Scanner(
         root_path=scan_root,
         exclude_dirs=list(merged_excludes),
         include_patterns=include_patterns,
         exclude_patterns=request.exclude_patterns,
-        size_limit=request.size_limit
+        size_limit=request.size_limit,
+        events=events,
+        source=source,
     )
-    textual_files, non_textual_files = await scanner.scan_directory()
 
-    # 5. Generate outputs
-    mode = "lite" if request.lite else "rich"
-    builder = OutputBuilder(
-        repo_name=repo_name,
-        output_dir=scan_output_dir,
-        output_format="txt,json,md",
-        repo_url=request.repo_path if is_remote else None,
-        branch=used_branch,
-        subdir=subdir,
-        mode=mode
-    )
-    await builder.generate_output(
-        textual_files,
-        non_textual_files,
-        repo_path=scan_root,
-        create_zip=request.create_zip,
-        tree_depth=request.tree_depth,
-        skip_tree=request.skip_tree
+
+async def perform_scan(
+    request: ScanRequest,
+    scan_id: str = None,
+    events: ScanEvents = None,
+    mirror_cache: Optional[MirrorCache] = None,
+) -> ScanResponse:
+    """
+    Clone (if remote), scan and format a repository into the artifact store,
+    reporting stages and counters to `events` if given. `mirror_cache` is
+    passed to RepositoryHandler (None: build one from config). Runs in one
+    of the admission controller's CPU slots.
+    """
+    async with get_admission_controller().slot():
+        return await _perform_scan(request, scan_id, events, mirror_cache)
+
+
+async def _perform_scan(
+    request: ScanRequest,
+    scan_id: Optional[str],
+    events: Optional[ScanEvents],
+    mirror_cache: Optional[MirrorCache],
+) -> ScanResponse:
+    scan_id = scan_id or str(uuid4())
+    store = get_artifact_store()
+
+    # 1. Resolve repo
+    handler = RepositoryHandler(
+        source=request.repo_path,
+        branch=request.branch,
+        mirror_cache=mirror_cache,
+        events=events,
     )
+    await handler.resolve()
+    local_path, subdir, is_remote, repo_name, used_branch = handler.get_local_path()
+    scan_root = Path(local_path) / subdir if subdir else Path(local_path)
+
+    try:
+        # 2-4. Filters and scan
+        # Archive and object sources list files that are not on disk under scan_root
+        scanner = build_scanner(request, scan_root, events, source=handler.scan_source)
+        textual_files, non_textual_files = await scanner.scan_directory()
 
-    # 6. Generate summary
-    summary_data = await generate_summary(textual_files + non_textual_files)
+        # 5. Generate outputs, within the memory budget
+        mode = "lite" if request.lite else "rich"
+        formats = ("txt", "json", "md")
+        cost = await asyncio.to_thread(
+            estimate_memory, textual_files, formats, request.lite
+        )
+        builder = OutputBuilder(
+            repo_name=repo_name,
+            output_dir=store.staging_dir(scan_id),
+            output_format=",".join(formats),
+            repo_url=request.repo_path if is_remote else None,
+            branch=used_branch,
+            subdir=subdir,
+            mode=mode,
+            reproducible=True,
+            events=events,
+            summary_file=True,
+        )
+        try:
+            async with get_admission_controller().memory(cost):
+                output_files = await builder.generate_output(
+                    textual_files,
+                    non_textual_files,
+                    repo_path=scan_root,
+                    create_zip=request.create_zip,
+                    tree_depth=request.tree_depth,
+                    skip_tree=request.skip_tree
+                )
+            # Reports go into the content-addressed store; the scan dir keeps a manifest
+            manifest = await asyncio.to_thread(
+                store.ingest_scan, scan_id, output_files, {"repo_name": repo_name}
+            )
+        except Exception:
+            store.discard_staging(scan_id)
+            raise
+
+        # 6. Generate summary
+        summary_data = await generate_summary(textual_files + non_textual_files)
+    finally:
+        handler.close()
 
     # 7. Cleanup if remote
     if is_remote:
@@ -73,7 +152,67 @@ async def perform_scan(request: ScanRequest) -> ScanResponse:
         repo_name=repo_name,
         num_textual_files=len(textual_files),
         num_non_textual_files=len(non_textual_files),
-        artifact_dir=str(scan_output_dir),
+        artifact_dir=str(store.scan_dir(scan_id)),
         message="Scan completed successfully.",
-        summary=summary_data
+        summary=summary_data,
+        artifacts=manifest["artifacts"]
     )
+
+
+async def run_scan_job(scan_id: str, payload: dict, events: ScanEvents) -> dict:
+    """
+    Job queue handler for `scan` jobs.
+    """
+    result = await perform_scan(ScanRequest(**payload), scan_id, events)
+    return result.dict()
+
+
+async def scan_cache_key(request: ScanRequest) -> Optional[str]:
+    """
+    Hash of the commit the request would scan and its normalized options,
+    or None when the source has no stable commit (see source_commit).
+    """
+    try:
+        # Only refs are resolved here, so the handler never needs a clone dir
+        handler = RepositoryHandler(
+            source=request.repo_path,
+            branch=request.branch,
+            cache_dir=Path(tempfile.gettempdir()),
+        )
+        commit = await handler.source_commit()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not resolve {request.repo_path} to a commit: {e}")
+        return None
+    if commit is None:
+        return None
+
+    options = request.dict(exclude=UNKEYED_FIELDS)
+    for field in ("exclude_dirs", "include_patterns", "exclude_patterns"):
+        options[field] = sorted(set(options[field] or []))
+    source = handler.repo_url if handler.is_remote else str(handler.repo_path)
+    material = {"source": source, "commit": commit, "options": options}
+    return hashlib.sha256(
+        json.dumps(material, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+async def submit_scan(request: ScanRequest) -> str:
+    """
+    Queue a scan job, or return the job that already scanned (or is
+    scanning) the same commit with the same options.
+    """
+    queue = get_job_queue()
+    cache_key = None
+    if not request.refresh and ConfigManager.load_config().get("api_result_cache"):
+        cache_key = await scan_cache_key(request)
+    scan_id = await queue.submit("scan", request.dict(), cache_key=cache_key)
+    if cache_key is None:
+        return scan_id
+
+    # A finished job only counts while its artifacts are still stored
+    job = await asyncio.to_thread(get_job_store().get, scan_id)
+    manifest = get_artifact_store().scan_dir(scan_id) / MANIFEST_NAME
+    if job["state"] == DONE and not manifest.is_file():
+        await asyncio.to_thread(get_job_store().forget, scan_id)
+        scan_id = await queue.submit("scan", request.dict(), cache_key=cache_key)
+    return scan_id
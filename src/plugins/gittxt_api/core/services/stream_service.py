@@ -0,0 +1,175 @@
+import asyncio
+import time
+import zlib
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from gittxt.core.logger import Logger
+from gittxt.core.output_builder import OutputBuilder
+from gittxt.core.repository import RepositoryHandler
+from gittxt.utils.cleanup_utils import cleanup_temp_folder
+from plugins.gittxt_api.api.v1.deps import get_admission_controller
+from plugins.gittxt_api.api.v1.models.scan_models import ScanRequest
+from plugins.gittxt_api.core.services.scan_service import build_scanner
+
+logger = Logger.get_logger(__name__)
+
+_END = object()
+
+
+class ChunkQueueSink:
+    """
+    Async binary sink that hands chunks to a consumer through a bounded
+    queue, optionally gzip-compressed.
+
+    Writes are batched up to `chunk_size`; a partial chunk is pushed early
+    when the consumer is idle and `flush_interval` has passed, so a reader
+    sees the first sections while later ones are still being produced.
+    When the reader falls behind, `write` waits: at most `max_chunks`
+    chunks are ever buffered.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 64 * 1024,
+        max_chunks: int = 8,
+        compress: bool = False,
+        flush_interval: float = 0.05,
+    ):
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_chunks)
+        self._buffer = bytearray()
+        self._gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        self._last_push = time.monotonic()
+
+    async def write(self, data: bytes):
+        if self._gzip is not None:
+            data = self._gzip.compress(data)
+        self._buffer += data
+        while len(self._buffer) >= self.chunk_size:
+            await self._push(bytes(self._buffer[: self.chunk_size]))
+            del self._buffer[: self.chunk_size]
+        idle = self.queue.empty()
+        if idle and time.monotonic() - self._last_push >= self.flush_interval:
+            if self._gzip is not None:
+                self._buffer += self._gzip.flush(zlib.Z_SYNC_FLUSH)
+            if self._buffer:
+                await self._push(bytes(self._buffer))
+                self._buffer.clear()
+
+    async def close(self, error: Optional[BaseException] = None):
+        """
+        Flush what is left and end the stream; `error` is re-raised to the reader.
+        """
+        if error is None:
+            if self._gzip is not None:
+                self._buffer += self._gzip.flush()
+            if self._buffer:
+                await self._push(bytes(self._buffer))
+                self._buffer.clear()
+        await self.queue.put(error or _END)
+
+    async def _push(self, chunk: bytes):
+        await self.queue.put(chunk)
+        self._last_push = time.monotonic()
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        while True:
+            item = await self.queue.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+class ReportStream:
+    """
+    One streamed report: `prepare` resolves and scans the repository (so
+    errors still become proper HTTP responses), `body` then formats the
+    report into the response chunk by chunk. Nothing is written to the
+    output directory; a remote clone is removed when the body ends. The
+    stream holds an admission CPU slot from `prepare` until `cleanup`; its
+    chunk buffer is bounded, so it reserves no memory budget.
+    """
+
+    def __init__(self, request: ScanRequest, fmt: str, compress: bool = False):
+        self.request = request
+        self.fmt = fmt
+        self.compress = compress
+        self.handler: Optional[RepositoryHandler] = None
+        self.repo_name = None
+        self._scan = None
+        self._slot_granted: Optional[float] = None
+
+    async def prepare(self):
+        self._slot_granted = await get_admission_controller().acquire_slot()
+        self.handler = RepositoryHandler(
+            source=self.request.repo_path, branch=self.request.branch
+        )
+        try:
+            await self.handler.resolve()
+            local_path, subdir, is_remote, repo_name, branch = (
+                self.handler.get_local_path()
+            )
+            scan_root = Path(local_path) / subdir if subdir else Path(local_path)
+            scanner = build_scanner(
+                self.request, scan_root, source=self.handler.scan_source
+            )
+            textual, non_textual = await scanner.scan_directory()
+        except BaseException:
+            self.cleanup()
+            raise
+        self.repo_name = repo_name
+        self._scan = (scan_root, subdir, is_remote, branch, textual, non_textual)
+
+    async def body(self) -> AsyncIterator[bytes]:
+        scan_root, subdir, is_remote, branch, textual, non_textual = self._scan
+        builder = OutputBuilder(
+            repo_name=self.repo_name,
+            output_dir=None,
+            output_format=self.fmt,
+            repo_url=self.request.repo_path if is_remote else None,
+            branch=branch,
+            subdir=subdir,
+            mode="lite" if self.request.lite else "rich",
+            reproducible=True,
+        )
+        sink = ChunkQueueSink(compress=self.compress)
+
+        async def produce():
+            try:
+                await builder.stream_report(
+                    self.fmt,
+                    sink,
+                    textual,
+                    non_textual,
+                    scan_root,
+                    tree_depth=self.request.tree_depth,
+                    skip_tree=self.request.skip_tree,
+                )
+            except Exception as e:
+                logger.error(f"❌ Streaming {self.repo_name} failed: {e}")
+                await sink.close(e)
+            else:
+                await sink.close()
+
+        producer = asyncio.create_task(produce())
+        try:
+            async for chunk in sink.chunks():
+                yield chunk
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            self.cleanup()
+
+    def cleanup(self):
+        if self._slot_granted is not None:
+            get_admission_controller().release_slot(self._slot_granted)
+            self._slot_granted = None
+        if self.handler is None:
+            return
+        self.handler.close()
+        if self.handler.is_remote:
+            cleanup_temp_folder(Path(self.handler.repo_path))
+        self.handler = None
@@ -1,62 +1,130 @@
+import asyncio
+import hashlib
 import shutil
-import zipfile
 from pathlib import Path
+from typing import Optional, Tuple
 from uuid import uuid4
 
+import aiofiles
 from fastapi import UploadFile
 
 from gittxt.core.scanner import Scanner
+from gittxt.core.sources import ArchiveSource
 from gittxt.core.output_builder import OutputBuilder
 from plugins.gittxt_api.api.v1.models.upload_models import UploadResponse
-from plugins.gittxt_api.api.v1.deps import get_output_dir
+from plugins.gittxt_api.core.services.admission import estimate_memory
+from plugins.gittxt_api.api.v1.deps import (
+    get_admission_controller,
+    get_output_dir,
+    get_artifact_store,
+    get_upload_limits,
+)
+
+
+class UploadTooLarge(ValueError):
+    """
+    Raised when an upload's body exceeds the configured byte limit.
+    """
+
+
+async def spool_upload(
+    file: UploadFile,
+    dest: Path,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = 1024 * 1024,
+) -> Tuple[int, str]:
+    """
+    Copy the upload to `dest` in fixed-size chunks, hashing as it goes.
+    Stops at the first chunk past `max_bytes`. Returns (size, sha256).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    async with aiofiles.open(dest, "wb") as out:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+            digest.update(chunk)
+            await out.write(chunk)
+    return size, digest.hexdigest()
+
 
 async def handle_uploaded_zip(file: UploadFile, lite: bool = False) -> UploadResponse:
     scan_id = str(uuid4())
     output_dir = get_output_dir()
     upload_temp = output_dir / "uploads" / scan_id
-    result_dir = output_dir / scan_id
+    store = get_artifact_store()
+    result_dir = store.staging_dir(scan_id)
+    limits = get_upload_limits()
+    admission = get_admission_controller()
 
     upload_temp.mkdir(parents=True, exist_ok=True)
-    result_dir.mkdir(parents=True, exist_ok=True)
-
-    # Save uploaded zip
-    zip_path = upload_temp / file.filename
-    with zip_path.open("wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    # Extract repo
-    extract_dir = upload_temp / "repo"
-    with zipfile.ZipFile(zip_path, "r") as zf:
-        zf.extractall(extract_dir)
-
-    # Scan and classify
-    repo_name = extract_dir.name
-    scanner = Scanner(root_path=extract_dir)
-    textual_files, non_textual_files = await scanner.scan_directory()
-
-    # Generate outputs
-    mode = "lite" if lite else "rich"
-    builder = OutputBuilder(
-        repo_name=repo_name,
-        output_dir=result_dir,
-        output_format="txt,json",
-        mode=mode
-    )
-    await builder.generate_output(
-        textual_files,
-        non_textual_files,
-        repo_path=extract_dir,
-        create_zip=True
-    )
+    source = None
+    try:
+        # Save uploaded archive (basename only, never a client-supplied path)
+        zip_path = upload_temp / Path(file.filename).name
+        archive_bytes, archive_sha256 = await spool_upload(
+            file, zip_path, limits["max_bytes"], limits["chunk_size"]
+        )
+
+        # Members are read straight from the archive; nothing is extracted.
+        # Entry count and uncompressed size are checked from the listing first.
+        repo_root = upload_temp / "repo"
+        repo_name = repo_root.name
+        source = await asyncio.to_thread(
+            ArchiveSource,
+            zip_path,
+            repo_root,
+            max_entries=limits["max_entries"],
+            max_total_bytes=limits["max_uncompressed_bytes"],
+        )
+
+        async with admission.slot():
+            # Scan and classify
+            scanner = Scanner(root_path=repo_root, source=source)
+            textual_files, non_textual_files = await scanner.scan_directory()
 
-    # Cleanup
-    shutil.rmtree(extract_dir, ignore_errors=True)
-    zip_path.unlink(missing_ok=True)
+            # Generate outputs
+            mode = "lite" if lite else "rich"
+            formats = ("txt", "json")
+            cost = await asyncio.to_thread(
+                estimate_memory, textual_files, formats, lite
+            )
+            builder = OutputBuilder(
+                repo_name=repo_name,
+                output_dir=result_dir,
+                output_format=",".join(formats),
+                mode=mode,
+                reproducible=True,
+                summary_file=True,
+            )
+            async with admission.memory(cost):
+                output_files = await builder.generate_output(
+                    textual_files,
+                    non_textual_files,
+                    repo_path=repo_root,
+                    create_zip=True
+                )
+        metadata = {"repo_name": repo_name, "archive_sha256": archive_sha256}
+        await asyncio.to_thread(store.ingest_scan, scan_id, output_files, metadata)
+    except Exception:
+        store.discard_staging(scan_id)
+        raise
+    finally:
+        # Cleanup
+        if source is not None:
+            source.close()
+        shutil.rmtree(upload_temp, ignore_errors=True)
 
     return UploadResponse(
         scan_id=scan_id,
         repo_name=repo_name,
         num_textual_files=len(textual_files),
         num_non_textual_files=len(non_textual_files),
+        archive_bytes=archive_bytes,
+        archive_sha256=archive_sha256,
         message="Upload & scan completed"
     )
@@ -1,16 +1,46 @@
 import json
+from collections import OrderedDict
 from pathlib import Path
+from typing import Optional
 import aiofiles
 
-async def load_json_summary(json_dir: Path) -> dict:
-    if not json_dir.exists() or not json_dir.is_dir():
-        raise FileNotFoundError("Summary folder not found.")
+SUMMARY_CACHE_SIZE = 128
 
-    files = list(json_dir.glob("*.json"))
-    if not files:
+
+async def load_json_summary(json_file: Path) -> dict:
+    if not json_file.is_file():
         raise FileNotFoundError("No JSON summary file found.")
 
-    file = files[0]
-    async with aiofiles.open(file, "r", encoding="utf-8") as f:
+    async with aiofiles.open(json_file, "r", encoding="utf-8") as f:
         content = await f.read()
         return json.loads(content)
+
+
+class SummaryCache:
+    """
+    In-process LRU of loaded summaries keyed by scan_id. An entry is only
+    returned while the scan still points at the same summary blob.
+    """
+
+    def __init__(self, maxsize: int = SUMMARY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, scan_id: str, digest: str) -> Optional[dict]:
+        cached = self._entries.get(scan_id)
+        if cached is None or cached[0] != digest:
+            return None
+        self._entries.move_to_end(scan_id)
+        return cached[1]
+
+    def put(self, scan_id: str, digest: str, data: dict):
+        self._entries[scan_id] = (digest, data)
+        self._entries.move_to_end(scan_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+summary_cache = SummaryCache()
@@ -1,4 +1,34 @@
-from mangum import Mangum
-from plugins.gittxt_api.main import app
+import os
+from pathlib import Path
 
-handler = Mangum(app)
+# tiktoken reads its BPE files from TIKTOKEN_CACHE_DIR. Ship them in
+# tiktoken_cache/ next to this file (see README-lambda.md) so cold starts
+# never download; otherwise they are fetched once per container into /tmp.
+_BUNDLED_BPE = Path(__file__).resolve().parent / "tiktoken_cache"
+os.environ.setdefault(
+    "TIKTOKEN_CACHE_DIR",
+    str(_BUNDLED_BPE) if _BUNDLED_BPE.is_dir() else "/tmp/tiktoken-cache",
+)
+# Lambda freezes the container once a response is sent, so a queued scan
+# would never finish there: every scan runs inside its own request
+os.environ.setdefault("GITTXT_API_WAIT", "true")
+
+from mangum import Mangum  # noqa: E402
+from plugins.gittxt_api.main import app  # noqa: E402
+from plugins.gittxt_api.core.services.prewarm import prewarm  # noqa: E402
+
+# Mangum would run the app's lifespan around every invocation, stopping the
+# job queue after each response and prewarming again; the queue starts on
+# first use instead, and prewarming happens once below
+_asgi = Mangum(app, lifespan="off")
+
+# Load the encoder and scan path during the init phase, not in the first request
+if os.getenv("GITTXT_PREWARM", "true").lower() == "true":
+    prewarm()
+
+
+def handler(event, context):
+    # Scheduled warm-up pings keep the container alive without entering the app
+    if event.get("warmup") or event.get("source") == "aws.events":
+        return {"warm": True}
+    return _asgi(event, context)
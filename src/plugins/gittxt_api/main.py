@@ -1,6 +1,9 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from gittxt import __version__
+from gittxt.core.config import ConfigManager
 
 # Import all routers
 from plugins.gittxt_api.api.v1.endpoints import (
@@ -11,16 +14,39 @@ from plugins.gittxt_api.api.v1.endpoints import (
     cleanup,
 )
 from plugins.gittxt_api.api.v1.models.response_models import ErrorResponse
+from plugins.gittxt_api.core.services.prewarm import prewarm
+from plugins.gittxt_api.api.v1.deps import (
+    get_admission_controller,
+    get_artifact_collector,
+    get_job_queue,
+    get_upload_limits,
+)
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume jobs left queued or running by a previous process
+    queue = get_job_queue()
+    await queue.start()
+    collector = get_artifact_collector()
+    await collector.start()
+    if ConfigManager.load_config().get("api_prewarm", True):
+        # In the background: the worker accepts requests meanwhile
+        asyncio.get_running_loop().run_in_executor(None, prewarm)
+    yield
+    await collector.stop()
+    await queue.stop()
+
+
 app = FastAPI(
     title="Gittxt API",
     description="Scan GitHub repos and generate AI-ready outputs.",
     version=__version__,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS config — replace with allowed domains in prod
@@ -37,6 +63,17 @@ app.add_middleware(
 def health_check():
     return {"status": "ok", "version": __version__, "message": "Gittxt API is up"}
 
+@app.get("/metrics", tags=["Meta"])
+def metrics():
+    collector = get_artifact_collector()
+    return {
+        "artifacts": {**collector.metrics, "pending_deletions": collector.pending},
+        "admission": {
+            **get_admission_controller().metrics,
+            "queue_depth": get_job_queue().depth,
+        },
+    }
+
 # Register all v1 routes
 v1_prefix = "/v1"
 app.include_router(scan.router, prefix=f"{v1_prefix}/scan")
@@ -45,6 +82,60 @@ app.include_router(summary.router, prefix=f"{v1_prefix}/summary")
 app.include_router(download.router, prefix=f"{v1_prefix}/download")
 app.include_router(cleanup.router, prefix=f"{v1_prefix}/cleanup")
 
+class UploadSizeLimit:
+    """
+    Refuse upload bodies over `upload_max_bytes` (413). A declared
+    Content-Length is checked before anything is read; otherwise (chunked
+    bodies) the bytes are counted as Starlette reads them, and reading stops
+    at the first chunk past the limit, before the multipart parser has
+    spooled the rest.
+    """
+
+    def __init__(self, app, path_prefix: str):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            return await self.app(scope, receive, send)
+        max_bytes = get_upload_limits()["max_bytes"]
+        if max_bytes is None:
+            return await self.app(scope, receive, send)
+
+        length = dict(scope["headers"]).get(b"content-length", b"")
+        if length.isdigit() and int(length) > max_bytes:
+            response = JSONResponse(
+                status_code=413,
+                content=ErrorResponse(
+                    error="Payload Too Large",
+                    detail=f"Upload exceeds {max_bytes} bytes",
+                ).dict(),
+            )
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    # Raised inside body parsing, so the app's handler answers
+                    raise StarletteHTTPException(
+                        status_code=413, detail=f"Upload exceeds {max_bytes} bytes"
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(UploadSizeLimit, path_prefix=f"{v1_prefix}/upload")
+
 # Exception: HTTP
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request, exc: StarletteHTTPException):
@@ -53,7 +144,8 @@ async def http_exception_handler(request, exc: StarletteHTTPException):
         content=ErrorResponse(
             error=exc.detail,
             detail=str(exc.detail),
-        ).dict()
+        ).dict(),
+        headers=getattr(exc, "headers", None),
     )
 
 # Exception: Validation
@@ -0,0 +1,39 @@
+"""
+Fixtures for tests that drive the API in-process with TestClient, kept out
+of conftest.py, whose session fixtures need a live server on port 8000.
+Import the fixtures a test module uses, with the ones they depend on:
+`from app_fixtures import api, app_env`.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from gittxt.utils import summary_utils
+from plugins.gittxt_api import main
+from plugins.gittxt_api.api.v1 import deps
+
+
+class WordEncoder:
+    """
+    Stand-in for the tiktoken encoder: one token per word, no download.
+    """
+
+    def encode(self, text):
+        return text.split()
+
+
+@pytest.fixture
+def app_env(tmp_path, monkeypatch):
+    """
+    Point the API at tmp_path/"out" with fresh process-wide singletons.
+    """
+    monkeypatch.setattr(deps, "get_output_dir", lambda: tmp_path / "out")
+    monkeypatch.setattr(deps, "_job_queue", None)
+    monkeypatch.setattr(deps, "_artifact_collector", None)
+    monkeypatch.setattr(deps, "_admission", None)
+    monkeypatch.setattr(summary_utils, "get_encoder", lambda *_: WordEncoder())
+    return tmp_path / "out"
+
+
+@pytest.fixture
+def api(app_env):
+    with TestClient(main.app) as client:
+        yield client
@@ -15,9 +15,10 @@ def scan_id(event_loop):
 
 async def _get_scan_id():
     async with httpx.AsyncClient() as client:
-        response = await client.post("http://127.0.0.1:8000/v1/scan/", json={
+        response = await client.post("http://127.0.0.1:8000/v1/scan/?wait=true", json={
             "repo_path": "https://github.com/sandy-sp/gittxt",
             "lite": True,
+            "refresh": True,
             "create_zip": True
         })
         assert response.status_code == 201
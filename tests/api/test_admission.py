@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from plugins.gittxt_api import main
+from plugins.gittxt_api.api.v1 import deps
+from plugins.gittxt_api.core.services.admission import (
+    PER_FILE_BYTES,
+    AdmissionController,
+    AdmissionRejected,
+    estimate_memory,
+)
+from app_fixtures import app_env
+
+
+async def _track(admission, cost, log, name):
+    async with admission.slot():
+        async with admission.memory(cost):
+            log.append(("start", name, admission.memory_in_use))
+            await asyncio.sleep(0.01)
+            log.append(("end", name))
+
+
+@pytest.mark.asyncio
+async def test_slots_and_memory_budget_bound_concurrent_scans():
+    admission = AdmissionController(memory_bytes=100, cpu_slots=3)
+    log = []
+    await asyncio.gather(
+        _track(admission, 60, log, "a"),
+        _track(admission, 60, log, "b"),
+        _track(admission, 500, log, "huge"),
+        _track(admission, 10, log, "c"),
+    )
+
+    # Never more than the budget reserved, except a too-big scan running alone
+    assert all(entry[2] <= 100 for entry in log if entry[0] == "start")
+    assert ("start", "huge", 100) in log
+    starts = [entry[1] for entry in log if entry[0] == "start"]
+    assert starts == ["a", "b", "huge", "c"]
+    assert admission.running == admission.memory_in_use == 0
+    assert admission.metrics["admitted"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_its_place_back():
+    admission = AdmissionController(cpu_slots=1)
+    granted = await admission.acquire_slot()
+    waiter = asyncio.create_task(admission.acquire_slot())
+    await asyncio.sleep(0)
+    assert admission.waiting == 1
+
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    admission.release_slot(granted)
+    assert admission.running == 0 and admission.waiting == 0
+
+
+def test_check_rejects_past_max_queue_with_retry_hint():
+    admission = AdmissionController(cpu_slots=2, max_queue=4)
+    admission.check(queued=3)
+    with pytest.raises(AdmissionRejected) as rejected:
+        admission.check(queued=4)
+    assert rejected.value.retry_after >= 1
+    metrics = admission.metrics
+    assert (metrics["checked"], metrics["rejected"]) == (2, 1)
+    assert metrics["rejection_rate"] == 0.5
+
+
+def test_estimate_grows_with_formats_and_skips_content_in_lite(tmp_path):
+    files = []
+    for index in range(3):
+        path = tmp_path / f"f{index}.py"
+        path.write_bytes(b"x" * 1000)
+        files.append(path)
+    lite = estimate_memory(files, ("txt", "json"), lite=True)
+    assert lite == 3000 + 3 * PER_FILE_BYTES
+    assert estimate_memory(files, ("txt",)) < estimate_memory(files, ("txt", "json"))
+
+
+def test_overloaded_api_answers_429_with_retry_after(app_env, tmp_path, monkeypatch):
+    monkeypatch.setattr(deps, "_admission", AdmissionController(max_queue=0))
+
+    with TestClient(main.app) as api:
+        response = api.post("/v1/scan/", json={"repo_path": str(tmp_path)})
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        batch = {"repos": [{"repo_path": str(tmp_path)}]}
+        assert api.post("/v1/scan/batch", json=batch).status_code == 429
+        admission = api.get("/metrics").json()["admission"]
+
+    assert admission["rejected"] == 2
+    assert admission["rejection_rate"] == 1.0
+    assert admission["queue_depth"] == 0
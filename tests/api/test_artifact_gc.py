@@ -0,0 +1,66 @@
+import os
+import time
+import pytest
+from fastapi.testclient import TestClient
+from plugins.gittxt_api import main
+from plugins.gittxt_api.core.services.artifact_gc import ArtifactCollector
+from plugins.gittxt_api.core.services.artifact_store import (
+    LAST_ACCESS_MARKER,
+    ArtifactStore,
+)
+from app_fixtures import app_env
+
+DAY = 24 * 3600
+
+
+def _store_scan(store, scan_id, size, age=0):
+    report = store.staging_dir(scan_id) / "repo.txt"
+    report.write_bytes(scan_id.encode().ljust(size, b"."))
+    store.ingest_scan(scan_id, [report])
+    marker = store.scan_dir(scan_id) / LAST_ACCESS_MARKER
+    marker.touch()
+    stamp = time.time() - age
+    os.utime(marker, (stamp, stamp))
+
+
+@pytest.mark.asyncio
+async def test_sweep_expires_old_scans_then_evicts_lru(tmp_path):
+    store = ArtifactStore(tmp_path / "out")
+    _store_scan(store, "ancient", 1000, age=10 * DAY)
+    _store_scan(store, "old", 1000, age=2 * DAY)
+    _store_scan(store, "recent", 1000, age=DAY)
+    _store_scan(store, "fresh", 1000)
+    store.load_manifest("old")  # an access makes "recent" the LRU scan
+
+    forgotten = []
+    collector = ArtifactCollector(
+        store, max_age=7 * DAY, max_bytes=2500, on_delete=forgotten.append
+    )
+    await collector.sweep()
+    await collector.stop()
+
+    assert sorted(store.scan_ids()) == ["fresh", "old"]
+    assert forgotten == ["ancient", "recent"]
+    metrics = collector.metrics
+    assert (metrics["expired"], metrics["evicted"]) == (1, 1)
+    assert metrics["bytes_reclaimed"] == metrics["stored_bytes"] == 2000
+
+
+def test_cleanup_endpoint_only_queues_the_deletion(app_env):
+    store = ArtifactStore(app_env)
+    _store_scan(store, "doomed", 600)
+
+    with TestClient(main.app) as api:
+        assert api.delete("/v1/cleanup/missing").status_code == 404
+        response = api.delete("/v1/cleanup/doomed")
+        assert response.status_code == 202
+        assert response.json()["data"]["state"] == "queued"
+
+        deadline = time.monotonic() + 5
+        while store.has_scan("doomed") and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not store.has_scan("doomed")
+        artifacts = api.get("/metrics").json()["artifacts"]
+    assert artifacts["requested"] == 1
+    assert artifacts["bytes_reclaimed"] == 600
+    assert artifacts["pending_deletions"] == 0
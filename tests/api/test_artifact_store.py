@@ -0,0 +1,57 @@
+import pytest
+from gittxt.core.output_builder import OutputBuilder
+from gittxt.core.scanner import Scanner
+from plugins.gittxt_api.core.services.artifact_store import ArtifactStore
+
+
+async def _build_reports(repo, out_dir):
+    scanner = Scanner(root_path=repo)
+    textual_files, non_textual_files = await scanner.scan_directory()
+    builder = OutputBuilder(
+        repo_name="repo",
+        output_dir=out_dir,
+        output_format="txt,json,md",
+        mode="rich",
+        reproducible=True,
+    )
+    return await builder.generate_output(
+        textual_files, non_textual_files, repo_path=repo, create_zip=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_scans_share_blobs_and_cleanup_reclaims(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("# Sample\n", encoding="utf-8")
+    (repo / "app.py").write_text("print('hi')\n", encoding="utf-8")
+    (repo / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+
+    store = ArtifactStore(tmp_path / "out")
+    manifests = []
+    for scan_id in ("scan-a", "scan-b"):
+        outputs = await _build_reports(repo, store.staging_dir(scan_id))
+        manifests.append(store.ingest_scan(scan_id, outputs))
+
+    first, second = (m["artifacts"] for m in manifests)
+    assert set(first) == {"txt", "json", "md", "zip"}
+    assert {k: v["sha256"] for k, v in first.items()} == {
+        k: v["sha256"] for k, v in second.items()
+    }
+    blobs = [p for p in (tmp_path / "out" / "blobs").rglob("*") if p.is_file()]
+    assert len(blobs) == 4
+    assert not (tmp_path / "out" / ".staging" / "scan-a").exists()
+
+    blob, entry = store.resolve("scan-b", "txt")
+    assert entry["name"] == "repo.txt"
+    assert "app.py" in blob.read_text(encoding="utf-8")
+
+    assert store.delete_scan("scan-a") == 0
+    assert store.refcount(first["txt"]["sha256"]) == 1
+    assert blob.exists()
+
+    reclaimed = store.delete_scan("scan-b")
+    assert reclaimed == sum(v["size"] for v in second.values())
+    assert not blob.exists()
+    with pytest.raises(FileNotFoundError):
+        store.resolve("scan-b", "txt")
@@ -0,0 +1,92 @@
+import gzip
+import pytest
+from plugins.gittxt_api.api.v1 import deps
+from plugins.gittxt_api.core.services.download_service import (
+    RangeNotSatisfiable,
+    choose_encoding,
+    parse_range,
+)
+from app_fixtures import api, app_env
+
+
+@pytest.fixture
+def served_scan_id(api, tmp_path):
+    repo = tmp_path / "served"
+    repo.mkdir()
+    for i in range(10):
+        (repo / f"mod{i}.py").write_text(f"VALUE = {i}\n" * 100, encoding="utf-8")
+    response = api.post(
+        "/v1/scan/?wait=true", json={"repo_path": str(repo), "refresh": True}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["data"]["scan_id"]
+
+
+def _get(api, scan_id, **headers):
+    return api.get(
+        f"/v1/download/{scan_id}?format=txt",
+        headers={"Accept-Encoding": "identity", **headers},
+    )
+
+
+def test_etag_and_if_none_match(api, served_scan_id):
+    full = _get(api, served_scan_id)
+    assert full.status_code == 200
+    etag = full.headers["etag"]
+    store = deps.get_artifact_store()
+    _, entry = store.resolve(served_scan_id, "txt")
+    assert etag == f'"{entry["sha256"]}"'
+
+    cached = _get(api, served_scan_id, **{"If-None-Match": f'"other", W/{etag}'})
+    assert cached.status_code == 304 and cached.content == b""
+    assert _get(api, served_scan_id, **{"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_range_requests(api, served_scan_id):
+    body = _get(api, served_scan_id).content
+
+    part = _get(api, served_scan_id, Range="bytes=10-19")
+    assert part.status_code == 206
+    assert part.content == body[10:20]
+    assert part.headers["content-range"] == f"bytes 10-19/{len(body)}"
+
+    assert _get(api, served_scan_id, Range="bytes=-5").content == body[-5:]
+    tail = _get(api, served_scan_id, Range=f"bytes={len(body) - 3}-")
+    assert tail.content == body[-3:]
+
+    stale = _get(api, served_scan_id, Range="bytes=0-4", **{"If-Range": '"stale"'})
+    assert stale.status_code == 200 and stale.content == body
+
+    missed = _get(api, served_scan_id, Range=f"bytes={len(body)}-")
+    assert missed.status_code == 416
+    assert missed.headers["content-range"] == f"bytes */{len(body)}"
+
+
+def test_precompressed_gzip_variant(api, served_scan_id):
+    plain = _get(api, served_scan_id)
+    response = api.get(
+        f"/v1/download/{served_scan_id}?format=txt",
+        headers={"Accept-Encoding": "br;q=1, gzip;q=0.5"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] != plain.headers["etag"]
+    assert int(response.headers["content-length"]) < len(plain.content)
+    assert response.content == plain.content
+
+    store = deps.get_artifact_store()
+    _, entry = store.resolve(served_scan_id, "txt")
+    variant = store.encoded_path(entry["sha256"], "gzip")
+    assert gzip.decompress(variant.read_bytes()) == plain.content
+
+    store.delete_scan(served_scan_id)
+    assert not variant.exists()
+
+
+def test_header_parsing():
+    assert choose_encoding("gzip, zstd;q=0", ["zstd", "gzip"]) == "gzip"
+    assert choose_encoding("*", ["zstd", "gzip"]) == "zstd"
+    assert choose_encoding(None, ["gzip"]) is None
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    assert parse_range("bytes=5-100", 10) == (5, 9)
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range("bytes=7-3", 10)
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from gittxt.core.events import ScanEvents
+from plugins.gittxt_api.core.services import batch_service
+from plugins.gittxt_api.core.services.job_store import DONE, FAILED
+from app_fixtures import api, app_env
+
+
+def _repo(tmp_path, name, files):
+    repo = tmp_path / name
+    repo.mkdir()
+    for index in range(files):
+        (repo / f"mod{index}.py").write_text(f"x = {index}\n", encoding="utf-8")
+    return str(repo)
+
+
+def test_batch_reports_each_repo_and_aggregate_stats(api, tmp_path):
+    repos = [
+        {"repo_path": _repo(tmp_path, "alpha", 2)},
+        {"repo_path": _repo(tmp_path, "beta", 3), "lite": True},
+        {"repo_path": str(tmp_path / "missing")},
+    ]
+    response = api.post("/v1/scan/batch?wait=true", json={"repos": repos})
+    assert response.status_code == 201, response.text
+    data = response.json()["data"]
+
+    results = data["results"]
+    assert [r["state"] for r in results] == [DONE, DONE, FAILED]
+    assert [r["scan_id"] for r in results] == [
+        f"{data['scan_id']}-{index}" for index in range(3)
+    ]
+    assert results[1]["result"]["repo_name"] == "beta"
+    assert results[2]["error"]
+
+    stats = data["stats"]
+    assert (stats["repos"], stats["succeeded"], stats["failed"]) == (3, 2, 1)
+    assert stats["files"] == 5
+    assert stats["bytes_read"] > 0 and stats["files_per_sec"] > 0
+
+    # Each repo is an ordinary stored scan; the batch is one job
+    first = results[0]["scan_id"]
+    assert api.get(f"/v1/download/{first}", params={"format": "txt"}).status_code == 200
+    job = api.get(f"/v1/scan/{data['scan_id']}").json()["data"]
+    assert job["state"] == DONE and job["kind"] == "batch"
+
+
+def test_batch_submit_returns_at_once_and_rejects_bad_batches(api, tmp_path):
+    response = api.post(
+        "/v1/scan/batch", json={"repos": [{"repo_path": _repo(tmp_path, "a", 1)}]}
+    )
+    assert response.status_code == 202
+    assert response.json()["data"]["status_url"].startswith("/v1/scan/")
+
+    assert api.post("/v1/scan/batch", json={"repos": []}).status_code == 422
+    too_many = [{"repo_path": "x"}] * 101
+    assert api.post("/v1/scan/batch", json={"repos": too_many}).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_repos_share_a_mirror_cache_under_bounded_concurrency(monkeypatch):
+    running, peak, caches = 0, 0, set()
+
+    async def fake_scan(request, scan_id, events, mirror_cache):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        caches.add(id(mirror_cache))
+        events.add("bytes_read", 10)
+        await asyncio.sleep(0.01)
+        running -= 1
+        raise RuntimeError("not a repo")
+
+    monkeypatch.setattr(batch_service, "perform_scan", fake_scan)
+    monkeypatch.setattr(batch_service, "prewarm", lambda: {})
+    payload = {"repos": [{"repo_path": str(i)} for i in range(6)], "concurrency": 2}
+    events = ScanEvents()
+    result = await batch_service.run_batch_job("b", payload, events)
+
+    assert peak == 2
+    assert len(caches) == 1
+    assert events.counters["bytes_read"] == 60
+    assert result["stats"]["failed"] == 6
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app_fixtures import api, app_env
+from git_repos import git, make_git_repo
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    return make_git_repo(
+        tmp_path / "cached", {"app.py": "print('v1')\n"}, message="v1"
+    )
+
+
+def _scan(api, payload):
+    response = api.post("/v1/scan/?wait=true", json=payload)
+    assert response.status_code in (200, 201), response.text
+    return response.status_code, response.json()["data"]["scan_id"]
+
+
+def test_same_commit_and_options_reuse_the_finished_scan(api, git_repo):
+    payload = {"repo_path": str(git_repo)}
+    status, first = _scan(api, payload)
+    assert status == 201
+    assert _scan(api, payload) == (200, first)
+    assert _scan(api, {**payload, "exclude_dirs": []}) == (200, first)
+
+    assert _scan(api, {**payload, "lite": True})[1] != first
+    assert _scan(api, {**payload, "refresh": True})[1] != first
+
+    (git_repo / "app.py").write_text("print('v2')\n", encoding="utf-8")
+    assert _scan(api, payload)[1] != first  # dirty tree: never cached
+    git(git_repo, "commit", "--quiet", "-am", "v2")
+    status, second = _scan(api, payload)
+    assert status == 201 and second != first
+    assert _scan(api, payload) == (200, second)
+
+
+def test_concurrent_requests_share_one_job(api, git_repo):
+    payload = {"repo_path": str(git_repo)}
+
+    def submit(_):
+        return api.post("/v1/scan/", json=payload).json()["data"]["scan_id"]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        ids = set(pool.map(submit, range(8)))
+    assert len(ids) == 1
+    (scan_id,) = ids
+    assert _scan(api, payload)[1] == scan_id
+
+
+def test_cleanup_drops_the_cached_result(api, git_repo):
+    payload = {"repo_path": str(git_repo)}
+    _, first = _scan(api, payload)
+    assert api.delete(f"/v1/cleanup/{first}").status_code == 202
+    status, again = _scan(api, payload)
+    assert status == 201 and again != first
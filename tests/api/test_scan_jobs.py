@@ -0,0 +1,211 @@
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+import zipfile
+import pytest
+from plugins.gittxt_api.api.v1 import deps
+from plugins.gittxt_api.core.services.job_queue import ScanJobQueue
+from plugins.gittxt_api.core.services.job_store import DONE, FAILED, JobStore
+from app_fixtures import api, app_env
+
+
+@pytest.fixture
+def local_repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "README.md").write_text("# Jobs\n", encoding="utf-8")
+    (repo / "app.py").write_text("print('queued')\n", encoding="utf-8")
+    return repo
+
+
+def test_submit_returns_at_once_and_status_reports_stages(api, local_repo):
+    response = api.post("/v1/scan/", json={"repo_path": str(local_repo)})
+    assert response.status_code == 202
+    scan_id = response.json()["data"]["scan_id"]
+
+    for _ in range(200):
+        job = api.get(f"/v1/scan/{scan_id}").json()["data"]
+        if job["state"] in (DONE, FAILED):
+            break
+        time.sleep(0.05)
+
+    assert job["state"] == DONE, job["error"]
+    stages = [s["name"] for s in job["stages"]]
+    assert stages == ["clone", "walk", "classify", "tokenize", "format"]
+    assert all(s["duration"] is not None for s in job["stages"])
+    assert job["result"]["num_textual_files"] == 2
+    download = api.get(f"/v1/download/{scan_id}", params={"format": "txt"})
+    assert download.status_code == 200
+
+
+def test_wait_returns_result_and_unknown_id_is_404(api, local_repo):
+    response = api.post("/v1/scan/?wait=true", json={"repo_path": str(local_repo)})
+    assert response.status_code == 201
+    assert response.json()["data"]["repo_name"] == "repo"
+
+    missing = {"repo_path": str(local_repo / "nope")}
+    failed = api.post("/v1/scan/?wait=true", json=missing)
+    assert failed.status_code == 500
+    assert api.get("/v1/scan/not-a-scan").status_code == 404
+
+
+def test_always_wait_runs_the_scan_within_the_request(api, local_repo, monkeypatch):
+    monkeypatch.setenv("GITTXT_API_WAIT", "true")
+    response = api.post("/v1/scan/", json={"repo_path": str(local_repo)})
+    assert response.status_code == 201
+    assert response.json()["data"]["num_textual_files"] == 2
+
+
+def test_archive_scan_reads_the_archive_members(api, local_repo, tmp_path):
+    archive = tmp_path / "packed.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for path in local_repo.iterdir():
+            zf.write(path, f"packed/{path.name}")
+
+    response = api.post("/v1/scan/?wait=true", json={"repo_path": str(archive)})
+    assert response.status_code == 201, response.text
+    assert response.json()["data"]["num_textual_files"] == 2
+    scan_id = response.json()["data"]["scan_id"]
+    report = api.get(f"/v1/download/{scan_id}", params={"format": "txt"}).text
+    assert "print('queued')" in report
+
+
+def test_wait_on_a_job_removed_meanwhile_is_410(api, local_repo, monkeypatch):
+    queue = deps.get_job_queue()
+
+    async def vanished(scan_id):
+        return None
+
+    monkeypatch.setattr(queue, "wait", vanished)
+    response = api.post("/v1/scan/?wait=true", json={"repo_path": str(local_repo)})
+    assert response.status_code == 410
+    batch = {"repos": [{"repo_path": str(local_repo)}]}
+    assert api.post("/v1/scan/batch?wait=true", json=batch).status_code == 410
+
+
+@pytest.mark.asyncio
+async def test_workers_are_bounded_and_unfinished_jobs_survive_restart(tmp_path):
+    store = JobStore(tmp_path)
+    running = 0
+    peak = 0
+    release = asyncio.Event()
+
+    async def handler(scan_id, payload, events):
+        nonlocal running, peak
+        events.stage("work")
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+        return {"n": payload["n"]}
+
+    queue = ScanJobQueue(store, {"scan": handler}, concurrency=2)
+    ids = [await queue.submit("scan", {"n": n}) for n in range(5)]
+    await asyncio.sleep(0.1)
+    assert peak == 2
+    await queue.stop()  # two jobs interrupted mid-run, three never started
+    assert [store.get(i)["state"] for i in ids].count("running") == 2
+
+    running = 0
+    release.set()
+    restarted = ScanJobQueue(JobStore(tmp_path), {"scan": handler}, concurrency=2)
+    await restarted.start()
+    jobs = [await restarted.wait(scan_id) for scan_id in ids]
+    await restarted.stop()
+
+    assert [job["state"] for job in jobs] == [DONE] * 5
+    assert [job["result"]["n"] for job in jobs] == list(range(5))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_sharing_a_store_never_run_a_job_twice(tmp_path):
+    runs = []
+
+    async def handler(scan_id, payload, events):
+        runs.append(scan_id)
+        await asyncio.sleep(0.01)
+        return {}
+
+    # Jobs of a worker process that died: leases long expired
+    dead = JobStore(tmp_path)
+    orphans = [
+        dead.create(f"orphan-{n}", "scan", {}, owner="dead", lease_until=0)[0]
+        for n in range(2)
+    ]
+    assert dead.claim(orphans[0], "dead", 0)
+
+    first = ScanJobQueue(JobStore(tmp_path), {"scan": handler}, concurrency=2)
+    second = ScanJobQueue(JobStore(tmp_path), {"scan": handler}, concurrency=2)
+    await first.start()
+    ids = [await first.submit("scan", {"n": n}) for n in range(4)]
+    await second.start()  # must not take first's live jobs
+    jobs = [await first.wait(scan_id) for scan_id in ids + orphans]
+    await asyncio.gather(first.stop(), second.stop())
+
+    assert [job["state"] for job in jobs] == [DONE] * 6
+    assert sorted(runs) == sorted(ids + orphans)
+
+
+class FlakyStore(JobStore):
+    """
+    Fails to claim the first job, as a locked database would.
+    """
+
+    failures = 1
+
+    def claim(self, *args):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().claim(*args)
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_store_errors_and_writes_stages_off_loop(tmp_path):
+    store = FlakyStore(tmp_path)
+    writer_threads = []
+    record_stages = store.record_stages
+
+    def recording(scan_id, transitions):
+        writer_threads.append(threading.get_ident())
+        record_stages(scan_id, transitions)
+
+    store.record_stages = recording
+
+    async def handler(scan_id, payload, events):
+        for stage in ("walk", "format"):
+            events.stage(stage)
+        return {"n": payload["n"]}
+
+    queue = ScanJobQueue(store, {"scan": handler}, concurrency=1)
+    first = await queue.submit("scan", {"n": 1})
+    second = await queue.submit("scan", {"n": 2})
+    failed, done = await queue.wait(first), await queue.wait(second)
+    await queue.stop()
+
+    assert failed["state"] == FAILED and "locked" in failed["error"]
+    assert done["state"] == DONE
+    assert [s["name"] for s in done["stages"]] == ["walk", "format"]
+    assert writer_threads and threading.get_ident() not in writer_threads
+
+
+def test_events_stream_ends_with_final_state(api, local_repo):
+    payload = {"repo_path": str(local_repo), "create_zip": True}
+    scan_id = api.post("/v1/scan/", json=payload).json()["data"]["scan_id"]
+
+    with api.stream("GET", f"/v1/scan/{scan_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    events = [
+        (block.split("\n")[0][len("event: "):], json.loads(block.split("data: ")[1]))
+        for block in body.strip().split("\n\n")
+        if block.startswith("event:")
+    ]
+    assert "classify" in [data.get("stage") for kind, data in events if kind == "stage"]
+    kind, final = events[-1]
+    assert (kind, final["state"]) == ("end", DONE)
+    assert api.get("/v1/scan/unknown/events").status_code == 404
@@ -0,0 +1,64 @@
+import asyncio
+import gzip
+import json
+import pytest
+from plugins.gittxt_api.core.services.stream_service import ChunkQueueSink
+from app_fixtures import api, app_env
+
+
+@pytest.fixture
+def sample_repo(tmp_path):
+    repo = tmp_path / "streamed"
+    (repo / "src").mkdir(parents=True)
+    (repo / "README.md").write_text("# streamed demo\n", encoding="utf-8")
+    for i in range(20):
+        (repo / "src" / f"mod{i}.py").write_text(f"VALUE = {i}\n" * 50)
+    return repo
+
+
+@pytest.mark.parametrize("fmt", ["txt", "json"])
+def test_stream_matches_the_queued_scan_artifact(api, sample_repo, tmp_path, fmt):
+    payload = {"repo_path": str(sample_repo)}
+    response = api.post(f"/v1/scan/stream?format={fmt}", json=payload)
+    assert response.status_code == 200, response.text
+    assert 'filename="streamed.' in response.headers["content-disposition"]
+    out = tmp_path / "out"
+    written = [p.name for p in out.rglob("*") if p.is_file()]
+    assert all(name.startswith(("jobs.db", "artifacts.db")) for name in written)
+
+    scan = api.post("/v1/scan/?wait=true", json={**payload, "refresh": True})
+    scan_id = scan.json()["data"]["scan_id"]
+    artifact = api.get(f"/v1/download/{scan_id}?format={fmt}")
+    assert response.content == artifact.content
+    if fmt == "json":
+        assert len(json.loads(response.content)["files"]) == 21
+
+
+def test_stream_gzip_and_format_validation(api, sample_repo):
+    payload = {"repo_path": str(sample_repo)}
+    with api.stream("POST", "/v1/scan/stream?gzip=true", json=payload) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+    assert b"mod19.py" in gzip.decompress(raw)
+
+    assert api.post("/v1/scan/stream?format=zip", json=payload).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_sink_buffers_at_most_max_chunks():
+    sink = ChunkQueueSink(chunk_size=4, max_chunks=2, flush_interval=60)
+    writer = asyncio.create_task(sink.write(b"x" * 40))
+    await asyncio.sleep(0.05)
+    assert not writer.done() and sink.queue.qsize() == 2
+
+    received = []
+
+    async def read():
+        async for chunk in sink.chunks():
+            received.append(chunk)
+
+    reader = asyncio.create_task(read())
+    await writer
+    await sink.close()
+    await reader
+    assert b"".join(received) == b"x" * 40
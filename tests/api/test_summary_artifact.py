@@ -0,0 +1,73 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from plugins.gittxt_api import main
+from plugins.gittxt_api.api.v1 import deps
+from plugins.gittxt_api.api.v1.endpoints import summary as summary_endpoint
+from plugins.gittxt_api.core.utils.json_utils import SummaryCache
+from app_fixtures import app_env
+
+
+@pytest.fixture
+def api(app_env, monkeypatch):
+    monkeypatch.setattr(summary_endpoint, "summary_cache", SummaryCache())
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def summarized_scan_id(api, tmp_path):
+    repo = tmp_path / "summarized"
+    (repo / "src").mkdir(parents=True)
+    (repo / "README.md").write_text("# summarized\n", encoding="utf-8")
+    (repo / "src" / "app.py").write_text("print('a b c')\n" * 2000, encoding="utf-8")
+    (repo / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    response = api.post(
+        "/v1/scan/?wait=true", json={"repo_path": str(repo), "refresh": True}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["data"]["scan_id"]
+
+
+def test_summary_is_the_report_without_content(api, summarized_scan_id):
+    store = deps.get_artifact_store()
+    summary_path, entry = store.resolve(summarized_scan_id, "summary")
+    report_path, report = store.resolve(summarized_scan_id, "json")
+    assert entry["size"] * 5 < report["size"]
+
+    full = json.loads(report_path.read_text(encoding="utf-8"))
+    for item in full["files"]:
+        del item["content"]
+    assert json.loads(summary_path.read_text(encoding="utf-8")) == full
+
+    response = api.get(f"/v1/summary/{summarized_scan_id}")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["summary"]["total_files"] == 3
+    assert [f["path"] for f in data["files"]] == ["README.md", "src/app.py"]
+
+
+def test_summary_is_cached_per_scan(api, summarized_scan_id, monkeypatch):
+    loads = []
+    real_load = summary_endpoint.load_json_summary
+
+    async def counting_load(path):
+        loads.append(path)
+        return await real_load(path)
+
+    monkeypatch.setattr(summary_endpoint, "load_json_summary", counting_load)
+    first = api.get(f"/v1/summary/{summarized_scan_id}").json()["data"]
+    assert api.get(f"/v1/summary/{summarized_scan_id}").json()["data"] == first
+    assert len(loads) == 1
+    assert api.get("/v1/summary/missing").status_code == 404
+
+
+def test_lru_drops_the_oldest_scan():
+    cache = SummaryCache(maxsize=2)
+    cache.put("a", "1", {"a": 1})
+    cache.put("b", "2", {"b": 2})
+    assert cache.get("a", "1") == {"a": 1}
+    cache.put("c", "3", {"c": 3})
+    assert cache.get("b", "2") is None
+    assert cache.get("a", "2") is None  # stale blob
+    assert len(cache) == 2
@@ -0,0 +1,125 @@
+import io
+import hashlib
+import zipfile
+import pytest
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from gittxt.core.sources import ArchiveLimitError
+from plugins.gittxt_api import main
+from plugins.gittxt_api.api.v1.endpoints import upload as upload_endpoint
+from plugins.gittxt_api.core.services import upload_service
+from plugins.gittxt_api.core.services.artifact_store import ArtifactStore
+
+
+LIMITS = {
+    "max_bytes": None,
+    "max_uncompressed_bytes": None,
+    "max_entries": None,
+    "chunk_size": 64,
+}
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("README.md", "# Uploaded\n")
+        zf.writestr("src/app.py", "print('uploaded')\n")
+        zf.writestr("logo.png", b"\x89PNG\r\n\x1a\n\x00")
+    return buffer.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_upload_scans_archive_without_extracting(tmp_path, monkeypatch):
+    store = ArtifactStore(tmp_path / "out")
+    monkeypatch.setattr(upload_service, "get_output_dir", lambda: tmp_path / "out")
+    monkeypatch.setattr(upload_service, "get_artifact_store", lambda: store)
+    monkeypatch.setattr(upload_service, "get_upload_limits", lambda: LIMITS)
+
+    def no_extract(*args, **kwargs):
+        raise AssertionError("uploads must not be extracted")
+
+    monkeypatch.setattr(zipfile.ZipFile, "extractall", no_extract)
+
+    data = _zip_bytes()
+    upload = UploadFile(file=io.BytesIO(data), filename="../../repo.zip")
+    result = await upload_service.handle_uploaded_zip(upload)
+
+    assert (result.num_textual_files, result.num_non_textual_files) == (2, 1)
+    assert result.archive_bytes == len(data)
+    assert result.archive_sha256 == hashlib.sha256(data).hexdigest()
+    manifest = store.load_manifest(result.scan_id)
+    assert manifest["archive_sha256"] == result.archive_sha256
+    blob, _entry = store.resolve(result.scan_id, "txt")
+    assert "print('uploaded')" in blob.read_text(encoding="utf-8")
+    assert not (tmp_path / "out" / "uploads" / result.scan_id).exists()
+    assert not (tmp_path / "repo.zip").exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "limit, error",
+    [
+        ({"max_bytes": 100}, upload_service.UploadTooLarge),
+        ({"max_entries": 2}, ArchiveLimitError),
+        ({"max_uncompressed_bytes": 20}, ArchiveLimitError),
+    ],
+    ids=["body", "entries", "uncompressed"],
+)
+async def test_upload_over_limit_is_rejected_before_scanning(
+    tmp_path, monkeypatch, limit, error
+):
+    store = ArtifactStore(tmp_path / "out")
+    monkeypatch.setattr(upload_service, "get_output_dir", lambda: tmp_path / "out")
+    monkeypatch.setattr(upload_service, "get_artifact_store", lambda: store)
+    limits = {**LIMITS, **limit}
+    monkeypatch.setattr(upload_service, "get_upload_limits", lambda: limits)
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("rejected uploads must not be scanned")
+
+    monkeypatch.setattr(upload_service.Scanner, "scan_directory", no_scan)
+
+    upload = UploadFile(file=io.BytesIO(_zip_bytes()), filename="repo.zip")
+    with pytest.raises(error):
+        await upload_service.handle_uploaded_zip(upload)
+    assert not any((tmp_path / "out" / "uploads").iterdir())
+    assert not any((tmp_path / "out" / ".staging").iterdir())
+
+
+def test_content_length_over_limit_gets_413(monkeypatch):
+    monkeypatch.setattr(main, "get_upload_limits", lambda: {**LIMITS, "max_bytes": 10})
+    client = TestClient(main.app)
+    response = client.post(
+        "/v1/upload/", files={"file": ("repo.zip", _zip_bytes(), "application/zip")}
+    )
+    assert response.status_code == 413
+
+
+def test_chunked_upload_over_limit_gets_413(monkeypatch):
+    monkeypatch.setattr(main, "get_upload_limits", lambda: {**LIMITS, "max_bytes": 10})
+    boundary = "gittxt-boundary"
+    head = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; "
+        'filename="repo.zip"\r\nContent-Type: application/zip\r\n\r\n'
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    def body():
+        # A generator body goes out chunked, with no Content-Length
+        yield head
+        yield _zip_bytes()
+        yield tail
+
+    async def not_reached(*args, **kwargs):
+        raise AssertionError("oversized bodies must not reach the endpoint")
+
+    monkeypatch.setattr(upload_endpoint, "handle_uploaded_zip", not_reached)
+
+    client = TestClient(main.app)
+    response = client.post(
+        "/v1/upload/",
+        content=body(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    assert response.status_code == 413
+    assert "exceeds 10 bytes" in response.text
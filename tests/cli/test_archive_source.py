@@ -0,0 +1,99 @@
+import io
+import tarfile
+import zipfile
+import subprocess
+import pytest
+from pathlib import Path
+from gittxt.core.scanner import Scanner
+from gittxt.core.sources import ArchiveLimitError, ArchiveSource, VirtualFile
+from gittxt.core.repository import RepositoryHandler
+
+MEMBERS = {
+    "project-main/README.md": b"# project\n",
+    "project-main/src/app.py": b"print('from archive')\n",
+    "project-main/logo.png": b"\x89PNG\x00\x00binary",
+}
+
+
+def _make_zip(path: Path) -> Path:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("project-main/", "")
+        for name, data in MEMBERS.items():
+            zf.writestr(name, data)
+        zf.writestr("../evil.py", "print('escape')\n")
+    return path
+
+
+def _make_tar(path: Path) -> Path:
+    with tarfile.open(path, "w:gz") as tf:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo("project-main/link.py")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "/etc/passwd"
+        tf.addfile(link)
+    return path
+
+
+@pytest.mark.parametrize("make", [_make_zip, _make_tar], ids=["zip", "tar.gz"])
+def test_lists_members_without_extracting(tmp_path, make):
+    archive = make(tmp_path / f"project{'.zip' if make is _make_zip else '.tar.gz'}")
+    with ArchiveSource(archive, strip_root=True) as source:
+        files = {f.relative_to(source.root).as_posix(): f for f in source.iter_files()}
+        assert set(files) == {"README.md", "src/app.py", "logo.png"}
+        assert source.top_level == "project-main"
+        app = files["src/app.py"]
+        assert isinstance(app, VirtualFile)
+        assert app.stat().st_size == len(MEMBERS["project-main/src/app.py"])
+        assert app.read_text() == "print('from archive')\n"
+        assert app.open().read(5) == b"print"
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [archive.name]
+
+
+@pytest.mark.parametrize("make", [_make_zip, _make_tar], ids=["zip", "tar.gz"])
+@pytest.mark.parametrize(
+    "limits", [{"max_entries": 2}, {"max_total_bytes": 16}], ids=["entries", "bytes"]
+)
+def test_listing_limits_reject_archive(tmp_path, make, limits):
+    archive = make(tmp_path / f"project{'.zip' if make is _make_zip else '.tar.gz'}")
+    with pytest.raises(ArchiveLimitError):
+        ArchiveSource(archive, **limits)
+    with ArchiveSource(archive, max_entries=10, max_total_bytes=1024) as source:
+        assert len(list(source.iter_files())) == 3
+
+
+@pytest.mark.asyncio
+async def test_scanner_classifies_archive_members(tmp_path):
+    archive = _make_zip(tmp_path / "project.zip")
+    handler = RepositoryHandler(archive)
+    root = await handler.resolve()
+    try:
+        repo_path, _, is_remote, repo_name, _ = handler.get_local_path()
+        assert (repo_name, is_remote) == ("project", False)
+        scanner = Scanner(root_path=Path(repo_path), source=handler.scan_source)
+        textual, non_textual = await scanner.scan_directory()
+        assert sorted(f.name for f in textual) == ["README.md", "app.py"]
+        assert [f.name for f in non_textual] == ["logo.png"]
+        assert not root.exists()
+    finally:
+        handler.close()
+
+
+def test_cli_scans_archive(tmp_path):
+    archive = _make_tar(tmp_path / "project.tar.gz")
+    output_dir = tmp_path / "out"
+    result = subprocess.run(
+        ["gittxt", "scan", str(archive), "-o", str(output_dir), "--zip"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    report = (output_dir / "txt" / "project.txt").read_text(encoding="utf-8")
+    assert "print('from archive')" in report
+    assert "escape" not in report
+    with zipfile.ZipFile(next((output_dir / "zip").glob("*.zip"))) as bundle:
+        assert any(name.endswith("logo.png") for name in bundle.namelist())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out", "project.tar.gz"]
@@ -0,0 +1,144 @@
+import time
+import asyncio
+import pytest
+from pathlib import Path
+from gittxt.core import repository
+from gittxt.core.repository import RepositoryHandler
+from gittxt.utils import git_utils
+from gittxt.utils.git_utils import remote_commit, remote_default_branch, run_git_async
+from git_repos import git, make_git_repo
+
+
+# A git command that just sleeps, via a shell alias
+SLOW = ("-c", "alias.slow=!sleep 5", "slow")
+
+
+def _make_remote(path: Path) -> str:
+    make_git_repo(path, {f"f{i}.txt": f"file {i}\n" * 50 for i in range(20)})
+    return f"file://{path}"
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_git():
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="timed out"):
+        await run_git_async(*SLOW, timeout=0.2)
+    assert time.monotonic() - started < 2
+
+
+@pytest.mark.asyncio
+async def test_cancellation_propagates():
+    task = asyncio.create_task(run_git_async(*SLOW))
+    await asyncio.sleep(0.2)
+    task.cancel()
+    started = time.monotonic()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert time.monotonic() - started < 2
+
+
+@pytest.mark.asyncio
+async def test_clone_reports_progress_without_blocking_loop(tmp_path):
+    url = _make_remote(tmp_path / "remote")
+    progress = []
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticking = asyncio.create_task(ticker())
+    handlers = [
+        RepositoryHandler(
+            url,
+            branch="trunk",
+            cache_dir=tmp_path / f"w{i}",
+            mirror_cache=False,
+            on_progress=lambda phase, pct: progress.append((phase, pct)),
+        )
+        for i in range(3)
+    ]
+    paths = await asyncio.gather(*(h.resolve() for h in handlers))
+    ticking.cancel()
+
+    assert all((p / "f0.txt").exists() for p in paths)
+    assert ticks > 3
+    assert any(phase == "Receiving objects" for phase, _ in progress)
+
+
+@pytest.mark.asyncio
+async def test_default_branch_is_resolved_once_without_retry(tmp_path, monkeypatch):
+    url = _make_remote(tmp_path / "remote")
+    calls = []
+
+    async def recording(*args, **kwargs):
+        calls.append(args)
+        return await run_git_async(*args, **kwargs)
+
+    monkeypatch.setattr(repository, "run_git_async", recording)
+    monkeypatch.setattr(git_utils, "_default_branches", {})
+    handler = RepositoryHandler(url, cache_dir=tmp_path / "w", mirror_cache=False)
+    path = await handler.resolve()
+
+    assert (path / "f0.txt").exists()
+    assert handler.branch == "trunk"
+    assert [args[0] for args in calls] == ["clone"]
+    assert "--branch" in calls[0] and "trunk" in calls[0]
+
+
+@pytest.mark.asyncio
+async def test_default_branch_is_cached_per_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(git_utils, "_default_branches", {})
+    remote = tmp_path / "remote"
+    url = _make_remote(remote)
+    assert await remote_default_branch(url, ttl=60) == "trunk"
+
+    git(remote, "branch", "-m", "trunk", "main")
+    # Served from cache: no network round trip, still the old answer
+    assert await remote_default_branch(url, ttl=60) == "trunk"
+    git_utils._default_branches.clear()
+    assert await remote_default_branch(url, ttl=60) == "main"
+
+
+@pytest.mark.asyncio
+async def test_default_branch_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(git_utils, "_default_branches", {})
+    monkeypatch.setattr(git_utils, "DEFAULT_BRANCH_CACHE_SIZE", 2)
+    git_utils._remember_default_branch("https://x/expired", "main", ttl=-1)
+    assert list(git_utils._default_branches) == ["https://x/expired"]
+    # Expired answers go first, then the least recently used
+    git_utils._remember_default_branch("https://x/a", "main", ttl=60)
+    assert list(git_utils._default_branches) == ["https://x/a"]
+    git_utils._remember_default_branch("https://x/b", "main", ttl=60)
+    git_utils._remember_default_branch("https://x/c", "main", ttl=60)
+    assert list(git_utils._default_branches) == ["https://x/b", "https://x/c"]
+
+    # A cache hit (no ls-remote: the URLs do not exist) makes `b` most recent
+    assert await remote_default_branch("https://x/b", ttl=60) == "main"
+    git_utils._remember_default_branch("https://x/d", "dev", ttl=60)
+    assert list(git_utils._default_branches) == ["https://x/b", "https://x/d"]
+
+
+@pytest.mark.asyncio
+async def test_remote_commit_resolves_refs_without_cloning(tmp_path):
+    url = _make_remote(tmp_path / "remote")
+    repo = tmp_path / "remote"
+    head = git(repo, "rev-parse", "HEAD").stdout.decode().strip()
+    git(repo, "tag", "-a", "v1", "-m", "v1")
+
+    assert await remote_commit(url) == head
+    assert await remote_commit(url, "trunk") == head
+    assert await remote_commit(url, "v1") == head  # annotated tag is peeled
+    assert await remote_commit(url, "missing") is None
+    assert await remote_commit(url, head) == head
+
+    handler = RepositoryHandler(url, cache_dir=tmp_path / "unused")
+    assert await handler.source_commit() == head
+    assert not (tmp_path / "unused").exists()
+
+    local = RepositoryHandler(repo)
+    assert await local.source_commit() == head
+    (repo / "untracked.txt").write_text("dirty\n", encoding="utf-8")
+    assert await local.source_commit() is None
@@ -0,0 +1,94 @@
+import pytest
+from pathlib import Path
+from gittxt.core import sources
+from gittxt.core.scanner import Scanner
+from gittxt.core.sources import GitObjectSource, VirtualFile
+from gittxt.core.output_builder import OutputBuilder
+from gittxt.core.repository import RepositoryHandler
+from git_repos import make_git_repo
+
+
+@pytest.fixture
+def committed_repo(tmp_path):
+    """
+    A repo whose working tree differs from HEAD, so reads must come from objects.
+    """
+    repo = make_git_repo(
+        tmp_path / "objrepo",
+        {
+            "src/app.py": "print('committed')\n",
+            "README.md": "# objrepo\n",
+            "logo.png": b"\x89PNG\x00\x00binary",
+        },
+    )
+
+    (repo / "src" / "app.py").write_text("print('dirty')\n", encoding="utf-8")
+    (repo / "untracked.py").write_text("print('untracked')\n", encoding="utf-8")
+    return repo
+
+
+def test_lists_tree_with_sizes(committed_repo):
+    with GitObjectSource(committed_repo / ".git", root=committed_repo) as source:
+        files = {
+            f.relative_to(committed_repo).as_posix(): f for f in source.iter_files()
+        }
+        assert set(files) == {"README.md", "logo.png", "src/app.py"}
+        app = files["src/app.py"]
+        assert isinstance(app, VirtualFile)
+        assert app.stat().st_size == len("print('committed')\n")
+        assert app.read_text() == "print('committed')\n"
+        # Served from the LRU on the second read
+        assert app.read_bytes() is app.read_bytes()
+
+
+def test_subdir_listing(committed_repo):
+    source = GitObjectSource(
+        committed_repo / ".git", subdir="src", root=committed_repo
+    )
+    try:
+        names = [f.name for f in source.iter_files()]
+        assert names == ["app.py"]
+    finally:
+        source.close()
+
+
+@pytest.mark.asyncio
+async def test_async_open_never_runs_blocking_git(committed_repo, monkeypatch):
+    def blocking(*args, **kwargs):
+        raise AssertionError(f"blocking git call from async code: {args}")
+
+    monkeypatch.setattr(sources, "run_git", blocking)
+    handler = RepositoryHandler(committed_repo, branch="trunk", from_objects=True)
+    await handler.resolve()
+    try:
+        scanner = Scanner(
+            root_path=committed_repo, source=handler.scan_source, use_ignore_file=True
+        )
+        textual, _ = await scanner.scan_directory()
+        assert sorted(f.name for f in textual) == ["README.md", "app.py"]
+    finally:
+        handler.close()
+
+
+@pytest.mark.asyncio
+async def test_scan_and_format_from_objects(committed_repo, tmp_path):
+    handler = RepositoryHandler(committed_repo, branch="trunk", from_objects=True)
+    await handler.resolve()
+    try:
+        scanner = Scanner(root_path=committed_repo, source=handler.scan_source)
+        textual, non_textual = await scanner.scan_directory()
+        assert sorted(f.name for f in textual) == ["README.md", "app.py"]
+        assert [f.name for f in non_textual] == ["logo.png"]
+
+        builder = OutputBuilder(
+            repo_name="objrepo", output_dir=tmp_path / "out", output_format="txt"
+        )
+        outputs = await builder.generate_output(
+            textual, non_textual, committed_repo, create_zip=True
+        )
+        report = next(Path(p) for p in outputs if str(p).endswith(".txt"))
+        text = report.read_text(encoding="utf-8")
+        assert "print('committed')" in text
+        assert "dirty" not in text and "untracked" not in text
+    finally:
+        handler.close()
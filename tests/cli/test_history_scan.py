@@ -0,0 +1,95 @@
+import subprocess
+import pytest
+from pathlib import Path
+from gittxt.core.history import HistoryScanner, resolve_revisions
+from gittxt.core.output_builder import OutputBuilder
+from gittxt.core.sources import GitObjectSource
+from gittxt.utils import summary_utils
+from git_repos import git, make_git_repo
+
+
+@pytest.fixture
+def tagged_repo(tmp_path):
+    """
+    Three tagged releases that only differ in src/version.py.
+    """
+    files = {
+        "README.md": "# tagged\n",
+        "src/core.py": "def core():\n    pass\n" * 20,
+        "logo.png": b"\x89PNG\x00\x00binary",
+        "src/version.py": "VERSION = 1\n",
+    }
+    repo = make_git_repo(tmp_path / "tagged", files, message="release 1")
+    git(repo, "tag", "v1")
+    for n in (2, 3):
+        (repo / "src" / "version.py").write_text(f"VERSION = {n}\n")
+        git(repo, "commit", "--quiet", "-am", f"release {n}")
+        git(repo, "tag", f"v{n}")
+    return repo
+
+
+class CountingEncoder:
+    calls = 0
+
+    def encode(self, text):
+        self.calls += 1
+        return text.split()
+
+
+@pytest.mark.asyncio
+async def test_each_distinct_blob_is_read_and_tokenized_once(
+    tagged_repo, tmp_path, monkeypatch
+):
+    counting = CountingEncoder()
+    monkeypatch.setattr(summary_utils, "get_encoder", lambda *_: counting)
+
+    with GitObjectSource(tagged_repo / ".git", root=tagged_repo) as source:
+        revisions = await resolve_revisions(source, ["v1", "v2", "v3"])
+        assert [label for label, _ in revisions] == ["v1", "v2", "v3"]
+
+        scans = await HistoryScanner(source, tagged_repo).scan(revisions)
+        for scan in scans:
+            builder = OutputBuilder(
+                repo_name=f"tagged@{scan.label}",
+                output_dir=tmp_path / "out",
+                output_format="txt,json,md",
+                branch=scan.label,
+            )
+            await builder.generate_output(
+                scan.textual_files, scan.non_textual_files, tagged_repo
+            )
+
+        # README, core.py and logo.png are shared; version.py differs per tag
+        assert source.blob_reads == 6
+        assert counting.calls == 5  # textual blobs only
+
+    for n in (1, 2, 3):
+        report = tmp_path / "out" / "txt" / f"tagged_v{n}.txt"
+        assert f"VERSION = {n}" in report.read_text(encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_last_commits_and_tags_are_labelled(tagged_repo):
+    with GitObjectSource(tagged_repo / ".git", root=tagged_repo) as source:
+        commits = await resolve_revisions(source, last_commits=2)
+        assert len(commits) == 2
+        assert all(len(label) == 12 for label, _ in commits)
+        assert commits[0][1] == source.commit
+
+        tags = await resolve_revisions(source, ["v3"], last_tags=3)
+        assert sorted(label for label, _ in tags) == ["v1", "v2", "v3"]
+
+
+def test_cli_history_writes_one_report_per_revision(tagged_repo, tmp_path):
+    output_dir = tmp_path / "cli_out"
+    result = subprocess.run(
+        ["gittxt", "scan", str(tagged_repo), "--last-tags", "3", "--rev", "v1"]
+        + ["--output-dir", str(output_dir)],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "3 revisions of tagged scanned" in result.stdout
+    names = sorted(p.name for p in (output_dir / "txt").glob("*.txt"))
+    assert names == ["tagged_v1.txt", "tagged_v2.txt", "tagged_v3.txt"]
+    assert Path(output_dir / "txt" / "tagged_v2.txt").read_text().count("VERSION") == 1
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+import gittxt
+
+SRC_DIR = Path(gittxt.__file__).resolve().parents[1]
+
+# Cumulative import time of the scan path (what an API worker or Lambda cold
+# start pays before its first request), generous enough for slow CI runners
+SCAN_PATH_BUDGET_MS = 300
+SCAN_PATH = (
+    "gittxt.core.repository",
+    "gittxt.core.scanner",
+    "gittxt.core.output_builder",
+)
+HEAVY_MODULES = {"tiktoken", "humanize", "pygments.lexers", "git", "rich", "aiohttp"}
+
+
+def _importtime(statement, env=None):
+    """
+    Run `statement` under `python -X importtime`; returns
+    {module: cumulative microseconds} and the total for the statement
+    (top-level imports other than interpreter startup).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR), **(env or {})},
+    )
+    times, total = {}, 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        times[name.strip()] = int(cumulative)
+        top_level = len(name) - len(name.lstrip()) == 1
+        if top_level and name.strip() not in ("site", "encodings"):
+            total += int(cumulative)
+    return times, total
+
+
+def test_import_gittxt_is_cheap_and_side_effect_free(tmp_path):
+    output_dir = tmp_path / "never-created"
+    times, _ = _importtime(
+        "import gittxt", env={"GITTXT_OUTPUT_DIR": str(output_dir)}
+    )
+    assert "gittxt" in times
+    assert not HEAVY_MODULES & set(times)
+    assert not output_dir.exists()
+
+
+def test_scan_path_imports_within_budget():
+    times, total = _importtime("import " + ", ".join(SCAN_PATH))
+    assert not HEAVY_MODULES & set(times)
+    total_ms = total / 1000
+    assert total_ms < SCAN_PATH_BUDGET_MS, f"scan path imports took {total_ms:.0f} ms"
@@ -0,0 +1,166 @@
+import json
+import subprocess
+import pytest
+from pathlib import Path
+from gittxt.core.sources import GitObjectSource
+from gittxt.core.incremental import ChangeSet, IncrementalUpdater
+from gittxt.utils.index_utils import ReportIndex, index_path_for
+from git_repos import git, make_git_repo
+
+FORMATS = ("txt", "md", "json")
+
+
+def _scan(repo: Path, out: Path, *extra):
+    result = subprocess.run(
+        ["gittxt", "scan", str(repo), "--index", "--no-checkout", "-o", str(out)]
+        + ["-f", ",".join(FORMATS), *extra],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def _reports(out: Path):
+    return [out / fmt / f"evolving.{fmt}" for fmt in FORMATS]
+
+
+def _normalized(report: Path):
+    if report.suffix == ".json":
+        data = json.loads(report.read_text(encoding="utf-8"))
+        data["repository"].pop("generated_at", None)
+        return data
+    return [
+        line
+        for line in report.read_text(encoding="utf-8").splitlines()
+        if "Generated" not in line
+    ]
+
+
+@pytest.fixture
+def evolving_repo(tmp_path):
+    """
+    A repo with one commit; the test commits a second one after scanning.
+    """
+    return make_git_repo(
+        tmp_path / "evolving",
+        {
+            "README.md": "# evolving\n",
+            "src/a.py": "print('a1')\n",
+            "src/b.py": "print('b')\n",
+            "docs/old.md": "# Guide\n" * 20,
+            "logo.png": b"\x89PNG\x00\x00binary",
+        },
+        message="v1",
+    )
+
+
+def _second_commit(repo: Path):
+    (repo / "src" / "a.py").write_text("print('a2')\nimport os\n", encoding="utf-8")
+    (repo / "src" / "c.py").write_text("print('c')\n", encoding="utf-8")
+    git(repo, "rm", "--quiet", "src/b.py")
+    git(repo, "mv", "docs/old.md", "docs/new.md")
+    git(repo, "add", ".")
+    git(repo, "commit", "--quiet", "-m", "v2")
+
+
+def test_parse_name_status():
+    output = "M\0a.py\0A\0c.py\0D\0b.py\0R087\0old.md\0new.md\0C100\0x\0y\0"
+    changes = ChangeSet.parse(output)
+    assert changes.modified == {"a.py"}
+    assert changes.added == {"c.py", "y"}
+    assert changes.deleted == {"b.py"}
+    assert changes.renamed == {"old.md": "new.md"}
+    assert changes.removed == {"b.py", "old.md"}
+
+
+def test_update_matches_full_rescan(evolving_repo, tmp_path):
+    _scan(evolving_repo, tmp_path / "incremental")
+    _second_commit(evolving_repo)
+
+    reports = _reports(tmp_path / "incremental")
+    result = subprocess.run(
+        ["gittxt", "update", *map(str, reports)], capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert result.stdout.count("now at") == len(FORMATS)
+
+    _scan(evolving_repo, tmp_path / "full")
+    for updated, fresh in zip(reports, _reports(tmp_path / "full")):
+        assert _normalized(updated) == _normalized(fresh), updated.name
+        updated_index = ReportIndex.load(updated)
+        fresh_index = ReportIndex.load(fresh)
+        assert updated_index.files == fresh_index.files
+        assert updated_index.assets == fresh_index.assets
+        assert updated_index.data["commit"] == fresh_index.data["commit"]
+        assert updated_index.read("src/a.py").startswith("print('a2')")
+        assert "src/b.py" not in updated_index
+        assert "docs/new.md" in updated_index and "docs/old.md" not in updated_index
+
+
+@pytest.mark.asyncio
+async def test_update_reads_only_changed_files(evolving_repo, tmp_path, monkeypatch):
+    _scan(evolving_repo, tmp_path / "out")
+    _second_commit(evolving_repo)
+
+    read = set()
+    original = GitObjectSource.read_bytes
+
+    def recording(self, file):
+        read.add(file.relative_to(evolving_repo).as_posix())
+        return original(self, file)
+
+    monkeypatch.setattr(GitObjectSource, "read_bytes", recording)
+    report = tmp_path / "out" / "txt" / "evolving.txt"
+    outcome = await IncrementalUpdater(report).run()
+
+    assert read == {"src/a.py", "src/c.py", "docs/new.md"}
+    assert (outcome["added"], outcome["modified"]) == (1, 1)
+    assert (outcome["deleted"], outcome["renamed"]) == (1, 1)
+    assert outcome["reused"] == 1  # README.md
+    assert outcome["summary"]["total_files"] == 5
+    assert index_path_for(report).exists()
+
+
+@pytest.mark.asyncio
+async def test_update_without_changes_keeps_report(evolving_repo, tmp_path):
+    _scan(evolving_repo, tmp_path / "out")
+    report = tmp_path / "out" / "md" / "evolving.md"
+    before = report.read_bytes()
+
+    outcome = await IncrementalUpdater(report, evolving_repo).run()
+    assert outcome["reused"] == 0 and outcome["summary"] is None
+    assert report.read_bytes() == before
+
+
+def _scan_work_tree(repo: Path, out: Path) -> Path:
+    subprocess.run(
+        ["gittxt", "scan", str(repo), "--index", "-f", "txt", "-o", str(out)],
+        capture_output=True,
+        check=True,
+    )
+    return out / "txt" / f"{repo.name}.txt"
+
+
+def test_clean_work_tree_scan_is_stamped(evolving_repo, tmp_path):
+    report = _scan_work_tree(evolving_repo, tmp_path / "out")
+    assert ReportIndex.load(report).data.get("commit")
+
+
+@pytest.mark.parametrize("change", ["modified", "untracked"])
+def test_dirty_work_tree_scan_is_not_stamped(evolving_repo, tmp_path, change):
+    if change == "modified":
+        dirty = evolving_repo / "src" / "a.py"
+        dirty.write_text("print('dirty')\n", encoding="utf-8")
+    else:
+        (evolving_repo / "u.txt").write_text("untracked\n", encoding="utf-8")
+    report = _scan_work_tree(evolving_repo, tmp_path / "out")
+    assert "commit" not in ReportIndex.load(report).data
+
+    # Claiming HEAD would let update carry the dirty content past a new commit
+    git(evolving_repo, "add", ".")
+    git(evolving_repo, "commit", "--quiet", "-m", "v2")
+    result = subprocess.run(
+        ["gittxt", "update", str(report)], capture_output=True, text=True
+    )
+    assert "now at" not in result.stdout
+    assert "no recorded commit" in result.stdout + result.stderr
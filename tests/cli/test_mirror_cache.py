@@ -0,0 +1,59 @@
+import os
+import pytest
+from pathlib import Path
+from gittxt.core.mirror_cache import MirrorCache, _dir_size
+from gittxt.core.repository import RepositoryHandler
+from git_repos import git, make_git_repo
+
+
+def _make_remote(path: Path, branch: str = "trunk") -> str:
+    make_git_repo(path, {"README.md": "# remote\n"}, branch=branch)
+    return f"file://{path}"
+
+
+def _commit_file(repo: Path, name: str, text: str):
+    (repo / name).write_text(text, encoding="utf-8")
+    git(repo, "add", name)
+    git(repo, "commit", "--quiet", "-m", f"add {name}")
+
+
+@pytest.mark.asyncio
+async def test_rescan_fetches_into_existing_mirror(tmp_path):
+    remote = tmp_path / "remote"
+    url = _make_remote(remote)
+    cache = MirrorCache(tmp_path / "mirrors")
+
+    handler = RepositoryHandler(url, cache_dir=tmp_path / "w1", mirror_cache=cache)
+    checkout = await handler.resolve()
+    assert (checkout / "README.md").exists()
+    # No branch requested, so the mirror's HEAD (the remote default) is used
+    assert handler.branch == "trunk"
+    mirror = cache.mirror_path(url)
+    assert mirror.is_dir()
+    # The worktree borrows objects from the mirror instead of copying them
+    assert (checkout / ".git" / "objects" / "info" / "alternates").exists()
+
+    _commit_file(remote, "new.py", "print('new')\n")
+    handler = RepositoryHandler(
+        url, branch="trunk", cache_dir=tmp_path / "w2", mirror_cache=cache
+    )
+    checkout = await handler.resolve()
+    assert (checkout / "new.py").exists()
+    assert list(cache.root.glob("*.git")) == [mirror]
+
+
+@pytest.mark.asyncio
+async def test_eviction_is_lru_within_quota(tmp_path):
+    cache = MirrorCache(tmp_path / "mirrors")
+    urls = [_make_remote(tmp_path / f"remote{i}") for i in range(3)]
+    mirrors = [await cache.ensure(url) for url in urls]
+
+    # Mark the first mirror as most recently used
+    os.utime(mirrors[1] / "gittxt-last-used", (1, 1))
+    os.utime(mirrors[2] / "gittxt-last-used", (2, 2))
+
+    cache.max_bytes = _dir_size(mirrors[0]) + 1
+    reclaimed = cache.evict()
+    assert reclaimed > 0
+    assert mirrors[0].exists()
+    assert not mirrors[1].exists() and not mirrors[2].exists()
@@ -0,0 +1,85 @@
+import asyncio
+import subprocess
+import pytest
+from pathlib import Path
+from gittxt.cli import cli_scan
+
+
+def _make_repo(path: Path, text: str) -> Path:
+    (path / "src").mkdir(parents=True)
+    (path / "src" / "main.py").write_text(text, encoding="utf-8")
+    (path / "README.md").write_text(f"# {path.name}\n", encoding="utf-8")
+    return path
+
+
+def test_parallel_repos_isolates_failures(tmp_path):
+    repos = [_make_repo(tmp_path / f"repo{i}", f"print({i})\n") for i in range(3)]
+    output_dir = tmp_path / "out"
+
+    result = subprocess.run(
+        [
+            "gittxt",
+            "scan",
+            *map(str, repos),
+            "https://github.com/",  # unsupported source, must not stop the others
+            "--parallel-repos",
+            "2",
+            "--output-dir",
+            str(output_dir),
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0
+    assert result.stdout.count("✅ Scan complete") == 3
+    assert "❌ https://github.com/" in result.stdout
+    for i in range(3):
+        report = output_dir / "txt" / f"repo{i}.txt"
+        assert f"print({i})" in report.read_text(encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_parallel_repos_overlap_up_to_the_limit(tmp_path, monkeypatch):
+    running, peak, finished = 0, 0, []
+
+    async def fake_process(repo_source, *args):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        finished.append(repo_source)
+
+    monkeypatch.setattr(cli_scan, "_process_one_repo", fake_process)
+    repos = [f"repo{i}" for i in range(5)]
+    await cli_scan._handle_repos(
+        repos,
+        False,
+        [],
+        None,
+        None,
+        tmp_path,
+        ["txt"],
+        None,
+        False,
+        [],
+        [],
+        "rich",
+        False,
+        parallel_repos=2,
+    )
+
+    # Two repos ran at once, never more
+    assert peak == 2
+    assert sorted(finished) == repos
+
+
+def test_parallel_repos_rejects_zero(tmp_path):
+    result = subprocess.run(
+        ["gittxt", "scan", str(tmp_path), "--parallel-repos", "0"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
+    assert "--parallel-repos" in result.stderr
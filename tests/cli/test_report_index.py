@@ -0,0 +1,69 @@
+import json
+import pytest
+from pathlib import Path
+from gittxt.core.output_builder import OutputBuilder
+from gittxt.core.scanner import Scanner
+from gittxt.utils.index_utils import ReportIndex, index_path_for, read_report_file
+
+TEST_REPO = Path("cli/test_repo")
+
+
+async def _build_reports(output_dir: Path, mode: str):
+    scanner = Scanner(root_path=TEST_REPO)
+    textual_files, non_textual_files = await scanner.scan_directory()
+
+    builder = OutputBuilder(
+        repo_name="test_repo",
+        output_dir=output_dir,
+        output_format="txt,json,md",
+        repo_url="https://github.com/test-user/test_repo",
+        branch="main",
+        mode=mode,
+        build_index=True,
+    )
+    outputs = await builder.generate_output(
+        textual_files, non_textual_files, repo_path=TEST_REPO
+    )
+    return outputs, textual_files
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["rich", "lite"])
+async def test_index_reads_match_source_files(mode, tmp_path):
+    outputs, textual_files = await _build_reports(tmp_path, mode)
+    assert len(outputs) == 3
+
+    for report in outputs:
+        assert index_path_for(report).exists(), f"Missing index for {report}"
+        index = ReportIndex.load(report)
+        assert len(index) == len(textual_files)
+
+        for rel_path in index.paths():
+            # Reports hold each file's text with surrounding blank lines trimmed
+            expected = (TEST_REPO / rel_path).read_text(encoding="utf-8").strip()
+            content = index.read(rel_path)
+            assert content == expected, f"{report.name}: {rel_path}"
+            assert index.entry(rel_path)["tokens"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_json_index_points_at_content_literal(tmp_path):
+    outputs, _ = await _build_reports(tmp_path, "rich")
+    report = next(Path(p) for p in outputs if str(p).endswith(".json"))
+    data = json.loads(report.read_text(encoding="utf-8"))
+    first = data["files"][0]
+    assert first["content"]
+    assert read_report_file(report, first["path"]) == first["content"]
+
+
+def test_stale_index_is_rejected(tmp_path):
+    report = tmp_path / "repo.txt"
+    report.write_text("---> File: a.py <---\nprint(1)\n\n", encoding="utf-8")
+    index_path_for(report).write_text(
+        json.dumps(
+            {"version": 1, "format": "txt", "report_size": 1, "files": {}}
+        ),
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError):
+        ReportIndex.load(report)
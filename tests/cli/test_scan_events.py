@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from gittxt.core.events import ScanEvents
+from gittxt.core.output_builder import OutputBuilder
+from gittxt.core.repository import RepositoryHandler
+from gittxt.core.scanner import Scanner
+from gittxt.utils import summary_utils
+
+
+class WordEncoder:
+    def encode(self, text):
+        return text.split()
+
+
+@pytest.fixture
+def sample_repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(summary_utils, "get_encoder", lambda *_: WordEncoder())
+    repo = tmp_path / "events"
+    (repo / "src").mkdir(parents=True)
+    (repo / "README.md").write_text("# events demo\n", encoding="utf-8")
+    (repo / "src" / "app.py").write_text("print('one two')\n", encoding="utf-8")
+    (repo / "logo.png").write_bytes(b"\x89PNG\x00\x00binary")
+    return repo
+
+
+async def _scan(repo, out, events):
+    handler = RepositoryHandler(repo, events=events)
+    await handler.resolve()
+    scanner = Scanner(root_path=repo, events=events)
+    textual, non_textual = await scanner.scan_directory()
+    builder = OutputBuilder("events", out, output_format="txt", events=events)
+    await builder.generate_output(textual, non_textual, repo, create_zip=True)
+
+
+@pytest.mark.asyncio
+async def test_subscriber_sees_every_stage_and_final_counters(sample_repo, tmp_path):
+    events = ScanEvents(interval=0)
+    queue = events.subscribe()
+    await _scan(sample_repo, tmp_path / "out", events)
+    events.close("done")
+
+    received = []
+    while not queue.empty():
+        received.append(queue.get_nowait())
+    stages = [data["stage"] for kind, data in received if kind == "stage"]
+    assert stages == [None, "clone", "walk", "classify", "tokenize", "format", "zip"]
+    assert any(kind == "progress" for kind, _ in received)
+
+    kind, final = received[-1]
+    assert (kind, final["state"]) == ("end", "done")
+    assert (final["files_seen"], final["files_accepted"]) == (3, 2)
+    assert final["tokens_counted"] == 5
+    assert final["bytes_read"] > 0
+
+
+@pytest.mark.asyncio
+async def test_unsubscribed_events_only_count(sample_repo, tmp_path):
+    events = ScanEvents(interval=0)
+    published = []
+    events._publish = lambda kind, data: published.append(kind)
+
+    await _scan(sample_repo, tmp_path / "out", events)
+    assert published == []
+    assert events.counters["files_seen"] == 3
+    del events._publish
+
+    late = events.subscribe()
+    events.close("done")
+    assert late.get_nowait()[0] == "stage"
+    assert await asyncio.wait_for(late.get(), 1) == ("end", events.final)
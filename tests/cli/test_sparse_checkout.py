@@ -0,0 +1,96 @@
+import os
+import time
+import pytest
+from gittxt.core.mirror_cache import MirrorCache, _dir_size
+from gittxt.core.repository import RepositoryHandler
+from git_repos import git, make_git_repo
+
+BIG_BYTES = 4 * 1024 * 1024
+
+
+@pytest.fixture
+def bare_monorepo(tmp_path):
+    """
+    A local bare repo with a small `services/api` subdir next to large,
+    incompressible data elsewhere.
+    """
+    files = {
+        "services/api/app.py": "print('api')\n",
+        "services/api/README.md": "# api\n",
+    }
+    for i in range(4):
+        files[f"data/blob{i}.bin"] = os.urandom(BIG_BYTES // 4)
+    work = make_git_repo(tmp_path / "work", files, branch="main")
+
+    bare = tmp_path / "mono.git"
+    git(tmp_path, "clone", "--quiet", "--bare", str(work), str(bare))
+    git(bare, "config", "uploadpack.allowFilter", "true")
+    git(bare, "config", "uploadpack.allowAnySHA1InWant", "true")
+    return bare
+
+
+async def _resolve(url, cache_dir, subdir="", mirror_cache=False):
+    handler = RepositoryHandler(
+        url,
+        branch="main",
+        subdir=subdir,
+        cache_dir=cache_dir,
+        mirror_cache=mirror_cache,
+    )
+    start = time.perf_counter()
+    path = await handler.resolve()
+    return path, time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+async def test_subdir_scan_downloads_only_the_subdir(bare_monorepo, tmp_path):
+    url = f"file://{bare_monorepo}"
+
+    full, full_secs = await _resolve(url, tmp_path / "full")
+    sparse, sparse_secs = await _resolve(url, tmp_path / "sparse", "services/api")
+
+    assert (sparse / "services" / "api" / "app.py").exists()
+    assert not (sparse / "data").exists()
+    assert (full / "data" / "blob0.bin").exists()
+
+    full_bytes, sparse_bytes = _dir_size(full), _dir_size(sparse)
+    assert sparse_bytes * 10 < full_bytes, (
+        f"sparse={sparse_bytes}B/{sparse_secs:.3f}s "
+        f"full={full_bytes}B/{full_secs:.3f}s"
+    )
+
+
+@pytest.mark.asyncio
+async def test_sparse_clone_without_filter_support(bare_monorepo, tmp_path):
+    git(bare_monorepo, "config", "uploadpack.allowFilter", "false")
+    path, _ = await _resolve(
+        f"file://{bare_monorepo}", tmp_path / "w", "services/api"
+    )
+    # Server ignores the filter, but the checkout is still limited to the subdir
+    assert (path / "services" / "api" / "app.py").exists()
+    assert not (path / "data").exists()
+
+
+@pytest.mark.asyncio
+async def test_sparse_clone_falls_back_for_missing_branch(bare_monorepo, tmp_path):
+    git(bare_monorepo, "symbolic-ref", "HEAD", "refs/heads/main")
+    handler = RepositoryHandler(
+        f"file://{bare_monorepo}",
+        branch="does-not-exist",
+        subdir="services/api",
+        cache_dir=tmp_path / "w",
+        mirror_cache=False,
+    )
+    path = await handler.resolve()
+    assert (path / "services" / "api" / "app.py").exists()
+    assert handler.branch == "main"
+
+
+@pytest.mark.asyncio
+async def test_mirror_materialize_is_sparse(bare_monorepo, tmp_path):
+    cache = MirrorCache(tmp_path / "mirrors")
+    path, _ = await _resolve(
+        f"file://{bare_monorepo}", tmp_path / "w", "services/api", cache
+    )
+    assert (path / "services" / "api" / "app.py").exists()
+    assert not (path / "data").exists()
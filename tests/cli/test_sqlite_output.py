@@ -0,0 +1,84 @@
+import sqlite3
+import pytest
+from pathlib import Path
+from gittxt.core.output_builder import OutputBuilder
+from gittxt.core.scanner import Scanner
+from gittxt.utils.hash_utils import git_blob_hash
+
+TEST_REPO = Path("cli/test_repo")
+
+
+async def _build(output_dir: Path, mode: str):
+    scanner = Scanner(root_path=TEST_REPO)
+    textual_files, non_textual_files = await scanner.scan_directory()
+    builder = OutputBuilder(
+        repo_name="test_repo",
+        output_dir=output_dir,
+        output_format="sqlite",
+        repo_url="https://github.com/test-user/test_repo",
+        branch="main",
+        mode=mode,
+    )
+    outputs = await builder.generate_output(
+        textual_files, non_textual_files, repo_path=TEST_REPO
+    )
+    assert len(outputs) == 1 and outputs[0].suffix == ".sqlite"
+    return outputs[0], textual_files, non_textual_files
+
+
+@pytest.mark.asyncio
+async def test_sqlite_rich_output_rows_and_search(tmp_path):
+    db_path, textual_files, non_textual_files = await _build(tmp_path, "rich")
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == len(
+            textual_files
+        )
+        assert conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0] == len(
+            non_textual_files
+        )
+
+        path, content, blob_hash, tokens = conn.execute(
+            "SELECT path, content, blob_hash, tokens FROM files WHERE path LIKE '%script.py'"
+        ).fetchone()
+        raw = (TEST_REPO / path).read_bytes()
+        assert content == raw.decode("utf-8", errors="ignore")
+        assert blob_hash == git_blob_hash(raw)
+        assert tokens > 0
+
+        has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'files_fts'"
+        ).fetchone()
+        if has_fts:
+            hits = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT path FROM files_fts WHERE files_fts MATCH 'hello'"
+                )
+            ]
+            assert any(p.endswith("script.py") for p in hits)
+
+        meta = dict(conn.execute("SELECT key, value FROM repository"))
+        assert meta["name"] == "test_repo"
+        assert int(meta["total_files"]) == len(textual_files) + len(non_textual_files)
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_lite_output_skips_metadata(tmp_path):
+    db_path, textual_files, _ = await _build(tmp_path, "lite")
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == len(
+            textual_files
+        )
+        assert conn.execute("SELECT COUNT(*) FROM assets").fetchone()[0] == 0
+        assert (
+            conn.execute(
+                "SELECT COUNT(*) FROM files WHERE subcategory IS NOT NULL OR url IS NOT NULL"
+            ).fetchone()[0]
+            == 0
+        )
+    finally:
+        conn.close()
@@ -0,0 +1,79 @@
+from pathlib import Path
+from gittxt.utils.tree_utils import build_tree_index, generate_tree
+
+ROOT = Path("/repo")
+
+
+def _paths(*rels):
+    return [ROOT / r for r in rels]
+
+
+def test_tree_reflects_only_scanned_files():
+    files = _paths("src/app.py", "src/utils/io.py", "README.md", "docs/Guide.md")
+    tree = generate_tree(files, ROOT)
+    assert tree.splitlines() == [
+        "├── docs",
+        "│   └── Guide.md",
+        "├── src",
+        "│   ├── utils",
+        "│   │   └── io.py",
+        "│   └── app.py",
+        "└── README.md",
+    ]
+    assert "node_modules" not in tree
+
+
+def test_tree_max_depth_and_outside_paths():
+    files = _paths("a/b/c.txt", "top.txt") + [Path("/elsewhere/x.txt")]
+    index = build_tree_index(files, ROOT)
+    assert set(index.children) == {"a", "top.txt"}
+    assert index.files == 2
+    assert generate_tree(files, ROOT, max_depth=1).splitlines() == [
+        "├── a",
+        "│   └── ...",
+        "└── top.txt",
+    ]
+    assert generate_tree([], ROOT) == ""
+
+
+def test_fan_out_cap_collapses_with_rollups():
+    files = _paths(*[f"gen/f{i:03}.js" for i in range(50)], "main.py")
+    stats = {f: (1000, 250) for f in files}
+    lines = generate_tree(files, ROOT, stats=stats, max_entries=3).splitlines()
+    assert lines == [
+        "├── gen",
+        "│   ├── f000.js",
+        "│   ├── f001.js",
+        "│   ├── f002.js",
+        "│   └── … 47 more files (47.0 kB, 11.8k tokens)",
+        "└── main.py",
+    ]
+
+
+def test_line_budget_bounds_output_and_summarises_rest():
+    files = _paths(*[f"d{i}/f{j}.txt" for i in range(100) for j in range(100)])
+    stats = {f: (10, 2) for f in files}
+    tree = generate_tree(files, ROOT, stats=stats, max_lines=20)
+    lines = tree.splitlines()
+    assert len(lines) == 20
+    shown_files = sum(1 for line in lines if line.endswith(".txt"))
+    remaining = 10_000 - shown_files
+    assert lines[-1] == (
+        f"… {remaining:,} more files "
+        f"({remaining * 10 / 1000:.1f} kB, {remaining * 2 / 1000:.1f}k tokens)"
+    )
+
+    token_bounded = generate_tree(files, ROOT, stats=stats, max_tokens=100)
+    assert len(token_bounded) < 100 * 4 + 200
+
+
+def test_depth_markers_stay_within_line_budget():
+    files = _paths(*[f"d{i}/f.txt" for i in range(10)])
+    stats = {f: (10, 2) for f in files}
+    for max_lines in (2, 4, 6):
+        tree = generate_tree(files, ROOT, max_depth=1, stats=stats, max_lines=max_lines)
+        lines = tree.splitlines()
+        assert len(lines) <= max_lines
+        # Directories shown with their `...` marker, plus the summary of the rest
+        markers = sum(1 for line in lines if line.endswith("..."))
+        assert lines[-1].startswith(f"… {10 - markers} more files")
@@ -0,0 +1,47 @@
+"""
+Helpers for tests that build throwaway git repositories, shared by the CLI
+and API suites (`tests/` is on pytest's pythonpath):
+`from git_repos import GIT_ENV, git, make_git_repo`.
+"""
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, Union
+
+GIT_ENV = {
+    **os.environ,
+    "GIT_AUTHOR_NAME": "gittxt",
+    "GIT_AUTHOR_EMAIL": "gittxt@example.com",
+    "GIT_COMMITTER_NAME": "gittxt",
+    "GIT_COMMITTER_EMAIL": "gittxt@example.com",
+}
+
+
+def git(cwd, *args) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, env=GIT_ENV, check=True, capture_output=True
+    )
+
+
+def make_git_repo(
+    path: Path,
+    files: Dict[str, Union[str, bytes]],
+    branch: str = "trunk",
+    message: str = "init",
+) -> Path:
+    """
+    Init a repo at `path` on `branch`, write `files` (relative path to text
+    or bytes) and commit them all.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    git(path, "init", "--quiet", "--initial-branch", branch)
+    for rel_path, content in files.items():
+        target = path / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            target.write_bytes(content)
+        else:
+            target.write_text(content, encoding="utf-8")
+    git(path, "add", ".")
+    git(path, "commit", "--quiet", "-m", message)
+    return path